@@ -1,10 +1,99 @@
 # pylint: disable=line-too-long,missing-module-docstring # noqa: D104,E501
 import sys
-
-from better_highlighting.better_highlitghting import (
-    highlight_color_font,
-    highlight_json_style,
-)
+from importlib import import_module
+from typing import TYPE_CHECKING
 
 if sys.version_info < (3, 7):
     raise EnvironmentError("Python 3.7 or above is required.")
+
+if TYPE_CHECKING:
+    from better_highlighting.async_highlighting import (
+        ahighlight_color_font,
+        ahighlight_json_style,
+        ahighlight_to,
+        aiter_highlight,
+        atabulate_with_color_font,
+    )
+    from better_highlighting.better_highlitghting import (
+        highlight_color_font,
+        highlight_json_file,
+        highlight_json_style,
+        highlight_many,
+        highlight_to,
+        iter_highlight_color_font,
+        iter_highlight_json_file,
+        iter_highlight_json_style,
+        iter_table_pages,
+        iter_tabulate_with_color_font,
+        render_tokens,
+        tabulate_with_color_font,
+        warm_up,
+    )
+    from better_highlighting.components.metrics import (
+        enable_metrics,
+        metrics_snapshot,
+        observe,
+        reset_metrics,
+    )
+    from better_highlighting.components.token_stream import (
+        TokenStream,
+        emit,
+    )
+    from better_highlighting.components.watch import (
+        LineChange,
+        WatchRenderer,
+        apply_changes,
+    )
+    from better_highlighting.data_format import RenderConfig
+    from better_highlighting.log_highlighting import (
+        HighlightFormatter,
+        HighlightQueueHandler,
+    )
+
+# pygments is imported with the first public function, `import better_highlighting` stays cheap for CLIs
+_LAZY_ATTRIBUTES = {
+    "highlight_color_font": "better_highlighting.better_highlitghting",
+    "highlight_json_file": "better_highlighting.better_highlitghting",
+    "highlight_json_style": "better_highlighting.better_highlitghting",
+    "highlight_many": "better_highlighting.better_highlitghting",
+    "highlight_to": "better_highlighting.better_highlitghting",
+    "iter_highlight_color_font": "better_highlighting.better_highlitghting",
+    "iter_highlight_json_file": "better_highlighting.better_highlitghting",
+    "iter_highlight_json_style": "better_highlighting.better_highlitghting",
+    "iter_table_pages": "better_highlighting.better_highlitghting",
+    "iter_tabulate_with_color_font": "better_highlighting.better_highlitghting",
+    "render_tokens": "better_highlighting.better_highlitghting",
+    "tabulate_with_color_font": "better_highlighting.better_highlitghting",
+    "warm_up": "better_highlighting.better_highlitghting",
+    "enable_metrics": "better_highlighting.components.metrics",
+    "metrics_snapshot": "better_highlighting.components.metrics",
+    "observe": "better_highlighting.components.metrics",
+    "reset_metrics": "better_highlighting.components.metrics",
+    "RenderConfig": "better_highlighting.data_format",
+    "ahighlight_color_font": "better_highlighting.async_highlighting",
+    "ahighlight_json_style": "better_highlighting.async_highlighting",
+    "ahighlight_to": "better_highlighting.async_highlighting",
+    "aiter_highlight": "better_highlighting.async_highlighting",
+    "atabulate_with_color_font": "better_highlighting.async_highlighting",
+    "TokenStream": "better_highlighting.components.token_stream",
+    "emit": "better_highlighting.components.token_stream",
+    "LineChange": "better_highlighting.components.watch",
+    "WatchRenderer": "better_highlighting.components.watch",
+    "apply_changes": "better_highlighting.components.watch",
+    "HighlightFormatter": "better_highlighting.log_highlighting",
+    "HighlightQueueHandler": "better_highlighting.log_highlighting",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_ATTRIBUTES[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,205 @@
+"""Command line entry point: highlight NDJSON records, plain log lines or large JSON documents."""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import (
+    IO,
+    Iterator,
+    List,
+    Optional,
+)
+
+from better_highlighting.better_highlitghting import (
+    highlight_json_style,
+    iter_highlight_json_file,
+)
+from better_highlighting.components.plain import (
+    COLOR_MODES,
+    use_color,
+)
+
+READ_SIZE = 256 * 1024
+# Batches with less lines are rendered in the main process, pickling costs more than rendering for them.
+MIN_LINES_FOR_WORKERS = 64
+
+
+def render_line(line: str, wrap=False, short=False, color="always") -> str:
+    """Highlight one NDJSON record or plain log line.
+
+    Args:
+        line: line without line break.
+        wrap: wrap result string.
+        short: cut to make result str short.
+        color: "always" or "never" color mode.
+    """
+    text = line.strip()
+    if not text:
+        return ""
+    if text[0] in "{[":
+        try:
+            return highlight_json_style(json.loads(text), wrap=wrap, short=short, color=color)
+        except ValueError:
+            pass
+    return highlight_json_style(text, wrap=wrap, short=short, color=color)
+
+
+def render_lines(lines: List[str], wrap=False, short=False, color="always") -> str:
+    """Highlight lines, every result line ends with line break.
+
+    Args:
+        lines: lines without line breaks.
+        wrap: wrap result string.
+        short: cut to make result str short.
+        color: "always" or "never" color mode.
+    """
+    return "".join(f"{render_line(line, wrap=wrap, short=short, color=color)}\n" for line in lines)
+
+
+def iter_line_batches(stream: IO[bytes], read_size: int = READ_SIZE) -> Iterator[List[str]]:
+    """Yield lines which are already available in stream.
+
+    Reading does not wait for the whole batch, so lines of slow stream (`kubectl logs -f`) are printed immediately.
+
+    Args:
+        stream: binary stream.
+        read_size: max number of bytes read at once.
+    """
+    read = getattr(stream, "read1", stream.read)
+    tail = b""
+    while True:
+        data = read(read_size)
+        if not data:
+            break
+        lines = (tail + data).split(b"\n")
+        tail = lines.pop()
+        if lines:
+            yield [line.decode("utf-8", errors="replace") for line in lines]
+    if tail:
+        yield [tail.decode("utf-8", errors="replace")]
+
+
+def _open_inputs(files: List[str]) -> Iterator[IO[bytes]]:
+    for file in files or ["-"]:
+        if file == "-":
+            yield sys.stdin.buffer
+            continue
+        with open(file, "rb") as stream:
+            yield stream
+
+
+def _split(lines: List[str], parts: int) -> List[List[str]]:
+    size = -(-len(lines) // parts)
+    return [lines[i : i + size] for i in range(0, len(lines), size)]
+
+
+def highlight_streams(
+    inputs: Iterator[IO[bytes]],
+    output: IO[bytes],
+    wrap=False,
+    short=False,
+    workers=0,
+    read_size=READ_SIZE,
+    color="always",
+):
+    """Highlight lines of all inputs and write them to output in the same order.
+
+    Args:
+        inputs: binary streams to read.
+        output: binary stream to write.
+        wrap: wrap result string.
+        short: cut to make result str short.
+        workers: number of processes to render lines, lines are rendered in the main process if 0 or 1.
+        read_size: max number of bytes read at once.
+        color: "always" or "never" color mode, it is resolved once for all workers.
+    """
+    render = partial(render_lines, wrap=wrap, short=short, color=color)
+    executor: Optional[ProcessPoolExecutor] = ProcessPoolExecutor(workers) if workers > 1 else None
+    try:
+        for stream in inputs:
+            for lines in iter_line_batches(stream, read_size):
+                if executor and len(lines) >= MIN_LINES_FOR_WORKERS:
+                    rendered = "".join(executor.map(render, _split(lines, workers * 4)))
+                else:
+                    rendered = render(lines)
+                output.write(rendered.encode("utf-8"))
+                output.flush()
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+
+
+def highlight_documents(files: List[str], output: IO[bytes], wrap=False, short=False, color="always"):
+    """Highlight every file as one JSON document, files are memory-mapped and are not loaded.
+
+    Args:
+        files: files to read, stdin is read whole if no files or '-'.
+        output: binary stream to write.
+        wrap: wrap result string.
+        short: cut long lists, dicts and strings.
+        color: "always" or "never" color mode.
+    """
+    for file in files or ["-"]:
+        source = sys.stdin.buffer.read() if file == "-" else file
+        for chunk in iter_highlight_json_file(source, wrap=wrap, short=short, color=color):
+            output.write(chunk.encode("utf-8"))
+            output.flush()
+        output.write(b"\n")
+        output.flush()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="better_highlighting",
+        description="Highlight NDJSON records or plain log lines with JSON style.",
+    )
+    parser.add_argument("files", nargs="*", help="files to read, stdin is read if no files or '-'")
+    parser.add_argument("--wrap", action="store_true", help="wrap records to several lines")
+    parser.add_argument("--short", action="store_true", help="cut long lists, dicts and strings")
+    parser.add_argument("--json", action="store_true", help="every file is one JSON document, e.g. large dump")
+    parser.add_argument("--workers", type=int, default=0, help="number of processes to render records")
+    parser.add_argument("--read-size", type=int, default=READ_SIZE, help="max number of bytes read at once")
+    parser.add_argument(
+        "--color",
+        choices=COLOR_MODES,
+        default="auto",
+        help="highlight output, 'auto' highlights only output to terminal if NO_COLOR is not set",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run command line tool."""
+    args = parse_args(argv)
+    color = "always" if use_color(args.color, sys.stdout) else "never"
+    try:
+        if args.json:
+            highlight_documents(args.files, sys.stdout.buffer, wrap=args.wrap, short=args.short, color=color)
+        else:
+            highlight_streams(
+                _open_inputs(args.files),
+                sys.stdout.buffer,
+                wrap=args.wrap,
+                short=args.short,
+                workers=args.workers,
+                read_size=args.read_size,
+                color=color,
+            )
+    except ValueError as e:
+        # invalid JSON document, chunks before the error are already written
+        print(f"better_highlighting: {e}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        # output is closed by reader (`| head`), python would fail on flush of stdout at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except KeyboardInterrupt:
+        return 130
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""Asyncio versions of public functions, rendering runs in executor without blocking of event loop.
+
+Every chunk of highlighted str is rendered by one job of executor, so the loop serves other tasks between chunks and
+cancellation of a task stops its render at the next chunk. Jobs of all renders of one loop are limited by semaphore,
+a burst of large renders does not fill the executor and renders of other tasks are not queued behind them.
+"""
+import asyncio
+import logging
+from concurrent.futures import Executor
+from contextvars import copy_context
+from threading import Lock
+from typing import (
+    AsyncGenerator,
+    Iterator,
+    Optional,
+    Set,
+)
+from weakref import WeakKeyDictionary
+
+from better_highlighting.better_highlitghting import (
+    _ITER_HIGHLIGHTERS,
+    DEFAULT_CHUNK_SIZE,
+)
+from better_highlighting.components.plain import use_color
+
+# jobs of one event loop in executor at the same time, `semaphore` argument sets other limit for some calls
+MAX_CONCURRENT_RENDERS = 4
+
+_semaphores: "WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = WeakKeyDictionary()
+# jobs which close renders of cancelled tasks, they are kept until they are done
+_closing: Set["asyncio.Future[None]"] = set()
+
+_logger = logging.getLogger(__name__)
+
+
+def render_semaphore() -> asyncio.Semaphore:
+    """Semaphore of renders of the running event loop with `MAX_CONCURRENT_RENDERS` slots."""
+    loop = asyncio.get_running_loop()
+    if loop not in _semaphores:
+        _semaphores[loop] = asyncio.Semaphore(MAX_CONCURRENT_RENDERS)
+    return _semaphores[loop]
+
+
+def _next_chunk(chunks: Iterator[str], lock: Lock) -> Optional[str]:
+    with lock:
+        return next(chunks, None)
+
+
+def _close(chunks: Iterator[str]):
+    close = getattr(chunks, "close", None)
+    if close:
+        close()
+
+
+def _close_chunks(chunks: Iterator[str], lock: Lock):
+    with lock:
+        _close(chunks)
+
+
+def _closed(future: "asyncio.Future[None]"):
+    _closing.discard(future)
+    if not future.cancelled() and future.exception() is not None:
+        _logger.error("render of cancelled task was not closed", exc_info=future.exception())
+
+
+async def aiter_highlight(
+    text,
+    style="json",
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    executor: Optional[Executor] = None,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    **kwargs,
+) -> AsyncGenerator[str, None]:
+    """Highlight data in executor, result is yielded by chunks during rendering.
+
+    Jobs run in copy of the current context, so `observe` callbacks of the task get reports of its renders.
+
+    Args:
+        text: data to highlight.
+        style: "json", "color" or "table" for `highlight_json_style`, `highlight_color_font`
+            or `tabulate_with_color_font` style.
+        chunk_size: max length of yielded str.
+        executor: thread pool to render chunks, default executor of event loop if None.
+        semaphore: limit of jobs in executor, `render_semaphore()` if None.
+        **kwargs: arguments of highlight function of the style.
+    """
+    if style not in _ITER_HIGHLIGHTERS:
+        raise ValueError(f"unknown style: {style}, expected one of: {', '.join(_ITER_HIGHLIGHTERS)}")
+
+    loop = asyncio.get_running_loop()
+    semaphore = semaphore or render_semaphore()
+    context = copy_context()
+    chunks = _ITER_HIGHLIGHTERS[style](text, chunk_size=chunk_size, **kwargs)
+    # the chunk which is rendered by job of cancelled task is finished before the render is closed
+    lock = Lock()
+    finished = rendering = False
+    try:
+        while True:
+            async with semaphore:
+                rendering = True
+                chunk = await loop.run_in_executor(executor, context.run, _next_chunk, chunks, lock)
+                rendering = False
+            if chunk is None:
+                finished = True
+                return
+            yield chunk
+    finally:
+        if not finished and not rendering:
+            context.run(_close, chunks)
+        elif not finished:
+            # job of cancelled task can still be in the context, so the render is closed in its copy after the job
+            future = loop.run_in_executor(executor, context.copy().run, _close_chunks, chunks, lock)
+            _closing.add(future)
+            future.add_done_callback(_closed)
+
+
+async def _ahighlight(text, style: str, executor: Optional[Executor], semaphore: Optional[asyncio.Semaphore], **kwargs):
+    chunks = aiter_highlight(text, style, executor=executor, semaphore=semaphore, **kwargs)
+    try:
+        return "".join([chunk async for chunk in chunks])
+    finally:
+        await chunks.aclose()
+
+
+async def ahighlight_json_style(
+    text, executor: Optional[Executor] = None, semaphore: Optional[asyncio.Semaphore] = None, **kwargs
+) -> str:
+    """Highlight data with JSON style in executor.
+
+    Args:
+        text: data to highlight.
+        executor: thread pool to render chunks, default executor of event loop if None.
+        semaphore: limit of jobs in executor, `render_semaphore()` if None.
+        **kwargs: arguments of `highlight_json_style`.
+    """
+    return await _ahighlight(text, "json", executor, semaphore, **kwargs)
+
+
+async def ahighlight_color_font(
+    text, color_font=None, executor: Optional[Executor] = None, semaphore: Optional[asyncio.Semaphore] = None, **kwargs
+) -> str:
+    """Highlight data with table_color and font in executor.
+
+    Args:
+        text: data to highlight.
+        color_font: table_color and font for highlight.
+        executor: thread pool to render chunks, default executor of event loop if None.
+        semaphore: limit of jobs in executor, `render_semaphore()` if None.
+        **kwargs: arguments of `highlight_color_font`.
+    """
+    return await _ahighlight(text, "color", executor, semaphore, color_font=color_font, **kwargs)
+
+
+async def atabulate_with_color_font(
+    text, color_font=None, executor: Optional[Executor] = None, semaphore: Optional[asyncio.Semaphore] = None, **kwargs
+) -> str:
+    """Highlight data with Table style in executor.
+
+    Args:
+        text: data to highlight.
+        color_font: table_color and font for highlight.
+        executor: thread pool to render chunks, default executor of event loop if None.
+        semaphore: limit of jobs in executor, `render_semaphore()` if None.
+        **kwargs: arguments of `tabulate_with_color_font`.
+    """
+    return await _ahighlight(text, "table", executor, semaphore, color_font=color_font, **kwargs)
+
+
+async def ahighlight_to(
+    writer: asyncio.StreamWriter,
+    text,
+    style="json",
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    encoding="utf-8",
+    executor: Optional[Executor] = None,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    **kwargs,
+) -> int:
+    """Highlight data in executor and write it to stream by chunks during rendering.
+
+    Writer is drained after every chunk, so slow reader does not make buffer of writer grow, the next chunk is not
+    rendered until the previous one is sent.
+
+    Args:
+        writer: asyncio stream writer.
+        text: data to highlight.
+        style: "json", "color" or "table" for `highlight_json_style`, `highlight_color_font`
+            or `tabulate_with_color_font` style.
+        chunk_size: max length of written str.
+        encoding: encoding of written bytes.
+        executor: thread pool to render chunks, default executor of event loop if None.
+        semaphore: limit of jobs in executor, `render_semaphore()` if None.
+        **kwargs: arguments of highlight function of the style, `color="auto"` is checked for the pipe of writer,
+            output to sockets and other transports is not highlighted.
+
+    Returns:
+        number of written chars.
+    """
+    if kwargs.get("color") == "auto":
+        pipe = writer.transport.get_extra_info("pipe")
+        kwargs["color"] = "always" if pipe is not None and use_color("auto", pipe) else "never"
+    written = 0
+    chunks = aiter_highlight(text, style, chunk_size, executor, semaphore, **kwargs)
+    try:
+        async for chunk in chunks:
+            writer.write(chunk.encode(encoding))
+            written += len(chunk)
+            await writer.drain()
+    finally:
+        await chunks.aclose()
+    return written
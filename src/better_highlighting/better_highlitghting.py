@@ -1,34 +1,82 @@
 """Main module."""
+import os
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+)
+from functools import partial
 from itertools import product
-from typing import Union
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
 
 from better_highlighting.components.colors import (
     Dark,
     Normal,
 )
-from better_highlighting.components.creator import OutputCreator
+from better_highlighting.components.creator import (
+    DEFAULT_CHUNK_SIZE,
+    OutputCreator,
+)
 from better_highlighting.components.fonts import Fonts
 from better_highlighting.components.highlighters import (
     ColorFrontPrinter,
+    JSONFilePrinter,
     JSONPrinter,
+    PagedTablePrinter,
     TablePrinter,
 )
+from better_highlighting.components.lexers_and_styles.style_cache import (
+    json_formatter,
+    json_lexer,
+    simple_formatter,
+)
+from better_highlighting.components.plain import use_color
+from better_highlighting.data_format import RenderConfig
+
+if TYPE_CHECKING:
+    from better_highlighting.components.token_stream import TokenStream
 
 
 class HighLightStyleColor(OutputCreator):
     """Color and font highlighter."""
 
-    def __init__(self, color_front=None, wrap=False, short=False):
+    def __init__(
+        self,
+        color_front=None,
+        wrap=False,
+        short=False,
+        max_chars=None,
+        max_lines=None,
+        config: Optional[RenderConfig] = None,
+        color="always",
+    ):
         """Init.
 
         Args:
             color_front: table_color and font for highlight.
             wrap: wrap result string.
             short: cut to make it short.
+            max_chars: max number of visible chars of result str.
+            max_lines: max number of lines of result str.
+            config: limits and styles of render, current module limits if None.
+            color: "always", "never" or "auto" to highlight only output to terminal without `NO_COLOR`.
         """
         self.color_front = color_front
         self.wrap = wrap
         self.short = short
+        self.max_chars = max_chars
+        self.max_lines = max_lines
+        self.config = config
+        self.color = color
 
     def highlight(self, text: Union[dict, str, tuple, list]) -> "ColorFrontPrinter":
         """Highlight data with table_color.
@@ -36,21 +84,50 @@ class HighLightStyleColor(OutputCreator):
         Args:
             text: data to highlight.
         """
-        return ColorFrontPrinter(text, color_front=self.color_front, wrap=False, short=False)
+        return ColorFrontPrinter(
+            text,
+            color_front=self.color_front,
+            wrap=False,
+            short=False,
+            max_chars=self.max_chars,
+            max_lines=self.max_lines,
+            config=self.config,
+            color=use_color(self.color),
+        )
 
 
 class HighLightStyleJSON(OutputCreator):
     """JSON Style highlighter."""
 
-    def __init__(self, wrap=False, short=False):
+    def __init__(
+        self,
+        wrap=False,
+        short=False,
+        max_chars=None,
+        max_lines=None,
+        config: Optional[RenderConfig] = None,
+        color="always",
+        summary=False,
+    ):
         """Init.
 
         Args:
             wrap: wrap result string.
             short: cut to make it short.
+            max_chars: max number of visible chars of result str.
+            max_lines: max number of lines of result str.
+            config: limits and styles of render, current module limits if None.
+            color: "always", "never" or "auto" to highlight only output to terminal without `NO_COLOR`.
+            summary: highlight schema of list of records instead of records: keys, types, nulls, min, max and
+                distinct values.
         """
         self.wrap = wrap
         self.short = short
+        self.max_chars = max_chars
+        self.max_lines = max_lines
+        self.config = config
+        self.color = color
+        self.summary = summary
 
     def highlight(self, text: Union[dict, str, tuple, list]) -> "JSONPrinter":
         """Highlight data with JSON style colors.
@@ -58,13 +135,32 @@ class HighLightStyleJSON(OutputCreator):
         Args:
             text: data to highlight.
         """
-        return JSONPrinter(text, wrap=self.wrap, short=self.short)
+        return JSONPrinter(
+            text,
+            wrap=self.wrap,
+            short=self.short,
+            max_chars=self.max_chars,
+            max_lines=self.max_lines,
+            config=self.config,
+            color=use_color(self.color),
+            summary=self.summary,
+        )
 
 
 class TableStyleJSON(OutputCreator):
     """Table highlighter."""
 
-    def __init__(self, color_front=None, wrap=False, short=False, transpose=False, show_headers=True):
+    def __init__(
+        self,
+        color_front=None,
+        wrap=False,
+        short=False,
+        transpose=False,
+        show_headers=True,
+        config: Optional[RenderConfig] = None,
+        color="always",
+        summary=False,
+    ):
         """Init.
 
         Args:
@@ -73,12 +169,18 @@ class TableStyleJSON(OutputCreator):
             short: cut to make it short.
             transpose: transpose table.
             show_headers: show table headers.
+            config: limits and styles of render, current module limits if None.
+            color: "always", "never" or "auto" to highlight only output to terminal without `NO_COLOR`.
+            summary: table of schema of list of records with one row for every key instead of records.
         """
         self.color_front = color_front
         self.wrap = wrap
         self.short = short
         self.transpose = transpose
         self.show_headers = show_headers
+        self.config = config
+        self.color = color
+        self.summary = summary
 
     def highlight(
         self,
@@ -96,32 +198,181 @@ class TableStyleJSON(OutputCreator):
             short=self.short,
             transpose=self.transpose,
             show_headers=self.show_headers,
+            config=self.config,
+            color=use_color(self.color),
+            summary=self.summary,
         )
 
 
-def highlight_color_font(text, color_font=None):
+def warm_up(color_font=None):
+    """Compile token tables of lexer and styles of formatters before the first highlight.
+
+    The first highlight in process takes tens of milliseconds for regular expressions of `JSONPythonLexer`, long-running
+    services can call it on start to keep latency of requests flat.
+
+    Args:
+        color_font: table_color and font of `highlight_color_font` to prepare.
+    """
+    json_lexer(ensurenl=False)
+    json_lexer(ensurenl=True)
+    json_formatter()
+    simple_formatter(color_font)
+
+
+def highlight_color_font(
+    text, color_font=None, max_chars=None, max_lines=None, config: Optional[RenderConfig] = None, color="always"
+):
     """Highlight data with table_color and font.
 
     Args:
         text: data to highlight.
         color_font: table_color and font for highlight.
+        max_chars: max number of visible chars of result str, the rest is replaced by "several items were not printed".
+        max_lines: max number of lines of result str, the rest is replaced by "several items were not printed".
+        config: limits of render, current module limits if None.
+        color: "always", "never" or "auto" to highlight only output to terminal without `NO_COLOR`, text of "never"
+            mode is not lexed and formatted.
     """
-    return HighLightStyleColor(color_font).highlighter(text)
+    creator = HighLightStyleColor(color_font, max_chars=max_chars, max_lines=max_lines, config=config, color=color)
+    return creator.highlighter(text)
+
+
+def highlight_json_style(
+    text,
+    wrap=False,
+    short=False,
+    max_chars=None,
+    max_lines=None,
+    config: Optional[RenderConfig] = None,
+    color="always",
+    summary=False,
+):
+    """Highlight data with JSON style.
 
+    Rendering stops when `max_chars` or `max_lines` is reached, so its time depends on size of output for large data.
 
-def highlight_json_style(text, wrap=False, short=False):
-    """Highlight data with JSON style.
+    Args:
+        text: data to highlight.
+        wrap: wrap result string.
+        short: cut to make result str short.
+        max_chars: max number of visible chars of result str, the rest is replaced by "several items were not printed".
+        max_lines: max number of lines of result str, the rest is replaced by "several items were not printed".
+        config: limits and styles of render, current module limits if None.
+        color: "always", "never" or "auto" to highlight only output to terminal without `NO_COLOR`, text of "never"
+            mode is not lexed and formatted.
+        summary: highlight schema of list of records instead of records: keys, types, nulls, min, max and distinct
+            values, records are read in one pass and size of result does not depend on their number.
+    """
+    creator = HighLightStyleJSON(
+        wrap=wrap, short=short, max_chars=max_chars, max_lines=max_lines, config=config, color=color, summary=summary
+    )
+    return creator.highlighter(text)
+
+
+def tabulate_with_color_font(
+    text,
+    color_font=None,
+    wrap=False,
+    short=False,
+    transpose=False,
+    show_headers=True,
+    config: Optional[RenderConfig] = None,
+    color="always",
+    summary=False,
+):
+    """Highlight data with Table style.
 
     Args:
         text: data to highlight.
+        color_font: table_color and font for highlight.
         wrap: wrap result string.
         short: cut to make result str short.
+        transpose: transpose table.
+        show_headers: show table headers
+        config: limits and styles of render, current module limits if None.
+        color: "always", "never" or "auto" to highlight only output to terminal without `NO_COLOR`, text of "never"
+            mode is not lexed and formatted.
+        summary: table of schema of list of records with one row for every key instead of records.
     """
-    return HighLightStyleJSON(wrap=wrap, short=short).highlighter(text)
+    return TableStyleJSON(
+        color_font,
+        wrap=wrap,
+        short=short,
+        transpose=transpose,
+        show_headers=show_headers,
+        config=config,
+        color=color,
+        summary=summary,
+    ).highlighter(text)
 
 
-def tabulate_with_color_font(text, color_font=None, wrap=False, short=False, transpose=False, show_headers=True):
-    """Highlight data with Table style.
+def iter_highlight_color_font(
+    text,
+    color_font=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    max_chars=None,
+    max_lines=None,
+    config: Optional[RenderConfig] = None,
+    color="always",
+) -> Iterator[str]:
+    """Highlight data with table_color and font, result is yielded by chunks during rendering.
+
+    Args:
+        text: data to highlight.
+        color_font: table_color and font for highlight.
+        chunk_size: max length of yielded str.
+        max_chars: max number of visible chars of result str.
+        max_lines: max number of lines of result str.
+        config: limits of render, current module limits if None.
+        color: "always", "never" or "auto" to highlight only output to terminal without `NO_COLOR`.
+    """
+    creator = HighLightStyleColor(color_font, max_chars=max_chars, max_lines=max_lines, config=config, color=color)
+    return creator.iter_highlighter(text, chunk_size)
+
+
+def iter_highlight_json_style(
+    text,
+    wrap=False,
+    short=False,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    max_chars=None,
+    max_lines=None,
+    config: Optional[RenderConfig] = None,
+    color="always",
+    summary=False,
+) -> Iterator[str]:
+    """Highlight data with JSON style, result is yielded by chunks during rendering.
+
+    Args:
+        text: data to highlight.
+        wrap: wrap result string.
+        short: cut to make result str short.
+        chunk_size: max length of yielded str.
+        max_chars: max number of visible chars of result str.
+        max_lines: max number of lines of result str.
+        config: limits and styles of render, current module limits if None.
+        color: "always", "never" or "auto" to highlight only output to terminal without `NO_COLOR`.
+        summary: highlight schema of list of records instead of records.
+    """
+    creator = HighLightStyleJSON(
+        wrap=wrap, short=short, max_chars=max_chars, max_lines=max_lines, config=config, color=color, summary=summary
+    )
+    return creator.iter_highlighter(text, chunk_size)
+
+
+def iter_tabulate_with_color_font(
+    text,
+    color_font=None,
+    wrap=False,
+    short=False,
+    transpose=False,
+    show_headers=True,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    config: Optional[RenderConfig] = None,
+    color="always",
+    summary=False,
+) -> Iterator[str]:
+    """Highlight data with Table style, result is yielded by chunks during rendering.
 
     Args:
         text: data to highlight.
@@ -130,10 +381,257 @@ def tabulate_with_color_font(text, color_font=None, wrap=False, short=False, tra
         short: cut to make result str short.
         transpose: transpose table.
         show_headers: show table headers
+        chunk_size: max length of yielded str.
+        config: limits and styles of render, current module limits if None.
+        color: "always", "never" or "auto" to highlight only output to terminal without `NO_COLOR`.
+        summary: table of schema of list of records with one row for every key instead of records.
     """
     return TableStyleJSON(
-        color_font, wrap=wrap, short=short, transpose=transpose, show_headers=show_headers
-    ).highlighter(text)
+        color_font,
+        wrap=wrap,
+        short=short,
+        transpose=transpose,
+        show_headers=show_headers,
+        config=config,
+        color=color,
+        summary=summary,
+    ).iter_highlighter(text, chunk_size)
+
+
+def highlight_json_file(
+    source,
+    wrap=False,
+    short=False,
+    max_chars=None,
+    max_lines=None,
+    config: Optional[RenderConfig] = None,
+    color="always",
+) -> str:
+    """Highlight JSON document with JSON style without loading of its data.
+
+    Result is the same as `highlight_json_style` of `json.load` result.
+
+    Args:
+        source: path of UTF-8 JSON file or its bytes.
+        wrap: wrap result string.
+        short: cut to make result str short, the rest of arrays, objects and long str is skipped without decoding.
+        max_chars: max number of visible chars of result str, the rest of file is not read.
+        max_lines: max number of lines of result str, the rest of file is not read.
+        config: limits and styles of render, current module limits if None.
+        color: "always", "never" or "auto" to highlight only output to terminal without `NO_COLOR`.
+    """
+    chunks = iter_highlight_json_file(
+        source, wrap, short, max_chars=max_chars, max_lines=max_lines, config=config, color=color
+    )
+    return "".join(chunks)
+
+
+def iter_highlight_json_file(
+    source,
+    wrap=False,
+    short=False,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    max_chars=None,
+    max_lines=None,
+    config: Optional[RenderConfig] = None,
+    color="always",
+) -> Iterator[str]:
+    """Highlight JSON document with JSON style, file is memory-mapped and result is yielded by chunks during scanning.
+
+    Memory does not depend on size of file: values are decoded one by one, arrays and objects are not built.
+
+    Args:
+        source: path of UTF-8 JSON file or its bytes.
+        wrap: wrap result string.
+        short: cut to make result str short, the rest of arrays, objects and long str is skipped without decoding.
+        chunk_size: max length of yielded str.
+        max_chars: max number of visible chars of result str, the rest of file is not read.
+        max_lines: max number of lines of result str, the rest of file is not read.
+        config: limits and styles of render, current module limits if None.
+        color: "always", "never" or "auto" to highlight only output to terminal without `NO_COLOR`.
+
+    Raises:
+        ValueError: file is not valid JSON, chunks before the error are already yielded.
+    """
+    printer = JSONFilePrinter(
+        source,
+        wrap=wrap,
+        short=short,
+        max_chars=max_chars,
+        max_lines=max_lines,
+        config=config,
+        color=use_color(color),
+    )
+    return printer.iter_format(chunk_size)
+
+
+def iter_table_pages(
+    rows: Iterable,
+    color_font=None,
+    short=False,
+    transpose=False,
+    show_headers=True,
+    page_size: Optional[int] = None,
+    sample_size: Optional[int] = None,
+    config: Optional[RenderConfig] = None,
+    color="always",
+) -> Iterator[str]:
+    """Highlight rows with Table style, every page of rows is yielded as one table.
+
+    Rows are read from iterable page by page, e.g. from cursor of database, so memory does not depend on number
+    of rows. Widths of columns are found by the first `sample_size` rows and are kept for the next pages.
+
+    Args:
+        rows: iterable of rows, dict, list, tuple or one value.
+        color_font: table_color and font for highlight.
+        short: cut every row to make result str short.
+        transpose: transpose every page.
+        show_headers: show table headers, numbers of rows are counted from the first page.
+        page_size: rows of one page, `ROWS_PER_PAGE` if None.
+        sample_size: rows read ahead to find widths of columns, `WIDTH_SAMPLE_ROWS` if None, 0 for widths of every
+            page.
+        config: limits and styles of render, current module limits if None.
+        color: "always", "never" or "auto" to highlight only output to terminal without `NO_COLOR`, text of "never"
+            mode is not lexed and formatted.
+    """
+    printer = PagedTablePrinter(
+        rows,
+        color_front=color_font,
+        short=short,
+        transpose=transpose,
+        show_headers=show_headers,
+        config=config,
+        color=use_color(color),
+        page_size=page_size,
+        sample_size=sample_size,
+    )
+    return printer.iter_pages()
+
+
+_ITER_HIGHLIGHTERS: Dict[str, Callable[..., Iterator[str]]] = {
+    "json": iter_highlight_json_style,
+    "color": iter_highlight_color_font,
+    "table": iter_tabulate_with_color_font,
+}
+
+
+def highlight_to(stream: IO[str], text, style="json", chunk_size=DEFAULT_CHUNK_SIZE, **kwargs) -> int:
+    """Highlight data and write it to file-like object by chunks during rendering.
+
+    Args:
+        stream: text file-like object.
+        text: data to highlight.
+        style: "json", "color" or "table" for `highlight_json_style`, `highlight_color_font`
+            or `tabulate_with_color_font` style.
+        chunk_size: max length of written str.
+        **kwargs: arguments of highlight function of the style, "auto" color mode checks `stream` itself.
+
+    Returns:
+        number of written chars.
+    """
+    if style not in _ITER_HIGHLIGHTERS:
+        raise ValueError(f"unknown style: {style}, expected one of: {', '.join(_ITER_HIGHLIGHTERS)}")
+    if kwargs.get("color") == "auto":
+        kwargs["color"] = "always" if use_color("auto", stream) else "never"
+
+    written = 0
+    flush = getattr(stream, "flush", None)
+    for chunk in _ITER_HIGHLIGHTERS[style](text, chunk_size=chunk_size, **kwargs):
+        stream.write(chunk)
+        written += len(chunk)
+        if flush:
+            flush()
+    return written
+
+
+# Less objects are rendered in the calling process, pickling costs more than rendering for them.
+MIN_OBJECTS_FOR_WORKERS = 64
+# Every worker gets several batches to balance objects of different size.
+BATCHES_PER_WORKER = 4
+
+_CREATORS: Dict[str, Callable[..., OutputCreator]] = {
+    "json": HighLightStyleJSON,
+    "color": HighLightStyleColor,
+    "table": TableStyleJSON,
+}
+
+
+def _highlight_batch(style: str, options: dict, objects: List) -> List[str]:
+    """Highlight objects of one batch, module level function to be pickled for process pool."""
+    return _CREATORS[style](**options).highlighter_many(objects)
+
+
+def _batches(objects: List, parts: int) -> List[List]:
+    size = -(-len(objects) // parts)
+    return [objects[i : i + size] for i in range(0, len(objects), size)]
+
+
+def highlight_many(
+    objects: Iterable,
+    style="json",
+    short=False,
+    wrap=False,
+    color_font=None,
+    executor: Optional[Executor] = None,
+    workers=0,
+    **kwargs,
+) -> List[str]:
+    """Highlight every object with the same style, lexer and formatter are prepared once for all objects.
+
+    Args:
+        objects: data to highlight.
+        style: "json", "color" or "table" for `highlight_json_style`, `highlight_color_font`
+            or `tabulate_with_color_font` style.
+        short: cut to make result str short.
+        wrap: wrap result string.
+        color_font: table_color and font for "color" and "table" styles.
+        executor: thread or process pool to render batches of objects.
+        workers: number of processes to render objects if executor is not set, or number of workers of executor.
+        **kwargs: other arguments of highlighter of the style.
+
+    Returns:
+        highlighted str of every object in the same order.
+    """
+    if style not in _CREATORS:
+        raise ValueError(f"unknown style: {style}, expected one of: {', '.join(_CREATORS)}")
+
+    objects = list(objects)
+    options = {"wrap": wrap, "short": short, **kwargs}
+    if color_font is not None:
+        options["color_front"] = color_font
+    render = partial(_highlight_batch, style, options)
+
+    if len(objects) < MIN_OBJECTS_FOR_WORKERS or (executor is None and workers < 2):
+        return render(objects)
+    if executor is None:
+        with ProcessPoolExecutor(workers) as pool:
+            return _map_batches(pool, render, objects, workers)
+    return _map_batches(executor, render, objects, workers or os.cpu_count() or 1)
+
+
+def _map_batches(executor: Executor, render, objects: List, workers: int) -> List[str]:
+    """Render batches of objects by executor, results are in order of objects."""
+    batches = _batches(objects, workers * BATCHES_PER_WORKER)
+    return [text for batch in executor.map(render, batches) for text in batch]
+
+
+def render_tokens(text, style="json", color_font=None, **kwargs) -> "TokenStream":
+    """Render data once to tokens which are emitted by several output backends, see `emit`.
+
+    Token stream is picklable, so it can be rendered in worker process and emitted in another one.
+
+    Args:
+        text: data to highlight.
+        style: "json", "color" or "table" for `highlight_json_style`, `highlight_color_font`
+            or `tabulate_with_color_font` style.
+        color_font: table_color and font for "color" and "table" styles.
+        **kwargs: other arguments of highlighter of the style.
+    """
+    if style not in _CREATORS:
+        raise ValueError(f"unknown style: {style}, expected one of: {', '.join(_CREATORS)}")
+    if color_font is not None:
+        kwargs["color_front"] = color_font
+    return _CREATORS[style](**kwargs).highlight(text).token_stream()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,173 @@
+"""Views of rich objects for `make_it_short`: fields of objects and summaries of NumPy and pandas data.
+
+Views are built from references to fields and from head and tail of arrays, the whole object is never copied, so cost
+does not depend on size of data. NumPy and pandas are looked up in `sys.modules` and are not imported, an object
+of these libraries can exist only if the library is already imported. The module itself is imported by `make_it_short`
+only for objects which are not containers or scalars, so `dataclasses` is not imported by other renders.
+"""
+import sys
+import warnings
+from dataclasses import fields
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+_STATS = ("min", "max", "mean")
+
+
+def object_fields(value) -> Optional[Dict[str, Any]]:
+    """Fields of dataclass instance or of slotted object without its own repr, None for other values.
+
+    Args:
+        value: object to read fields.
+    """
+    cls = type(value)
+    if hasattr(cls, "__dataclass_fields__") and not isinstance(value, type):
+        return {field.name: getattr(value, field.name) for field in fields(value)}
+
+    # repr of slotted object is `<Class object at 0x...>` unless class has its own one
+    if cls.__repr__ is not object.__repr__ or not hasattr(cls, "__slots__"):
+        return None
+    missing = object()
+    result = {}
+    for name in _slot_names(cls):
+        field = getattr(value, name, missing)
+        if field is not missing:
+            result[name] = field
+    return result
+
+
+def _slot_names(cls: type) -> Iterator[str]:
+    """Names of slots of class and of its bases, private names are mangled like attribute names."""
+    for base in reversed(cls.__mro__):
+        slots = base.__dict__.get("__slots__", ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if name in ("__dict__", "__weakref__"):
+                continue
+            yield f"_{base.__name__.lstrip('_')}{name}" if name.startswith("__") and not name.endswith("__") else name
+
+
+def data_summary(value, length: int, width: int) -> Optional[Dict[str, Any]]:
+    """Summary of NumPy array, pandas Series or DataFrame, None for other values.
+
+    Args:
+        value: object to summarize.
+        length: number of kept items or rows, the first ones and the last ones.
+        width: number of kept columns of DataFrame.
+    """
+    numpy = sys.modules.get("numpy")
+    if numpy is not None and isinstance(value, numpy.ndarray):
+        return _array_summary(numpy, value, length)
+    pandas = sys.modules.get("pandas")
+    if pandas is not None and isinstance(value, pandas.Series):
+        return _series_summary(value, length)
+    if pandas is not None and isinstance(value, pandas.DataFrame):
+        return _frame_summary(value, length, width)
+    return None
+
+
+def _ends(size: int, length: int) -> Tuple[int, int]:
+    """Numbers of the first and the last items which are kept from `size` items."""
+    if size <= length:
+        return size, 0
+    return length - length // 2, length // 2
+
+
+def _scalar(value) -> Any:
+    """Python scalar of NumPy scalar."""
+    return value.item() if hasattr(value, "item") else value
+
+
+def _array_summary(numpy, array, length: int) -> Dict[str, Any]:
+    summary: Dict[str, Any] = {"type": "ndarray", "dtype": str(array.dtype), "shape": array.shape}
+    is_numeric = numpy.issubdtype(array.dtype, numpy.integer) or numpy.issubdtype(array.dtype, numpy.floating)
+    if is_numeric and array.size:
+        with warnings.catch_warnings():
+            # NaN of all-NaN array is the result, not a problem of data
+            warnings.simplefilter("ignore", RuntimeWarning)
+            summary.update(
+                (name, _scalar(function(array)))
+                for name, function in zip(_STATS, (numpy.nanmin, numpy.nanmax, numpy.nanmean))
+            )
+    head, tail = _ends(array.size, length)
+    # flat slices copy only kept items, also for not contiguous arrays
+    _add_ends(summary, array.flat[:head].tolist(), array.flat[array.size - tail :].tolist() if tail else None)
+    return summary
+
+
+def _series_summary(series, length: int) -> Dict[str, Any]:
+    summary: Dict[str, Any] = {"type": "Series", "name": series.name, "dtype": str(series.dtype), "length": len(series)}
+    summary.update(_column_stats(series))
+    head, tail = _ends(len(series), length)
+    _add_ends(summary, _series_items(series.iloc[:head]), _series_items(series.iloc[-tail:]) if tail else None)
+    return summary
+
+
+def _frame_summary(frame, length: int, width: int) -> Dict[str, Any]:
+    columns = [frame.iloc[:, position] for position in range(min(width, frame.shape[1]))]
+    names = _column_names(columns)
+    summary: Dict[str, Any] = {
+        "type": "DataFrame",
+        "shape": frame.shape,
+        "columns": {name: str(column.dtype) for name, column in zip(names, columns)},
+    }
+    stats = {name: _column_stats(column) for name, column in zip(names, columns)}
+    if any(stats.values()):
+        summary["stats"] = {name: column_stats for name, column_stats in stats.items() if column_stats}
+    head, tail = _ends(len(frame), length)
+    rows = _frame_rows(columns, names, slice(head))
+    _add_ends(summary, rows, _frame_rows(columns, names, slice(-tail, None)) if tail else None)
+    return summary
+
+
+def _column_names(columns: list) -> List[Any]:
+    """Names of columns taken by position, repeated name gets number of its copy, e.g. `a` and `a (2)`."""
+    names: List[Any] = []
+    seen = {column.name for column in columns}
+    copies: Dict[Any, int] = {}
+    for column in columns:
+        if column.name not in copies:
+            copies[column.name] = 1
+            names.append(column.name)
+            continue
+        name = column.name
+        while name in seen:
+            copies[column.name] += 1
+            name = f"{column.name} ({copies[column.name]})"
+        seen.add(name)
+        names.append(name)
+    return names
+
+
+def _column_stats(series) -> Dict[str, Any]:
+    """Min, max and mean of numeric Series, empty dict for other dtypes."""
+    if series.dtype.kind not in "iuf" or series.empty:
+        return {}
+    return {name: _scalar(getattr(series, name)()) for name in _STATS}
+
+
+def _series_items(series) -> Dict[Any, Any]:
+    return dict(zip(series.index.tolist(), series.tolist()))
+
+
+def _frame_rows(columns: list, names: List[Any], kept: slice) -> Dict[Any, Dict[Any, Any]]:
+    """Rows of DataFrame by index, only kept rows of columns are converted."""
+    values = [column.iloc[kept] for column in columns]
+    if not values:
+        return {}
+    rows = zip(*(value.tolist() for value in values))
+    return {index: dict(zip(names, row)) for index, row in zip(values[0].index.tolist(), rows)}
+
+
+def _add_ends(summary: Dict[str, Any], head, tail):
+    """Add all items, or the first and the last items if some items are skipped."""
+    if tail is None:
+        summary["items"] = head
+    else:
+        summary["head"] = head
+        summary["tail"] = tail
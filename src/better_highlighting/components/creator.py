@@ -5,7 +5,22 @@ from abc import (
     ABC,
     abstractmethod,
 )
-from typing import Union
+from copy import copy
+from typing import (
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
+
+from better_highlighting.components.emitter import iter_chunks
+from better_highlighting.data_format import (
+    RenderConfig,
+    default_config,
+)
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
 
 
 class OutputCreator(ABC):
@@ -19,27 +34,93 @@ class OutputCreator(ABC):
         """Call for formatter."""
         return self.highlight(text).format()
 
+    def iter_highlighter(self, text, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+        """Call for formatter, highlighted str is yielded by chunks during rendering."""
+        return self.highlight(text).iter_format(chunk_size)
+
+    def highlighter_many(self, texts: Iterable) -> List[str]:
+        """Call for formatter for every item, lexer and formatter are prepared once for all items."""
+        return self.highlight(list(texts)).format_many()
+
+
+def _format_each(printer) -> List[str]:
+    """Highlighted str of every item of printer data, printer is copied to keep its data."""
+    item_printer = copy(printer)
+    result = []
+    for text in printer.target_text:
+        item_printer.target_text = text
+        result.append(item_printer.format())
+    return result
+
 
 class FormattedString(ABC):
     """Concrete creator for str formatted by table_color, font or JSON Style."""
 
-    def __init__(self, target_text, wrap=False, short=False, color_front="white"):
-        """Init."""
+    def __init__(
+        self,
+        target_text,
+        wrap=False,
+        short=False,
+        color_front="white",
+        direct=True,
+        max_chars=None,
+        max_lines=None,
+        config: Optional[RenderConfig] = None,
+        color=True,
+        summary=False,
+    ):
+        """Init.
+
+        Args:
+            target_text: data to highlight.
+            wrap: wrap result string.
+            short: cut to make it short.
+            color_front: table_color and font for highlight.
+            direct: get tokens of dict, list and tuple from data structure instead of lexing of the whole str.
+            max_chars: max number of visible chars of result str, rendering stops when it is reached.
+            max_lines: max number of lines of result str, rendering stops when it is reached.
+            config: limits and styles of render, current module limits if None.
+            color: highlight result str, otherwise it is the same text without escape codes and without lexing.
+            summary: highlight schema of records from `records_summary` instead of records.
+        """
         self.target_text = target_text
         self.wrap = wrap
         self.short = short
         self.color_front = color_front
+        self.direct = direct
+        self.max_chars = max_chars
+        self.max_lines = max_lines
+        self.config = default_config() if config is None else config
+        self.color = color
+        self.summary = summary
 
     @abstractmethod
     def format(self) -> str:
         """Prepare highlighted str."""
 
+    def iter_format(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+        """Prepare highlighted str by chunks with length of `chunk_size`, str is rendered at once and is split."""
+        yield from iter_chunks((self.format(),), chunk_size)
+
+    def format_many(self) -> List[str]:
+        """Prepare highlighted str for every item of data."""
+        return _format_each(self)
+
 
 class FormattedTableString(ABC):
     """Concrete creator for str formatted by Table Style."""
 
     def __init__(
-        self, target_text, wrap=False, short=False, color_front="ansiwhite", transpose=False, show_headers=False
+        self,
+        target_text,
+        wrap=False,
+        short=False,
+        color_front="ansiwhite",
+        transpose=False,
+        show_headers=False,
+        config: Optional[RenderConfig] = None,
+        color=True,
+        summary=False,
     ):
         """Init."""
         self.target_text = target_text
@@ -48,7 +129,18 @@ class FormattedTableString(ABC):
         self.color_front = color_front
         self.transpose = transpose
         self.show_headers = show_headers
+        self.config = default_config() if config is None else config
+        self.color = color
+        self.summary = summary
 
     @abstractmethod
     def format(self) -> str:
         """Prepare highlighted str."""
+
+    def iter_format(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+        """Prepare highlighted str by chunks with length of `chunk_size`, str is rendered at once and is split."""
+        yield from iter_chunks((self.format(),), chunk_size)
+
+    def format_many(self) -> List[str]:
+        """Prepare highlighted str for every item of data."""
+        return _format_each(self)
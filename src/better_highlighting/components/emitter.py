@@ -0,0 +1,420 @@
+"""Direct tokens emitter for dict, list and tuple data.
+
+Structure of formatted data is already known, so only keys and values are lexed (one by one and with cache), brackets,
+separators and indents get tokens without `JSONPythonLexer`. Every value is checked to be lexed the same way as inside
+of the whole str, the first value that fails the check and the rest of its line are lexed by regex lexer, so result
+tokens are always the same as tokens of the whole str. New line resets state of the lexer, direct tokens continue after
+it unless the state can go over it (docstring, escaped new line), then the whole rest of the str is lexed.
+"""
+import re
+from collections import deque
+from functools import lru_cache
+from itertools import islice
+from typing import (
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from pygments import format as pygments_format
+from pygments.formatter import Formatter
+from pygments.lexer import Lexer
+from pygments.token import (
+    Error,
+    Number,
+    Operator,
+    Punctuation,
+    String,
+    Text,
+    Token,
+    _TokenType,
+)
+
+from better_highlighting.components.lexers_and_styles.json_lexer import (
+    SpecialMessages,
+)
+from better_highlighting.components.lexers_and_styles.style_cache import (
+    json_lexer,
+)
+from better_highlighting.data_format import NOT_PRINTED_MESSAGE
+
+TokenPair = Tuple[_TokenType, str]
+
+MAX_CACHED_VALUE_LENGTH = 256
+TOKENS_PER_PIECE = 512
+
+_BOX_CHARS = "╒═╤╕╞╪╡├─┼┤╘╧╛│"
+_STRUCTURE_TOKENS = re.compile(rf"(\n)|([^\S\n]+)|([]{{}}:(),;[])|([{_BOX_CHARS}])")
+_STRUCTURE_FIRST_TOKEN = {
+    "\n": Text,
+    " ": Text,
+    **{char: Punctuation for char in "[]{}:(),;"},
+    **{char: Token.Table_1 for char in _BOX_CHARS},
+}
+# Docstring rules are anchored to line start and can take indent of structure or the next parts of str.
+_NOT_SAFE_VALUE = re.compile(r"\A\s|\n\Z|\r|\A\ufeff|\"\"\"|'''")
+# Docstring state of lexer can go over new lines, escaped new line is checked at the end of line.
+_MULTILINE_STATE = re.compile(r"\"\"\"|'''")
+# Values which tokens are known without lexer: int, float, None, True, False and simple str keys.
+# Float without point ("1e+16") is not here, lexer takes its first digits and letter as `Text.Addition_2`.
+_SIMPLE_VALUE = re.compile(r"(-)?(?:(\d+)|(\d+\.\d+(?:e[+-]\d+)?))|(None)|(True)|(False)|(')([^\\'\"%{\n]*)(')")
+# Any char which does not match rules of root state, regex lexer yields it as Error without changing of the state.
+_NO_CONTEXT_CHAR = "\x00"
+
+
+def _structure_tokens(text: str) -> Iterator[TokenPair]:
+    """Tokens of brackets, separators, indents and box chars of table."""
+    for new_line, spaces, punctuation, box in _STRUCTURE_TOKENS.findall(text):
+        if punctuation:
+            yield Punctuation, punctuation
+        elif box:
+            yield Token.Table_1, box
+        else:
+            yield Text, new_line or spaces
+
+
+def _lex_value(lexer: Lexer, value: str, follow: str, at_start: bool) -> Optional[Tuple[TokenPair, ...]]:
+    """Lex value without the rest of str.
+
+    Args:
+        lexer: regex lexer.
+        value: key or value to lex.
+        follow: the first char of the next structure part, empty if value is the last part.
+        at_start: value is the first part of str.
+
+    Returns:
+        tokens or None if the value can be lexed in other way inside of the whole str.
+    """
+    if _NOT_SAFE_VALUE.search(value):
+        return None
+
+    prefix = "" if at_start else _NO_CONTEXT_CHAR
+    tokens = [(ttype, text) for _, ttype, text in lexer.get_tokens_unprocessed(prefix + value + follow)]
+    if prefix:
+        if tokens[0] != (Error, prefix):
+            return None
+        del tokens[0]
+    if follow:
+        if tokens[-1] != (_STRUCTURE_FIRST_TOKEN.get(follow), follow):
+            return None
+        del tokens[-1]
+    return tuple(tokens)
+
+
+def _simple_value_tokens(minus, integer, float_number, null, true, false, quote, key, _) -> Tuple[TokenPair, ...]:
+    if null or true or false:
+        return ((Token.Null, null),) if null else ((Token.CustomTrue, true),) if true else ((Token.CustomFalse, false),)
+    if quote:
+        if not key:
+            return ((String.Single, quote),) * 2
+        return (String.Single, quote), (String.Single, key), (String.Single, quote)
+    number = (Number.Integer, integer) if integer else (Number.Float, float_number)
+    return ((Operator, minus), number) if minus else (number,)
+
+
+@lru_cache(maxsize=8192)
+def _lex_value_cached(lexer: Lexer, value: str, follow: str, at_start: bool) -> Optional[Tuple[TokenPair, ...]]:
+    return _lex_value(lexer, value, follow, at_start)
+
+
+def _merged_parts(parts: Iterable[Tuple[bool, str]]) -> Iterator[Tuple[bool, str]]:
+    """Join neighbour structure parts and skip empty values."""
+    structure = []
+    for is_value, text in parts:
+        if not is_value:
+            structure.append(text)
+        elif text:
+            if structure:
+                yield False, "".join(structure)
+                structure = []
+            yield True, text
+    if structure:
+        yield False, "".join(structure)
+
+
+def iter_tokens(parts: Iterable[Tuple[bool, str]], lexer: Optional[Lexer] = None) -> Iterator[TokenPair]:
+    """Get tokens of formatted data parts without lexing of the whole str.
+
+    Result is the same as `lexer.get_tokens` of joined parts, `ensurenl` option of lexer adds new line to the end.
+
+    Args:
+        parts: structure and value parts from `iter_pretty_parts` or `iter_grid_parts`.
+        lexer: regex lexer for keys, values and fallback.
+    """
+    lexer = lexer or json_lexer(ensurenl=False)
+    end = "\n" if lexer.ensurenl else ""
+    merged = _merged_parts(parts)
+    window = deque(islice(merged, 2))
+    # structure is kept until the next value is lexed, whitespaces of both can be one token
+    structure = ""
+    at_start = True
+
+    while window:
+        is_value, text = window.popleft()
+        window.extend(islice(merged, 1))
+        if at_start and not structure:
+            # `stripnl` of lexer removes leading new lines of the whole str
+            text = text.lstrip("\n")
+        if not window:
+            text = text.rstrip("\n")
+
+        if not is_value:
+            structure = text
+            continue
+
+        follow = ""
+        if window:
+            follow = window[0][1][:1] if len(window) > 1 else window[0][1].rstrip("\n")[:1]
+        follow = follow or end
+        simple = _SIMPLE_VALUE.fullmatch(text)
+        tokens: Optional[Tuple[TokenPair, ...]]
+        if simple:
+            tokens = _simple_value_tokens(*simple.groups())
+        elif len(text) <= MAX_CACHED_VALUE_LENGTH:
+            tokens = _lex_value_cached(lexer, text, follow, at_start and not structure)
+        else:
+            tokens = _lex_value(lexer, text, follow, at_start and not structure)
+        if tokens is None:
+            if at_start:
+                rest = structure + text + _joined(window) + _joined(merged)
+                yield from _fallback_tokens(lexer, rest, at_start)
+                return
+            line, after_line = _fallback_line(structure + text, window, merged)
+            if after_line is not None:
+                window.extend(islice(merged, 2 - len(window)))
+            if after_line is None or not (window or after_line.strip("\n")):
+                yield from _fallback_tokens(lexer, line + (after_line or ""), at_start)
+                return
+            # token of new line depends on state of the lexer at the end of line
+            yield from _fallback_tokens(lexer, line + "\n", at_start, last=False)
+            structure = after_line[1:] if window else after_line[1:].rstrip("\n")
+            continue
+
+        yield from _structure_tokens(structure)
+        yield from tokens
+        structure = ""
+        at_start = False
+
+    yield from _structure_tokens(structure + end)
+
+
+def _joined(parts: Iterable[Tuple[bool, str]]) -> str:
+    return "".join(text for _, text in parts)
+
+
+def _drain(window: deque, merged: Iterator[Tuple[bool, str]]) -> Iterator[Tuple[bool, str]]:
+    """Parts of window and then the next parts, parts which are not taken stay in window and in iterator."""
+    while window:
+        yield window.popleft()
+    # `yield from` the iterator itself would close it with this generator, parts which are not taken stay in it
+    yield from iter(merged.__next__, None)
+
+
+def _fallback_line(text: str, window: deque, merged: Iterator[Tuple[bool, str]]) -> Tuple[str, Optional[str]]:
+    """Text from the value which can not be lexed alone to the first new line of structure which resets the lexer.
+
+    Returns:
+        text before the new line and structure from the new line, or the whole rest of str and None if state of the
+        lexer can go over every new line.
+    """
+    pieces = [text]
+    for is_value, part in _drain(window, merged):
+        if _MULTILINE_STATE.search(pieces[-1]):
+            pieces.append(part)
+            pieces.extend(part for _, part in _drain(window, merged))
+            break
+        if not is_value and "\n" in part:
+            head, new_line, tail = part.partition("\n")
+            if head or not pieces[-1].endswith(("\\", "\r")):
+                pieces.append(head)
+                return "".join(pieces), new_line + tail
+        pieces.append(part)
+    return "".join(pieces), None
+
+
+def _fallback_tokens(lexer: Lexer, text: str, at_start: bool, last=True) -> Iterator[TokenPair]:
+    """Lex the rest of str with regex lexer.
+
+    Args:
+        lexer: regex lexer.
+        text: the rest of str starting from the value which can not be lexed alone.
+        at_start: text is the whole str.
+        last: text is the end of str, otherwise it ends with new line of structure.
+    """
+    if at_start:
+        yield from lexer.get_tokens(text)
+        return
+
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    if last:
+        text = text.rstrip("\n") + ("\n" if lexer.ensurenl else "")
+    tokens = lexer.get_tokens_unprocessed(_NO_CONTEXT_CHAR + text)
+    # the first token is the context char
+    if next(tokens, None) is None:
+        return
+    for _, ttype, value in tokens:
+        yield ttype, value
+
+
+def limit_tokens(
+    tokens: Iterable[TokenPair], max_chars: Optional[int] = None, max_lines: Optional[int] = None
+) -> Iterator[TokenPair]:
+    """Yield tokens of str cut to `max_chars` chars and `max_lines` lines.
+
+    Cut str ends with `NOT_PRINTED_MESSAGE` counted in `max_chars` (the marker itself is not cut), tokens after the cut
+    are not read, so the rest of data is not serialized and lexed. Str without new lines is bounded by `max_chars` only.
+
+    Args:
+        tokens: tokens of str.
+        max_chars: max number of chars of result str, escape codes are not counted.
+        max_lines: max number of lines of result str.
+    """
+    if max_chars is None and max_lines is None:
+        yield from tokens
+        return
+
+    marker = ((Text, " "), (SpecialMessages, NOT_PRINTED_MESSAGE))
+    # position where marker starts if str is cut by chars, tokens after it are kept until the end of str is known
+    marker_start = None if max_chars is None else max(max_chars - sum(len(text) for _, text in marker), 0)
+    pending: List[TokenPair] = []
+    pending_start = position = lines = 0
+    for ttype, value in tokens:
+        cut = None
+        if max_lines is not None and "\n" in value:
+            new_lines = value.count("\n")
+            if lines + new_lines >= max_lines:
+                cut = position + _nth_index(value, "\n", max_lines - lines)
+            lines += new_lines
+        if (
+            max_chars is not None
+            and marker_start is not None
+            and (cut is not None or position + len(value) > max_chars)
+        ):
+            cut = marker_start if cut is None else min(cut, marker_start)
+
+        if cut is not None:
+            if not pending:
+                pending_start = position
+            pending.append((ttype, value))
+            yield from _tokens_before(pending, pending_start, cut)
+            yield from marker
+            return
+
+        if pending or (marker_start is not None and position + len(value) > marker_start):
+            if not pending:
+                pending_start = position
+            pending.append((ttype, value))
+        else:
+            yield ttype, value
+        position += len(value)
+    yield from pending
+
+
+def _nth_index(text: str, char: str, number: int) -> int:
+    """Index of `number`-th char in text."""
+    index = -1
+    for _ in range(number):
+        index = text.index(char, index + 1)
+    return index
+
+
+def _tokens_before(tokens: Iterable[TokenPair], start: int, end: int) -> Iterator[TokenPair]:
+    """Tokens of str from `start` position cut at `end` position."""
+    for ttype, value in tokens:
+        if start >= end:
+            return
+        if start + len(value) > end:
+            value = value[: end - start]
+        if value:
+            yield ttype, value
+        start += len(value)
+
+
+def format_tokens(tokens: Iterable[TokenPair], formatter: Formatter, codes: Optional[dict] = None) -> str:
+    """Write escape codes of tokens, the same result as `Terminal256Formatter.format` but with codes cache per token.
+
+    Args:
+        tokens: tokens to format.
+        formatter: formatter with compiled style.
+        codes: cache of escape codes per token type, it is shared by several str of the same formatter.
+    """
+    return "".join(iter_format_tokens(tokens, formatter, codes))
+
+
+def iter_format_tokens(
+    tokens: Iterable[TokenPair], formatter: Formatter, codes: Optional[dict] = None
+) -> Iterator[str]:
+    """Yield formatted pieces, every piece is joined from `TOKENS_PER_PIECE` tokens with escape codes.
+
+    Args:
+        tokens: tokens to format.
+        formatter: formatter with compiled style.
+        codes: cache of escape codes per token type, it is shared by several str of the same formatter.
+    """
+    style_string = getattr(formatter, "style_string", None)
+    if style_string is None or getattr(formatter, "linenos", False):
+        yield pygments_format(tokens, formatter)
+        return
+
+    codes = {} if codes is None else codes
+    piece: List[str] = []
+    write = piece.append
+    for count, (ttype, value) in enumerate(tokens, start=1):
+        if ttype in codes:
+            code = codes[ttype]
+        else:
+            code = codes[ttype] = _token_code(style_string, ttype)
+
+        if code is None:
+            write(value)
+        elif "\n" not in value:
+            if value:
+                write(code[0] + value + code[1])
+        else:
+            on, off = code
+            lines = value.split("\n")
+            for line in lines[:-1]:
+                if line:
+                    write(on + line + off)
+                write("\n")
+            if lines[-1]:
+                write(on + lines[-1] + off)
+
+        if not count % TOKENS_PER_PIECE:
+            yield "".join(piece)
+            piece.clear()
+    yield "".join(piece)
+
+
+def iter_chunks(pieces: Iterable[str], chunk_size: int) -> Iterator[str]:
+    """Join small pieces of str and split big ones to chunks with length of `chunk_size`.
+
+    Args:
+        pieces: str pieces.
+        chunk_size: max length of chunk, the last one can be shorter.
+    """
+    buffer = []
+    size = 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            joined = "".join(buffer)
+            tail = size - size % chunk_size
+            for i in range(0, tail, chunk_size):
+                yield joined[i : i + chunk_size]
+            buffer = [joined[tail:]]
+            size -= tail
+    if size:
+        yield "".join(buffer)
+
+
+def _token_code(style_string, ttype: _TokenType) -> Optional[Tuple[str, str]]:
+    """Escape codes of the token or of the closest parent with style."""
+    while ttype:
+        if str(ttype) in style_string:
+            return style_string[str(ttype)]
+        ttype = ttype.parent
+    return None
@@ -1,28 +1,146 @@
 """Main module."""
-from functools import partial
+from itertools import (
+    chain,
+    islice,
+)
+from typing import (
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+)
 
-import pandas as pd
-from pygments import highlight
-from pygments.formatters.terminal256 import Terminal256Formatter
-from tabulate import tabulate
+from pygments.token import Token
 
 from better_highlighting.components.creator import (
+    DEFAULT_CHUNK_SIZE,
     FormattedString,
     FormattedTableString,
 )
-from better_highlighting.components.lexers_and_styles.json_lexer import (
-    JSONLexer,
+from better_highlighting.components.emitter import (
+    TokenPair,
+    iter_chunks,
+    iter_format_tokens,
+    iter_tokens,
+    limit_tokens,
 )
-from better_highlighting.components.lexers_and_styles.style_builders import (
-    JSONStyle,
-    SimpleStyle,
+from better_highlighting.components.lexers_and_styles.style_cache import (
+    json_formatter,
+    json_lexer,
+    simple_formatter,
 )
+from better_highlighting.components.metrics import (
+    NULL_RECORDER,
+    recorder,
+)
+from better_highlighting.components.plain import iter_plain_text
 from better_highlighting.data_format import (
+    RenderConfig,
+    iter_pretty_parts,
     make_it_short,
     pretty_as_iterator,
     pretty_as_text,
 )
 
+# separator of tables of every 4 rows of `TablePrinter`
+TABLES_SEPARATOR = f'{"↑" * 103}\n{"↓" * 103}\n'
+
+
+def _data_tokens(data, wrap: bool, direct: bool, stages=NULL_RECORDER, config: Optional[RenderConfig] = None):
+    """Tokens of formatted data, only raw str and disabled direct mode need lexing of the whole str."""
+    if direct and isinstance(data, (dict, list, tuple)):
+        parts = stages.stage("serialize", iter_pretty_parts(data, wrap=wrap, config=config))
+        return iter_tokens(parts, json_lexer(ensurenl=False))
+
+    if wrap:
+        as_string = stages.call("serialize", pretty_as_iterator, data, config=config)
+    else:
+        as_string = stages.call("serialize", pretty_as_text, data)
+    return json_lexer(ensurenl=False).get_tokens(as_string)
+
+
+def _limited_tokens(printer: FormattedString, data, stages=NULL_RECORDER):
+    """Tokens of formatted data cut to `max_chars` and `max_lines` of printer, the rest of data is not formatted."""
+    tokens = _data_tokens(data, printer.wrap, printer.direct, stages, printer.config)
+    return stages.stage("lex", limit_tokens(tokens, printer.max_chars, printer.max_lines), upstream="serialize")
+
+
+def _summary(data, config: RenderConfig):
+    """Schema summary of records, other data is returned as is."""
+    # pylint: disable=import-outside-toplevel
+    from better_highlighting.components.schema import records_summary
+
+    return records_summary(data, config.min_length_dict)
+
+
+def _prepared(printer: FormattedString, data, stages=NULL_RECORDER):
+    """Data of printer in summary and short modes."""
+    if printer.summary:
+        data = stages.call("summary", _summary, data, printer.config)
+    if printer.short:
+        data = stages.call("short", make_it_short, data, config=printer.config)
+    return data
+
+
+def _iter_format(printer: FormattedString, formatter, chunk_size: int) -> Iterator[str]:
+    """Highlighted str of printer data by chunks, stages are measured if instrumentation is on."""
+    stages = recorder(type(printer).__name__)
+    try:
+        data = _prepared(printer, printer.target_text, stages)
+        pieces = iter_format_tokens(_limited_tokens(printer, data, stages), formatter)
+        yield from iter_chunks(stages.stage("format", pieces, upstream="lex"), chunk_size)
+    finally:
+        stages.finish()
+
+
+def _plain_pieces(data, wrap: bool, direct: bool, config: Optional[RenderConfig] = None) -> Iterator[str]:
+    """Text of formatted data, the same one which is lexed by `_data_tokens`."""
+    if direct and isinstance(data, (dict, list, tuple)):
+        for _, text in iter_pretty_parts(data, wrap=wrap, config=config):
+            yield text
+    elif wrap:
+        yield pretty_as_iterator(data, config=config)
+    else:
+        yield pretty_as_text(data)
+
+
+def _plain_text(printer: FormattedString, data, stages=NULL_RECORDER) -> Iterator[str]:
+    """Text of formatted data without escape codes cut to `max_chars` and `max_lines` of printer, data is not lexed."""
+    pieces = stages.stage("serialize", _plain_pieces(data, printer.wrap, printer.direct, printer.config))
+    return iter_plain_text(pieces, printer.max_chars, printer.max_lines)
+
+
+def _iter_plain(printer: FormattedString, chunk_size: int) -> Iterator[str]:
+    """Text of printer data without escape codes by chunks, stages are measured if instrumentation is on."""
+    stages = recorder(type(printer).__name__)
+    try:
+        data = _prepared(printer, printer.target_text, stages)
+        yield from iter_chunks(_plain_text(printer, data, stages), chunk_size)
+    finally:
+        stages.finish()
+
+
+def _plain_many(printer: FormattedString) -> List[str]:
+    """Text without escape codes of every item of printer data."""
+    result = []
+    for text in printer.target_text:
+        result.append("".join(_plain_text(printer, _prepared(printer, text))))
+    return result
+
+
+def _printer_tokens(printer: FormattedString) -> Iterator[TokenPair]:
+    """Tokens of printer data, the same ones which are formatted by `iter_format`."""
+    return _limited_tokens(printer, _prepared(printer, printer.target_text))
+
+
+def _format_many(printer: FormattedString, formatter) -> List[str]:
+    """Highlighted str of every item of printer data with one formatter and one cache of escape codes."""
+    codes: dict = {}
+    result = []
+    for text in printer.target_text:
+        result.append("".join(iter_format_tokens(_limited_tokens(printer, _prepared(printer, text)), formatter, codes)))
+    return result
+
 
 class JSONPrinter(FormattedString):
     """Data convertor to str and highlight with JSON style."""
@@ -33,18 +151,92 @@ class JSONPrinter(FormattedString):
 
     def format(self) -> str:
         """Prepare highlighted str."""
-        if self.short:
-            self.target_text = make_it_short(self.target_text)
+        return "".join(self.iter_format())
+
+    def iter_format(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+        """Prepare highlighted str by chunks with length of `chunk_size`."""
+        if not self.color:
+            yield from _iter_plain(self, chunk_size)
+            return
+        try:
+            formatter = json_formatter(styles=self.config.styles)
+        except (AttributeError, AssertionError) as e:
+            raise e from e
+        yield from _iter_format(self, formatter, chunk_size)
+
+    def format_many(self) -> List[str]:
+        """Prepare highlighted str for every item of data, formatter is prepared once."""
+        if not self.color:
+            return _plain_many(self)
+        try:
+            formatter = json_formatter(styles=self.config.styles)
+        except (AttributeError, AssertionError) as e:
+            raise e from e
+        return _format_many(self, formatter)
+
+    def token_stream(self):
+        """Prepare tokens of highlighted str for several output backends."""
+        # pylint: disable=import-outside-toplevel
+        from better_highlighting.components.token_stream import (
+            StreamStyle,
+            TokenStream,
+        )
 
-        as_string = pretty_as_iterator(self.target_text) if self.wrap else pretty_as_text(self.target_text)
+        return TokenStream.from_tokens(_printer_tokens(self), StreamStyle("json", styles=self.config.styles))
 
+
+class JSONFilePrinter(FormattedString):
+    """JSON document convertor to str and highlight with JSON style, file is memory-mapped and is not loaded."""
+
+    def __init__(self, *args, **kwargs):
+        """Init."""
+        super().__init__(*args, **kwargs)
+
+    def format(self) -> str:
+        """Prepare highlighted str."""
+        return "".join(self.iter_format())
+
+    def iter_format(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+        """Prepare highlighted str by chunks with length of `chunk_size`, document is scanned during rendering."""
+        # pylint: disable=import-outside-toplevel
+        from better_highlighting.components.json_file import (
+            iter_json_parts,
+            mapped_json,
+        )
+
+        if not self.color:
+            yield from self._iter_plain(chunk_size)
+            return
         try:
-            str_highlighted = highlight(
-                as_string, JSONLexer(ensurenl=False), Terminal256Formatter(style=JSONStyle().style_obj)
-            )
+            formatter = json_formatter(styles=self.config.styles)
         except (AttributeError, AssertionError) as e:
             raise e from e
-        return str_highlighted
+        stages = recorder(type(self).__name__)
+        try:
+            with mapped_json(self.target_text) as data:
+                parts = stages.stage("serialize", iter_json_parts(data, self.wrap, self.short, self.config))
+                tokens = limit_tokens(iter_tokens(parts, json_lexer(ensurenl=False)), self.max_chars, self.max_lines)
+                pieces = iter_format_tokens(stages.stage("lex", tokens, upstream="serialize"), formatter)
+                yield from iter_chunks(stages.stage("format", pieces, upstream="lex"), chunk_size)
+        finally:
+            stages.finish()
+
+    def _iter_plain(self, chunk_size: int) -> Iterator[str]:
+        """Text of document without escape codes by chunks, document is scanned and is not lexed."""
+        # pylint: disable=import-outside-toplevel
+        from better_highlighting.components.json_file import (
+            iter_json_parts,
+            mapped_json,
+        )
+
+        stages = recorder(type(self).__name__)
+        try:
+            with mapped_json(self.target_text) as data:
+                parts = stages.stage("serialize", iter_json_parts(data, self.wrap, self.short, self.config))
+                pieces = iter_plain_text((text for _, text in parts), self.max_chars, self.max_lines)
+                yield from iter_chunks(pieces, chunk_size)
+        finally:
+            stages.finish()
 
 
 class ColorFrontPrinter(FormattedString):
@@ -56,20 +248,38 @@ class ColorFrontPrinter(FormattedString):
 
     def format(self) -> str:
         """Prepare highlighted str."""
-        if self.short:
-            self.target_text = make_it_short(self.target_text)
+        return "".join(self.iter_format())
 
-        as_string = pretty_as_iterator(self.target_text) if self.wrap else pretty_as_text(self.target_text)
+    def iter_format(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+        """Prepare highlighted str by chunks with length of `chunk_size`."""
+        if not self.color:
+            yield from _iter_plain(self, chunk_size)
+            return
+        try:
+            formatter = simple_formatter(self.color_front)
+        except (AttributeError, AssertionError) as e:
+            raise e from e
+        yield from _iter_format(self, formatter, chunk_size)
 
+    def format_many(self) -> List[str]:
+        """Prepare highlighted str for every item of data, formatter is prepared once."""
+        if not self.color:
+            return _plain_many(self)
         try:
-            str_highlighted = highlight(
-                as_string,
-                JSONLexer(ensurenl=False),
-                Terminal256Formatter(style=SimpleStyle(self.color_front).style_obj),
-            )
+            formatter = simple_formatter(self.color_front)
         except (AttributeError, AssertionError) as e:
             raise e from e
-        return str_highlighted
+        return _format_many(self, formatter)
+
+    def token_stream(self):
+        """Prepare tokens of highlighted str for several output backends."""
+        # pylint: disable=import-outside-toplevel
+        from better_highlighting.components.token_stream import (
+            StreamStyle,
+            TokenStream,
+        )
+
+        return TokenStream.from_tokens(_printer_tokens(self), StreamStyle("simple", self.color_front))
 
 
 class TablePrinter(FormattedTableString):
@@ -81,35 +291,196 @@ class TablePrinter(FormattedTableString):
 
     def format(self) -> str:
         """Prepare highlighted str."""
-        data_to_process = (
-            (make_it_short(self.target_text, nested=True) if self.short else self.target_text)
-            if isinstance(self.target_text, list)
-            else [make_it_short(self.target_text, nested=True) if self.short else self.target_text]
+        return "".join(self.iter_format())
+
+    def iter_format(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+        """Prepare highlighted str by chunks with length of `chunk_size`, every 4 rows are rendered separately."""
+        stages = recorder(type(self).__name__)
+        try:
+            cells, headers = stages.call("cells", self._cells, self._rows(stages), self.config)
+            yield from iter_chunks(self._iter_tables(cells, headers, stages), chunk_size)
+        finally:
+            stages.finish()
+
+    def _rows(self, stages=NULL_RECORDER) -> list:
+        """Rows of table in summary and short modes, data which is not list is one row."""
+        data = self.target_text
+        is_rows = isinstance(data, list)
+        if self.summary:
+            # pylint: disable=import-outside-toplevel
+            from better_highlighting.components.schema import schema_rows
+
+            summary = stages.call("summary", _summary, data, self.config)
+            if summary is not data:
+                data, is_rows = schema_rows(summary), True
+        if self.short:
+            data = stages.call("short", make_it_short, data, nested=True, config=self.config)
+        return data if is_rows else [data]
+
+    @staticmethod
+    def _cells(data_to_process, config: Optional[RenderConfig] = None):
+        """Cells of every row for every column and headers of columns."""
+        # pylint: disable=import-outside-toplevel
+        from better_highlighting.components.table import table_columns
+
+        columns, rows = table_columns(data_to_process)
+        headers = [f"||{str(column).upper()}||" for column in columns]
+        cells = [_row_cells(row, columns, config) for row in rows]
+        return cells, headers
+
+    def _iter_tables(self, cells, headers, stages=NULL_RECORDER) -> Iterator[str]:
+        """Highlighted tables of every 4 rows with separators between them."""
+        # pylint: disable=import-outside-toplevel
+        from better_highlighting.components.table import iter_cell_tables
+
+        formatter = None
+        if self.color:
+            try:
+                formatter = json_formatter(self.color_front, self.config.styles)
+            except (AttributeError, AssertionError) as e:
+                raise e from e
+        for i, table in enumerate(iter_cell_tables(cells, headers, self.transpose, self.show_headers)):
+            if i:
+                yield TABLES_SEPARATOR
+            yield _table_text(table, formatter, stages) if formatter else _plain_table(table, stages)
+
+    def token_stream(self):
+        """Prepare tokens of highlighted str for several output backends."""
+        # pylint: disable=import-outside-toplevel
+        from better_highlighting.components.table import iter_cell_tables
+        from better_highlighting.components.token_stream import (
+            StreamStyle,
+            TokenStream,
+        )
+
+        cells, headers = self._cells(self._rows(), self.config)
+        tables = iter_cell_tables(cells, headers, self.transpose, self.show_headers)
+        tokens = chain.from_iterable(
+            chain(((Token, TABLES_SEPARATOR),) if i else (), _table_tokens(table)) for i, table in enumerate(tables)
+        )
+        stream = TokenStream.from_tokens(tokens, StreamStyle("json", self.color_front, self.config.styles))
+        # the same length, offsets of tokens are kept
+        return stream._replace(text=stream.text.replace("||", "  "))
+
+
+class PagedTablePrinter(FormattedTableString):
+    """Rows convertor to pages of highlighted tables, rows are read from iterable page by page.
+
+    Widths of columns are found by the first `sample_size` rows and are shared by all pages, so pages of one stream are
+    aligned while their cells are not wider. Columns of rows after the sample are added to the next pages.
+    """
+
+    def __init__(self, *args, page_size: Optional[int] = None, sample_size: Optional[int] = None, **kwargs):
+        """Init.
+
+        Args:
+            *args: arguments of `FormattedTableString`, `target_text` is iterable of rows.
+            page_size: rows of one page, `ROWS_PER_PAGE` if None.
+            sample_size: rows read ahead to find widths of columns, `WIDTH_SAMPLE_ROWS` if None.
+            **kwargs: arguments of `FormattedTableString`.
+        """
+        super().__init__(*args, **kwargs)
+        # pylint: disable=import-outside-toplevel
+        from better_highlighting.components.table import (
+            ROWS_PER_PAGE,
+            WIDTH_SAMPLE_ROWS,
+        )
+
+        self.page_size = page_size or ROWS_PER_PAGE
+        self.sample_size = WIDTH_SAMPLE_ROWS if sample_size is None else sample_size
+
+    def format(self) -> str:
+        """Prepare highlighted str."""
+        return "".join(self.iter_pages())
+
+    def iter_format(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+        """Prepare highlighted str by chunks with length of `chunk_size`."""
+        yield from iter_chunks(self.iter_pages(), chunk_size)
+
+    def iter_pages(self) -> Iterator[str]:
+        """Highlighted table of every `page_size` rows, the next rows are not read until the page is taken."""
+        # pylint: disable=import-outside-toplevel
+        from better_highlighting.components.table import (
+            cell_table,
+            column_widths,
         )
 
-        data_frame = pd.DataFrame(data_to_process)
-
-        data_frame.columns = [f"||{str(column).upper()}||" for column in data_frame.columns]
-
-        for column in data_frame.columns:
-            data_frame[column] = data_frame[column].apply(partial(pretty_as_iterator, htchar=" "))
-
-        table_as_list = [
-            highlight(
-                tabulate(
-                    **{
-                        "tabular_data": data_frame.iloc[i : i + 4].transpose()
-                        if self.transpose
-                        else data_frame.iloc[i : i + 4],
-                        "showindex": self.show_headers,  # True if transpose else False,
-                        "tablefmt": "fancy_grid",
-                        "colalign": ("left",),
-                    }
-                ),
-                JSONLexer(),
-                Terminal256Formatter(style=JSONStyle(self.color_front).style_obj),
-            ).replace("||", "  ")
-            for i in range(0, len(data_frame), 4)
-        ]
-
-        return f'{"↑" * 103}\n{"↓" * 103}\n'.join(table_as_list)
+        stages = recorder(type(self).__name__)
+        formatter = None
+        if self.color:
+            try:
+                formatter = json_formatter(self.color_front, self.config.styles)
+            except (AttributeError, AssertionError) as e:
+                raise e from e
+        try:
+            rows = iter(self.target_text)
+            sample = list(islice(rows, self.sample_size))
+            columns: dict = {}
+            cells = self._iter_cells(chain(sample, rows), columns, stages)
+            sample_cells = list(islice(cells, len(sample)))
+            widths: Sequence[int] = ()
+            if sample_cells and not self.transpose:
+                widths = column_widths(cell_table(_padded(sample_cells, len(columns)), [], False, self.show_headers))
+
+            cells = chain(sample_cells, cells)
+            start = 0
+            while True:
+                page = _padded(list(islice(cells, self.page_size)), len(columns))
+                if not page:
+                    return
+                headers = [f"||{str(column).upper()}||" for column in columns]
+                table = cell_table(page, headers, self.transpose, self.show_headers, start)
+                if formatter:
+                    yield _table_text(table, formatter, stages, widths)
+                else:
+                    yield _plain_table(table, stages, widths)
+                start += len(page)
+        finally:
+            stages.finish()
+
+    def _iter_cells(self, rows, columns: dict, stages) -> Iterator[List[Optional[str]]]:
+        """Cells of every row for columns found so far, new columns of row are added to `columns`."""
+        # pylint: disable=import-outside-toplevel
+        from better_highlighting.components.table import row_as_dict
+
+        for row in rows:
+            if self.short:
+                row = stages.call("short", make_it_short, row, nested=True, config=self.config)
+            row = row_as_dict(row)
+            columns.update(dict.fromkeys(row))
+            yield stages.call("cells", _row_cells, row, columns, self.config)
+
+
+def _row_cells(row: dict, columns, config: Optional[RenderConfig] = None) -> List[Optional[str]]:
+    """Formatted value of row for every column, None is missing cell if row has no column."""
+    return [pretty_as_iterator(row[column], htchar=" ", config=config) if column in row else None for column in columns]
+
+
+def _padded(cells: List[List[Optional[str]]], length: int) -> List[List[Optional[str]]]:
+    """Rows with missing cells of columns which were found after them."""
+    return [row + [None] * (length - len(row)) for row in cells]
+
+
+def _table_tokens(table, stages=NULL_RECORDER, min_widths: Sequence[int] = ()) -> Iterator[TokenPair]:
+    """Tokens of table with `fancy_grid` box chars."""
+    # pylint: disable=import-outside-toplevel
+    from better_highlighting.components.table import iter_grid_parts
+
+    parts = stages.stage("serialize", iter_grid_parts(table, min_widths))
+    return stages.stage("lex", iter_tokens(parts, json_lexer()), upstream="serialize")
+
+
+def _table_text(table, formatter, stages=NULL_RECORDER, min_widths: Sequence[int] = ()) -> str:
+    """Highlighted table with `fancy_grid` box chars."""
+    tokens = _table_tokens(table, stages, min_widths)
+    pieces = stages.stage("format", iter_format_tokens(tokens, formatter), upstream="lex")
+    return "".join(pieces).replace("||", "  ")
+
+
+def _plain_table(table, stages=NULL_RECORDER, min_widths: Sequence[int] = ()) -> str:
+    """Table with `fancy_grid` box chars without escape codes, the same text as `_table_text` has."""
+    # pylint: disable=import-outside-toplevel
+    from better_highlighting.components.table import iter_grid_parts
+
+    parts = stages.stage("serialize", iter_grid_parts(table, min_widths))
+    return "".join(iter_plain_text((text for _, text in parts), ensurenl=True)).replace("||", "  ")
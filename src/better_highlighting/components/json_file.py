@@ -0,0 +1,471 @@
+"""Highlight of JSON documents without loading of data, bytes of memory-mapped file are scanned as a stream.
+
+Parts of document are the same as `iter_pretty_parts` parts of `json.load` result: leaves are decoded one by one and
+containers are not built, so memory does not depend on size of file. Short mode keeps the same items as
+`make_it_short`, the rest of arrays and objects and the end of long str are skipped by scanning of bytes without
+decoding, skipped items are not validated. Keys of objects are not checked for duplicates, every key is printed.
+"""
+import mmap
+import os
+import re
+from contextlib import (
+    ExitStack,
+    contextmanager,
+)
+from json.decoder import scanstring  # type: ignore[attr-defined]
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from better_highlighting.data_format import (
+    RenderConfig,
+    _Budget,
+    _iterator_leaf,
+    _not_printed,
+    _text_leaf,
+    default_config,
+    iter_pretty_parts,
+)
+
+# skipped items are scanned token by token for the first bytes, the rest is scanned by chunks of bytes with
+# strings removed, memory of scanning does not depend on size of arrays
+SKIP_BY_TOKENS_LENGTH = 64 * 1024
+SKIP_CHUNK_SIZE = 1 << 20
+
+_NOT_WHITESPACE = re.compile(rb"[^ \t\n\r]")
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_NUMBER = re.compile(rb"-?(?:0|[1-9][0-9]*)(\.[0-9]+)?([eE][-+]?[0-9]+)?")
+_CONSTANT = re.compile(rb"true|false|null|NaN|Infinity|-Infinity")
+_CONSTANTS = {
+    b"true": True,
+    b"false": False,
+    b"null": None,
+    b"NaN": float("nan"),
+    b"Infinity": float("inf"),
+    b"-Infinity": float("-inf"),
+}
+_SKIPPED = re.compile(rb'["\[\]{}]')
+_STRING_END = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_ESCAPE = re.compile(rb"\\.", re.DOTALL)
+_INNERMOST = re.compile(rb"[\[{][^\[\]{}]*[\]}]")
+_CLOSING = re.compile(rb"[\]}]")
+_NOT_STRUCTURE = bytes(char for char in range(256) if char not in b"[]{},")
+_BOM = b"\xef\xbb\xbf"
+_QUOTE, _COMMA, _COLON = b'",:'
+_OBJECT_START, _OBJECT_END, _ARRAY_START, _ARRAY_END = b"{}[]"
+_STARTS = (_OBJECT_START, _ARRAY_START)
+# the longest escape of one char, surrogate pair
+_MAX_ESCAPE_LENGTH = 12
+
+
+class _Scanner:
+    """Position in bytes of JSON document and decoding of its tokens."""
+
+    __slots__ = ("data", "pos")
+
+    def __init__(self, data):
+        self.data = data
+        self.pos = len(_BOM) if data[: len(_BOM)] == _BOM else 0
+
+    def error(self, message: str) -> ValueError:
+        """Error of document at the current position."""
+        return ValueError(f"{message}: byte {self.pos}")
+
+    def peek(self) -> int:
+        """The next byte after whitespaces, -1 at the end of document."""
+        match = _NOT_WHITESPACE.search(self.data, self.pos)
+        if match is None:
+            self.pos = len(self.data)
+            return -1
+        self.pos = match.start()
+        return self.data[self.pos]
+
+    def finish(self):
+        """Check there is nothing after the value."""
+        if self.peek() != -1:
+            raise self.error("Extra data")
+
+    def next_member(self, first: bool) -> Optional[str]:
+        """Key of the next member of object, position is at its value, None after the end of object.
+
+        Args:
+            first: position is after start of object, not after the previous value.
+        """
+        char = self.peek()
+        if char == _OBJECT_END:
+            self.pos += 1
+            return None
+        if not first:
+            if char != _COMMA:
+                raise self.error("Expecting ',' delimiter")
+            self.pos += 1
+            char = self.peek()
+        if char != _QUOTE:
+            raise self.error("Expecting property name enclosed in double quotes")
+        key = self.string()[0]
+        if self.peek() != _COLON:
+            raise self.error("Expecting ':' delimiter")
+        self.pos += 1
+        return key
+
+    def next_element(self, first: bool) -> bool:
+        """Move position to the next element of array, False after the end of array.
+
+        Args:
+            first: position is after start of array, not after the previous value.
+        """
+        char = self.peek()
+        if char == _ARRAY_END:
+            self.pos += 1
+            return False
+        if not first:
+            if char != _COMMA:
+                raise self.error("Expecting ',' delimiter")
+            self.pos += 1
+        return True
+
+    def enter(self) -> int:
+        """Move position into object or array, get its start byte."""
+        char = self.peek()
+        if char not in _STARTS:
+            raise self.error("Expecting object or array")
+        self.pos += 1
+        return char
+
+    def leaf(self) -> Any:
+        """Decode str, number or constant at position."""
+        char = self.peek()
+        if char == _QUOTE:
+            return self.string()[0]
+        match = _CONSTANT.match(self.data, self.pos)
+        if match:
+            self.pos = match.end()
+            return _CONSTANTS[match.group()]
+        match = _NUMBER.match(self.data, self.pos)
+        if match is None:
+            raise self.error("Expecting value")
+        self.pos = match.end()
+        return float(match.group()) if match.lastindex else int(match.group())
+
+    def string(self, max_length: Optional[int] = None) -> Tuple[str, bool]:
+        """Decode str at position.
+
+        Args:
+            max_length: chars which are enough, only the beginning of much longer str is decoded, the whole str is
+                decoded if None.
+
+        Returns:
+            str or its beginning with at least `max_length` chars and flag of the whole str.
+        """
+        match = _STRING.match(self.data, self.pos)
+        if match is None:
+            raise self.error("Unterminated string")
+        start, end = self.pos + 1, match.end() - 1
+        self.pos = match.end()
+        if max_length is None or end - start < _MAX_ESCAPE_LENGTH * (max_length + 2):
+            return _decode(self.data[start:end]), True
+
+        # every char takes at most 12 bytes, escape or UTF-8 sequence can be cut at the end of the beginning
+        text = self.data[start : start + _MAX_ESCAPE_LENGTH * (max_length + 2)].decode("utf-8", errors="ignore")
+        for cut in range(_MAX_ESCAPE_LENGTH + 1):
+            try:
+                return scanstring(text[: len(text) - cut] + '"', 0)[0], False
+            except ValueError:
+                continue
+        raise self.error("Invalid \\escape")
+
+    def skip_items(self, first: bool) -> int:
+        """Skip the rest of object or array and its end.
+
+        Args:
+            first: position is after start of container, not after the previous value.
+
+        Returns:
+            number of skipped items.
+        """
+        if first and self.peek() in (_OBJECT_END, _ARRAY_END):
+            self.pos += 1
+            return 0
+
+        data, pos = self.data, self.pos
+        depth = 0
+        items = 1 if first else 0
+        by_chunks = True
+        while True:
+            if by_chunks and pos - self.pos > SKIP_BY_TOKENS_LENGTH:
+                by_chunks = False
+                pos, depth, items = self._skip_chunks(pos, depth, items)
+            match = _SKIPPED.search(data, pos)
+            if match is None:
+                self.pos = len(data)
+                raise self.error("Unterminated object or array")
+            start = match.start()
+            if depth == 0:
+                items += _count(data, b",", pos, start)
+            char = data[start]
+            if char == _QUOTE:
+                match = _STRING.match(data, start)
+                if match is None:
+                    self.pos = start
+                    raise self.error("Unterminated string")
+                pos = match.end()
+                continue
+            if char in _STARTS:
+                depth += 1
+            elif depth:
+                depth -= 1
+            else:
+                self.pos = start + 1
+                return items
+            pos = start + 1
+
+    def _skip_chunks(self, pos: int, depth: int, items: int) -> Tuple[int, int, int]:
+        """Skip chunks of bytes before the chunk with the end of container.
+
+        Args:
+            pos: position outside of str.
+            depth: depth of position inside of skipped container.
+            items: number of skipped items before position.
+
+        Returns:
+            position, depth and items at start of the chunk with the end of container, chunks start outside of str.
+        """
+        data = self.data
+        while pos < len(data):
+            end = min(pos + SKIP_CHUNK_SIZE, len(data))
+            chunk = data[pos:end]
+            if (len(chunk) - len(chunk.rstrip(b"\\"))) % 2:
+                # escaped char after the end of chunk
+                end += 1
+                chunk = data[pos:end]
+            chunk = _ESCAPE.sub(b"", chunk)
+            if chunk.count(b'"') % 2:
+                match = _STRING_END.match(data, end)
+                if match is None:
+                    break
+                chunk += _ESCAPE.sub(b"", data[end : match.end()])
+                end = match.end()
+
+            closed, chunk_depth, commas = _structure_of_chunk(b"".join(chunk.split(b'"')[::2]), depth)
+            if closed:
+                break
+            pos, depth, items = end, chunk_depth, items + commas
+        return pos, depth, items
+
+
+def _structure_of_chunk(chunk: bytes, depth: int) -> Tuple[bool, int, int]:
+    """Find whether container ends in chunk without str.
+
+    Args:
+        chunk: bytes outside of str.
+        depth: depth of chunk start inside of container.
+
+    Returns:
+        container ends in chunk, depth of chunk end and number of commas of container items.
+    """
+    chunk = chunk.translate(None, _NOT_STRUCTURE)
+    while True:
+        # commas of nested containers are removed with them
+        reduced = _INNERMOST.sub(b"", chunk)
+        if len(reduced) == len(chunk):
+            break
+        chunk = reduced
+    # closings of containers started before the chunk are before openings of unclosed ones
+    openings = min((position for position in (chunk.find(b"["), chunk.find(b"{")) if position >= 0), default=len(chunk))
+    segments = _CLOSING.split(chunk[:openings])
+    if len(segments) - 1 > depth:
+        return True, 0, 0
+    depth -= len(segments) - 1
+    commas = 0 if depth else segments[-1].count(b",")
+    return False, depth + len(chunk) - openings - chunk.count(b",", openings), commas
+
+
+def _decode(raw: bytes) -> str:
+    if b"\\" not in raw:
+        return raw.decode("utf-8")
+    return scanstring(raw.decode("utf-8") + '"', 0)[0]
+
+
+def _count(data, sub: bytes, start: int, end: int) -> int:
+    """Number of `sub` in bytes of region, mmap has no `count`."""
+    return sum(
+        data[position : min(position + SKIP_CHUNK_SIZE, end)].count(sub)
+        for position in range(start, end, SKIP_CHUNK_SIZE)
+    )
+
+
+class _Nested(NamedTuple):
+    """Object or array at position of scanner, its parts are yielded after parts of container before it."""
+
+    indent: int
+
+
+def _container_parts(scanner: _Scanner, wrap: bool, indent: int, line_width: int) -> Iterator[Any]:
+    """Parts of object or array at position like parts of `iter_pretty_parts`, indent is already increased."""
+    nlch = "\n" + " " * indent
+    first = True
+    if scanner.enter() == _OBJECT_START:
+        while True:
+            key = scanner.next_member(first)
+            if key is None:
+                break
+            if wrap:
+                yield False, nlch if first else "," + nlch
+            elif not first:
+                yield False, ", "
+            first = False
+            yield True, repr(key)
+            yield False, ": "
+            if scanner.peek() in _STARTS:
+                yield _Nested(indent + 2)
+            elif wrap:
+                yield True, _iterator_leaf(scanner.leaf(), " ", "\n", indent + 2, len(key), line_width)
+            else:
+                yield True, _text_leaf(scanner.leaf())
+        if wrap:
+            yield False, "\n"
+        return
+
+    yield False, "["
+    while scanner.next_element(first):
+        if wrap:
+            yield False, nlch if first else "," + nlch
+        elif not first:
+            yield False, ", "
+        first = False
+        if scanner.peek() in _STARTS:
+            yield _Nested(indent + 2)
+        elif wrap:
+            yield True, _iterator_leaf(scanner.leaf(), " ", "\n", indent + 2, 0, line_width)
+        else:
+            yield True, _text_leaf(scanner.leaf())
+    yield False, nlch + "]" if wrap else "]"
+
+
+def iter_json_parts(data, wrap=False, short=False, config: Optional[RenderConfig] = None) -> Iterator[Tuple[bool, str]]:
+    """Split JSON document on parts of `iter_pretty_parts`, document is scanned during iteration.
+
+    Args:
+        data: bytes or memory-mapped file of UTF-8 JSON document.
+        wrap: split `pretty_as_iterator` result instead of `pretty_as_text` one.
+        short: cut document like `make_it_short`, kept items are decoded before the first part.
+        config: limits of render, `default_config()` if None.
+
+    Raises:
+        ValueError: document is not valid JSON, parts before the error are already yielded.
+    """
+    config = config or default_config()
+    scanner = _Scanner(data)
+    if short:
+        value = _short_value(scanner, _Budget(config.short_budget, config.short_budget_encoding, config))
+        scanner.finish()
+        yield from iter_pretty_parts(value, wrap=wrap, config=config)
+        return
+
+    line_width = config.min_length_str_in_dict
+    if scanner.peek() not in _STARTS:
+        value = scanner.leaf()
+        scanner.finish()
+        yield True, _iterator_leaf(value, " ", "\n", 1, 0, line_width) if wrap else _text_leaf(value)
+        return
+
+    stack = [_container_parts(scanner, wrap, 1, line_width)]
+    while stack:
+        for item in stack[-1]:
+            if type(item) is _Nested:  # pylint: disable=unidiomatic-typecheck
+                stack.append(_container_parts(scanner, wrap, item.indent, line_width))
+                break
+            yield item
+        else:
+            stack.pop()
+    scanner.finish()
+
+
+def _short_value(scanner: _Scanner, budget: _Budget) -> Any:
+    """Value at position cut like `make_it_short` result of `json.load` value, skipped items are not decoded."""
+    config = budget.config
+    char = scanner.peek()
+    if char == _ARRAY_START:
+        scanner.enter()
+        result: List[Any] = []
+        first = True
+        # the same as `_short_items` of the first `min_length_list` items
+        while not budget.exhausted and len(result) < config.min_length_list:
+            if not scanner.next_element(first):
+                return result
+            if not first:
+                budget.spend(", ")
+            first = False
+            result.append(_short_value(scanner, budget))
+        skipped = scanner.skip_items(first)
+        if skipped:
+            result.append(_not_printed(skipped))
+        return result
+
+    if char == _OBJECT_START:
+        scanner.enter()
+        members: Dict[str, Any] = {}
+        first = True
+        limit = 0 if budget.exhausted else config.min_length_dict
+        while len(members) < limit:
+            key = scanner.next_member(first)
+            if key is None:
+                return members
+            first = False
+            if budget.left is not None:
+                budget.spend(repr(key))
+                budget.spend(": , ")
+            members[key] = _short_value(scanner, budget)
+            if budget.exhausted:
+                break
+        skipped = scanner.skip_items(first)
+        return [members, _not_printed(skipped)] if skipped else members
+
+    if char == _QUOTE:
+        max_size = config.min_length_str // 5
+        # any longer str is cut in the same way, only its beginning is decoded
+        enough = max(config.min_length_str, max_size * config.min_length_list) + 1
+        value, whole = scanner.string(enough)
+        length = len(value) if whole else enough
+        if length > config.min_length_str:
+            kept = budget.cut(value[: max_size * min(config.min_length_list, (length - 1) // max_size)])
+            budget.spend(kept)
+            return f"{kept} ..."
+        kept = budget.cut(value)
+        budget.spend(kept)
+        return value if kept is value else f"{kept} ..."
+
+    value = scanner.leaf()
+    if budget.left is not None:
+        # repr is built only to count it
+        budget.spend(repr(value))
+    return value
+
+
+@contextmanager
+def mapped_json(source: Union[str, bytes, os.PathLike]) -> Iterator[Any]:
+    """Memory-mapped file of JSON document, bytes are used as is.
+
+    Args:
+        source: path of file or bytes of document.
+    """
+    resources = ExitStack()
+    try:
+        data: Union[bytes, bytearray, mmap.mmap] = b""
+        if isinstance(source, (bytes, bytearray)):
+            data = source
+        else:
+            file = resources.enter_context(open(source, "rb"))
+            # empty file can not be mapped
+            if file.seek(0, 2):
+                data = resources.enter_context(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+        yield data
+    finally:
+        resources.close()
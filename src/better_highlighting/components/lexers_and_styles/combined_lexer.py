@@ -0,0 +1,143 @@
+"""Regex lexer with one combined regular expression per state."""
+import re
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+from pygments.lexer import RegexLexer
+from pygments.token import (
+    Error,
+    Whitespace,
+    _TokenType,
+)
+
+# flags for the whole expression are not allowed inside of alternative, they are scoped to the rule
+_GLOBAL_FLAGS = re.compile(r"\A\(\?([aiLmsux]+)\)")
+
+Rule = Tuple[Callable, Any, Any]
+
+
+def _combine(rules: List[Rule], flags: int) -> Tuple[Callable, Dict[int, Rule]]:
+    """Match function of alternatives of all rules and rule of every alternative group.
+
+    Args:
+        rules: processed rules of state, `(match function, action, new state)`.
+        flags: flags of lexer.
+
+    Returns:
+        match of the combined expression and rules by index of their outer group.
+    """
+    alternatives = []
+    rules_by_group = {}
+    group = 1
+    for rule in rules:
+        # the first item of rule is bound `match` of compiled pattern
+        pattern: "re.Pattern[str]" = getattr(rule[0], "__self__")
+        source = _GLOBAL_FLAGS.sub(lambda match: f"(?{match.group(1)}:", pattern.pattern)
+        if source != pattern.pattern:
+            source += ")"
+        alternatives.append(f"({source})")
+        rules_by_group[group] = rule
+        group += 1 + pattern.groups
+    return re.compile("|".join(alternatives), flags).match, rules_by_group
+
+
+class CombinedRegexLexer(RegexLexer):
+    """Regex lexer which tries rules of state by one combined regular expression.
+
+    `RegexLexer` calls `match` of every rule in order until one of them matches, here the same rules are alternatives of
+    one expression in the same order, so `re` finds the same first matched rule without Python loop per rule. Outer
+    group of the matched alternative is the last closed one, it is `lastindex` of match. Rules must not have numbered
+    backreferences, numbers of groups are shifted in the combined expression.
+
+    Subclasses can set `fast_root_tokens(text, pos)`, it returns tokens of the most frequent values in "root" state
+    without trying of all rules, or None if rules are needed. Tokens of it must not change the state.
+    """
+
+    _combined: Dict[Any, Tuple[Callable, Dict[int, Rule]]]
+
+    @staticmethod
+    def fast_root_tokens(_text: str, _pos: int, /) -> Optional[Tuple[Tuple[_TokenType, str], ...]]:
+        """Tokens of the most frequent values at position of text in "root" state, None if rules are needed.
+
+        Lexer without fast path has no such tokens, the default is not called.
+        """
+
+    def __init__(self, **options):
+        """Init, combined expressions are compiled once per class."""
+        super().__init__(**options)
+        cls = type(self)
+        if "_combined" not in cls.__dict__:
+            cls._combined = {state: _combine(rules, cls.flags) for state, rules in cls._tokens.items()}
+
+    def get_tokens_unprocessed(self, text, stack=("root",)):
+        """Split text to `(index, token type, value)`, the same as `RegexLexer.get_tokens_unprocessed`.
+
+        Args:
+            text: text to lex.
+            stack: initial stack of states.
+        """
+        pos = 0
+        combined = self._combined
+        fast_root_tokens = type(self).fast_root_tokens
+        # the default fast path has no tokens, it is not called for every token
+        has_fast_path = fast_root_tokens is not CombinedRegexLexer.fast_root_tokens
+        root_rules = combined["root"][1]
+        statestack = list(stack)
+        match, rules = combined[statestack[-1]]
+        while True:
+            if has_fast_path and rules is root_rules:
+                tokens = fast_root_tokens(text, pos)
+                if tokens:
+                    for ttype, value in tokens:
+                        yield pos, ttype, value
+                        pos += len(value)
+                    continue
+
+            m = match(text, pos)
+            if m is None:
+                if pos >= len(text):
+                    return
+                if text[pos] == "\n":
+                    # at EOL, reset state to "root"
+                    statestack = ["root"]
+                    match, rules = combined["root"]
+                    yield pos, Whitespace, "\n"
+                else:
+                    yield pos, Error, text[pos]
+                pos += 1
+                continue
+
+            rexmatch, action, new_state = rules[m.lastindex]
+            if action is not None:
+                if type(action) is _TokenType:  # pylint: disable=unidiomatic-typecheck
+                    yield pos, action, m.group()
+                else:
+                    yield from action(self, rexmatch(text, pos))
+            pos = m.end()
+            if new_state is not None:
+                if isinstance(new_state, tuple):
+                    for state in new_state:
+                        if state == "#pop":
+                            if len(statestack) > 1:
+                                statestack.pop()
+                        elif state == "#push":
+                            statestack.append(statestack[-1])
+                        else:
+                            statestack.append(state)
+                elif isinstance(new_state, int):
+                    # pop, but keep at least one state on the stack
+                    if abs(new_state) >= len(statestack):
+                        del statestack[1:]
+                    else:
+                        del statestack[new_state:]
+                elif new_state == "#push":
+                    statestack.append(statestack[-1])
+                else:
+                    raise ValueError(f"wrong state def: {new_state!r}")
+                match, rules = combined[statestack[-1]]
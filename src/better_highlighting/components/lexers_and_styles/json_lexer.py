@@ -1,6 +1,12 @@
 """JSON lexer."""
 # pylint: disable=line-too-long, implicit-str-concat
 # missing-module-docstring # noqa: D104,E501,D100,D101,D102
+import re
+from typing import (
+    Optional,
+    Tuple,
+)
+
 from pygments import unistring as uni
 from pygments.lexer import (
     RegexLexer,
@@ -17,6 +23,11 @@ from pygments.token import (
     String,
     Text,
     Token,
+    _TokenType,
+)
+
+from better_highlighting.components.lexers_and_styles.combined_lexer import (
+    CombinedRegexLexer,
 )
 
 CustomTrue = Token.CustomTrue
@@ -160,4 +171,64 @@ class JSONPythonLexer(RegexLexer):
     }
 
 
-JSONLexer = JSONPythonLexer
+# Most frequent tokens of formatted data in "root" state: new line, punctuation, box chars, spaces, simple single quoted
+# str, ASCII name, int and float. Rules of `JSONPythonLexer` which are tried before them are checked in
+# `_fast_root_tokens`, other cases are lexed by rules.
+_FAST_ROOT = re.compile(
+    r"(\n)|([]{}(),;[]|:(?!=))|([╒═╤╕╞╪╡├─┼┤╘╧╛│])|([^\S\n]+)"
+    r"|'([^\\'\"%{\n]*)'|([A-Za-z_][A-Za-z0-9_]*)|([0-9]+(?:\.[0-9]+)?)"
+).match
+_DOCSTRING_START = re.compile(r"\s*[rRuUbB]{,2}(\"\"\"|\'\'\')").match
+_WORD_RULES = ("True", "true", "False", "false", "None", "none")
+_NOT_PRINTED = "several items were not printed"
+
+
+def _fast_root_tokens(text: str, pos: int) -> Optional[Tuple[Tuple[_TokenType, str], ...]]:
+    """Tokens of the next value in "root" state if rules before its rule can not match, else None."""
+    match = _FAST_ROOT(text, pos)
+    if match is None:
+        return None
+    kind = match.lastindex
+    value = match.group()
+    if kind == 1:
+        return ((Text, value),)
+    if kind == 2:
+        return ((Punctuation, value),)
+    if kind == 3:
+        return ((Table_1, value),)
+
+    previous = text[pos - 1] if pos else "\n"
+    if previous == "|":
+        # header of table
+        return None
+    if previous == "\n" and _DOCSTRING_START(text, pos):
+        return None
+    if kind == 4:
+        return ((Text, value),)
+    if kind == 5:
+        quote = (String.Single, "'")
+        return (quote, (String.Single, match.group(5)), quote) if match.group(5) else (quote, quote)
+
+    following = text[match.end() : match.end() + 1]
+    if following and (following in "'\"._" or following.isalnum() or following > "\x7f"):
+        # prefix of str, the rest of unicode name, float or number with letter
+        return None
+    if kind == 6:
+        if value.startswith(_WORD_RULES) or text.startswith(_NOT_PRINTED, pos):
+            return None
+        return ((Name, value),)
+    return ((Number.Float if "." in value else Number.Integer, value),)
+
+
+class FastJSONPythonLexer(CombinedRegexLexer, JSONPythonLexer):
+    """JSONPythonLexer with the same tokens, rules of state are combined and frequent tokens are lexed without them."""
+
+    name = "FastJSONPython"
+
+    @staticmethod
+    def fast_root_tokens(text: str, pos: int, /) -> Optional[Tuple[Tuple[_TokenType, str], ...]]:
+        """Tokens of the most frequent values at position of text, see `_fast_root_tokens`."""
+        return _fast_root_tokens(text, pos)
+
+
+JSONLexer = FastJSONPythonLexer
@@ -1,6 +1,17 @@
 """Styles."""
+from types import MappingProxyType
+from typing import (
+    Any,
+    Iterable,
+    Mapping,
+    Tuple,
+)
+
 from pygments.style import StyleMeta
-from pygments.token import Token
+from pygments.token import (
+    Token,
+    string_to_tokentype,
+)
 
 _tokens_simple = (
     Token.Text,
@@ -49,27 +60,35 @@ class SimpleStyle:
 
 
 class JSONStyle:
-    """Style to highlight str with JSON colors and intends."""
+    """Style to highlight str with JSON colors and intends, default styles are read-only and shared by instances."""
 
-    styles = {
-        Token.Punctuation: "ansired",
-        Token.String: "#ffa500",
-        Token.Name: "ansigreen",  #'#ffa500',
-        Token.SpecialMessages: "italic #76756C",
-        Token.CustomTrue: "bold #42EB53",
-        Token.CustomFalse: "bold #FF001A",
-        Token.FormatSeparator: "#FFFFFF",
-        Token.Text: "ansigreen",
-        Token.Null: "#40ffff",
-        Token.Number: "#3677a9",
-    }
+    styles: Mapping[Any, str] = MappingProxyType(
+        {
+            Token.Punctuation: "ansired",
+            Token.String: "#ffa500",
+            Token.Name: "ansigreen",  #'#ffa500',
+            Token.SpecialMessages: "italic #76756C",
+            Token.CustomTrue: "bold #42EB53",
+            Token.CustomFalse: "bold #FF001A",
+            Token.FormatSeparator: "#FFFFFF",
+            Token.Text: "ansigreen",
+            Token.Null: "#40ffff",
+            Token.Number: "#3677a9",
+        }
+    )
 
-    def __init__(self, table_color=None):
-        """Init."""
-        if table_color:
-            self.styles.update({Token.Table_1: table_color})
-        else:
-            self.styles.update({Token.Table_1: ""})
+    def __init__(self, table_color=None, styles: Iterable[Tuple[str, str]] = ()):
+        """Init.
+
+        Args:
+            table_color: style of table.
+            styles: pairs of token name, e.g. "String" or "Token.String", and style to override default styles.
+        """
+        self.styles = {
+            **JSONStyle.styles,
+            **{string_to_tokentype(token): style for token, style in styles},
+            Token.Table_1: table_color or "",
+        }
 
         self.style_obj = StyleMeta(
             "JSONStyle",
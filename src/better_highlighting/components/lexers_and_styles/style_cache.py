@@ -0,0 +1,121 @@
+"""Bounded cache of compiled styles, formatters and lexers."""
+from collections import (
+    OrderedDict,
+    namedtuple,
+)
+from threading import Lock
+from typing import (
+    Any,
+    Callable,
+    Hashable,
+    Tuple,
+)
+
+from pygments.formatters.terminal256 import Terminal256Formatter
+
+from better_highlighting.components.lexers_and_styles.json_lexer import (
+    JSONLexer,
+)
+from better_highlighting.components.lexers_and_styles.style_builders import (
+    JSONStyle,
+    SimpleStyle,
+)
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+DEFAULT_MAXSIZE = 128
+
+
+class StyleCache:
+    """LRU cache for objects which are expensive to build on every highlight call.
+
+    Building of ``StyleMeta`` class and ``Terminal256Formatter`` converts every style color
+    to terminal escape code, so compiled objects are kept by ``(kind, color_front)`` key.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        """Init.
+
+        Args:
+            maxsize: max number of kept objects, the least recently used one is evicted first.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Get cached object or build it by factory.
+
+        Args:
+            key: cache key.
+            factory: callable without arguments to build missed object.
+        """
+        try:
+            hash(key)
+        except TypeError:
+            return factory()
+
+        with self._lock:
+            if key in self._data:
+                self.hits += 1
+                self._data.move_to_end(key)
+                return self._data[key]
+            self.misses += 1
+
+        value = factory()
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def info(self) -> CacheInfo:
+        """Cache statistics."""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def clear(self):
+        """Drop all cached objects and reset statistics."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+style_cache = StyleCache()
+
+
+def json_formatter(color_front=None, styles: Tuple[Tuple[str, str], ...] = ()) -> Terminal256Formatter:
+    """Formatter with compiled JSON style.
+
+    Args:
+        color_front: table_color.
+        styles: pairs of token name and style to override JSON style.
+    """
+    return style_cache.get(
+        ("json", color_front, styles), lambda: Terminal256Formatter(style=JSONStyle(color_front, styles).style_obj)
+    )
+
+
+def simple_formatter(color_front=None) -> Terminal256Formatter:
+    """Formatter with compiled style of one table_color and font.
+
+    Args:
+        color_front: table_color and font.
+    """
+    return style_cache.get(
+        ("simple", color_front), lambda: Terminal256Formatter(style=SimpleStyle(color_front).style_obj)
+    )
+
+
+def json_lexer(ensurenl: bool = True) -> JSONLexer:
+    """Shared JSON lexer, lexer keeps no state between calls.
+
+    Args:
+        ensurenl: add new line to the end of lexed str.
+    """
+    return style_cache.get(("lexer", ensurenl), lambda: JSONLexer(ensurenl=ensurenl))
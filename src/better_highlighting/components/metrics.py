@@ -0,0 +1,274 @@
+"""Opt-in instrumentation of render pipeline.
+
+Every `format()` call of printer is split to stages (summary, short, serialize, lex, format and cells, grid for
+tables). Stages are lazy and interleaved, so time of stage is measured inside `next()` of its iterator without time of
+the previous stage. Reports go to callbacks of `observe` in the current context and to process-wide counters and
+histograms of `enable_metrics`. If both are off, printers get `NULL_RECORDER` which returns iterators as is.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+# upper bounds of buckets of seconds histograms, every bucket counts values below its bound as in Prometheus
+HISTOGRAM_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, float("inf"))
+TOTAL = "total"
+
+
+class StageStats:
+    """Time and size of one stage of render."""
+
+    __slots__ = ("name", "seconds", "items", "chars")
+
+    def __init__(self, name: str):
+        """Init.
+
+        Args:
+            name: name of stage.
+        """
+        self.name = name
+        self.seconds = 0.0
+        self.items = 0
+        self.chars = 0
+
+    def __repr__(self):
+        """Stage with its values."""
+        return f"StageStats({self.name!r}, seconds={self.seconds:.6f}, items={self.items}, chars={self.chars})"
+
+
+class RenderReport:
+    """Stages of one `format()` call of printer.
+
+    Items are parts of data for "serialize", tokens for "lex" and str pieces for "format", chars are chars of the
+    stage result: "serialize" chars are size of input str, "format" chars are size of output with escape codes.
+    """
+
+    __slots__ = ("printer", "stages")
+
+    def __init__(self, printer: str):
+        """Init.
+
+        Args:
+            printer: name of printer class.
+        """
+        self.printer = printer
+        self.stages: Dict[str, StageStats] = {}
+
+    @property
+    def seconds(self) -> float:
+        """Time of all stages."""
+        return sum(stage.seconds for stage in self.stages.values())
+
+    @property
+    def input_chars(self) -> int:
+        """Chars of serialized data."""
+        return self.stages["serialize"].chars if "serialize" in self.stages else 0
+
+    @property
+    def output_chars(self) -> int:
+        """Chars of highlighted str."""
+        return self.stages["format"].chars if "format" in self.stages else 0
+
+    @property
+    def tokens(self) -> int:
+        """Number of tokens."""
+        return self.stages["lex"].items if "lex" in self.stages else 0
+
+    def __repr__(self):
+        """Report with its stages."""
+        return f"RenderReport({self.printer!r}, stages={list(self.stages.values())})"
+
+
+_observers: ContextVar[Tuple[Callable[[RenderReport], Any], ...]] = ContextVar("render_observers", default=())
+
+
+class _Metrics:
+    """Process-wide counters and histograms of renders."""
+
+    def __init__(self):
+        self.enabled = False
+        self.lock = Lock()
+        self.counters: Dict[str, Dict[str, int]] = {}
+        self.histograms: Dict[Tuple[str, str], List[float]] = {}
+
+    def add(self, report: RenderReport):
+        """Add report to counters and histograms of its printer."""
+        with self.lock:
+            for counter, value in (
+                ("renders", 1),
+                ("input_chars", report.input_chars),
+                ("output_chars", report.output_chars),
+                ("tokens", report.tokens),
+            ):
+                counters = self.counters.setdefault(counter, {})
+                counters[report.printer] = counters.get(report.printer, 0) + value
+            for stage, seconds in [(TOTAL, report.seconds), *((s.name, s.seconds) for s in report.stages.values())]:
+                # counts of buckets, sum of values
+                histogram = self.histograms.setdefault((report.printer, stage), [0] * len(HISTOGRAM_BUCKETS) + [0.0])
+                for i, bound in enumerate(HISTOGRAM_BUCKETS):
+                    if seconds <= bound:
+                        histogram[i] += 1
+                histogram[-1] += seconds
+
+
+_METRICS = _Metrics()
+
+
+def _chars(item) -> int:
+    return len(item[1]) if isinstance(item, tuple) else len(item)
+
+
+class Recorder:
+    """Measure stages of one `format()` call."""
+
+    def __init__(self, printer: str, observers: Tuple[Callable[[RenderReport], Any], ...]):
+        """Init.
+
+        Args:
+            printer: name of printer class.
+            observers: callbacks of the report.
+        """
+        self.report = RenderReport(printer)
+        self.observers = observers
+        self._upstreams: Dict[str, str] = {}
+
+    def _stage(self, name: str) -> StageStats:
+        if name not in self.report.stages:
+            self.report.stages[name] = StageStats(name)
+        return self.report.stages[name]
+
+    def call(self, name: str, function: Callable, *args, **kwargs):
+        """Call function as eager stage, chars are length of str result."""
+        stage = self._stage(name)
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        stage.seconds += time.perf_counter() - start
+        if isinstance(result, str):
+            stage.items += 1
+            stage.chars += len(result)
+        return result
+
+    def stage(self, name: str, iterable: Iterable, upstream: Optional[str] = None) -> Iterator:
+        """Measure lazy stage, time of `upstream` stage which is read inside of it is subtracted at the end."""
+        if upstream:
+            self._upstreams[name] = upstream
+        return self._timed(self._stage(name), iter(iterable))
+
+    @staticmethod
+    def _timed(stage: StageStats, iterator: Iterator) -> Iterator:
+        perf_counter = time.perf_counter
+        while True:
+            start = perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                stage.seconds += perf_counter() - start
+                return
+            stage.seconds += perf_counter() - start
+            stage.items += 1
+            stage.chars += _chars(item)
+            yield item
+
+    def finish(self):
+        """Subtract time of upstream stages and send report to observers and metrics."""
+        stages = self.report.stages
+        inclusive = {name: stage.seconds for name, stage in stages.items()}
+        for name, upstream in self._upstreams.items():
+            if upstream in inclusive:
+                stages[name].seconds = max(inclusive[name] - inclusive[upstream], 0.0)
+        if _METRICS.enabled:
+            _METRICS.add(self.report)
+        for observer in self.observers:
+            observer(self.report)
+
+
+class _NullRecorder:
+    """Recorder of disabled instrumentation, stages are not wrapped."""
+
+    @staticmethod
+    def call(_name: str, function: Callable, *args, **kwargs):
+        """Call function without measuring."""
+        return function(*args, **kwargs)
+
+    @staticmethod
+    def stage(_name: str, iterable: Iterable, **_options) -> Iterable:
+        """Iterable as is, options of `Recorder.stage` are ignored."""
+        return iterable
+
+    def finish(self):
+        """Nothing to report."""
+
+
+NULL_RECORDER = _NullRecorder()
+
+
+def recorder(printer: str):
+    """Recorder of `format()` call or `NULL_RECORDER` if there are no observers and metrics are disabled.
+
+    Args:
+        printer: name of printer class.
+    """
+    observers = _observers.get()
+    if not observers and not _METRICS.enabled:
+        return NULL_RECORDER
+    return Recorder(printer, observers)
+
+
+@contextmanager
+def observe(callback: Callable[[RenderReport], Any]) -> Iterator[None]:
+    """Send `RenderReport` of every `format()` call in the context to callback.
+
+    Observers are stored in context variable, so they are separate for threads and asyncio tasks.
+
+    Args:
+        callback: function which gets `RenderReport`.
+    """
+    token = _observers.set(_observers.get() + (callback,))
+    try:
+        yield
+    finally:
+        _observers.reset(token)
+
+
+def enable_metrics(enabled=True):
+    """Enable or disable process-wide counters and histograms of renders.
+
+    Args:
+        enabled: collect metrics of every render.
+    """
+    _METRICS.enabled = enabled
+
+
+def reset_metrics():
+    """Remove collected counters and histograms."""
+    with _METRICS.lock:
+        _METRICS.counters.clear()
+        _METRICS.histograms.clear()
+
+
+def metrics_snapshot() -> Dict[str, Any]:
+    """Copy of counters per printer and histograms of seconds per printer and stage.
+
+    Returns:
+        dict with "counters": {counter: {printer: value}} and "seconds": {printer: {stage: histogram}}, histogram has
+        cumulative "buckets" {upper bound: count}, "count" and "sum".
+    """
+    with _METRICS.lock:
+        seconds: Dict[str, Dict[str, Any]] = {}
+        for (printer, stage), histogram in _METRICS.histograms.items():
+            seconds.setdefault(printer, {})[stage] = {
+                "buckets": dict(zip(HISTOGRAM_BUCKETS, histogram)),
+                "count": histogram[len(HISTOGRAM_BUCKETS) - 1],
+                "sum": histogram[-1],
+            }
+        return {"counters": {name: dict(values) for name, values in _METRICS.counters.items()}, "seconds": seconds}
@@ -0,0 +1,108 @@
+"""Output without escape codes: color mode of output stream and text of rendered data without lexing.
+
+Plain text is the highlighted str of the same data without escape codes. New lines are normalized and leading and
+trailing new lines are removed like the lexer does it, and the text is cut like `limit_tokens` cuts tokens, but the
+text is never lexed and formatted, so its cost is only serialization.
+"""
+import os
+import sys
+from typing import (
+    IO,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+)
+
+from better_highlighting.components.emitter import _nth_index
+from better_highlighting.data_format import NOT_PRINTED_MESSAGE
+
+COLOR_MODES = ("auto", "always", "never")
+
+
+def use_color(color="auto", stream: Optional[IO] = None) -> bool:
+    """Check if output is highlighted in color mode.
+
+    "auto" mode highlights output only for terminal: `NO_COLOR` environment variable which is not empty disables
+    colors, otherwise stream has to be a TTY.
+
+    Args:
+        color: "auto", "always" or "never".
+        stream: output stream of "auto" mode, `sys.stdout` if None.
+    """
+    if color not in COLOR_MODES:
+        raise ValueError(f"unknown color mode: {color}, expected one of: {', '.join(COLOR_MODES)}")
+    if color != "auto":
+        return color == "always"
+    if os.environ.get("NO_COLOR"):
+        return False
+    stream = sys.stdout if stream is None else stream
+    isatty = getattr(stream, "isatty", None)
+    try:
+        return bool(isatty and isatty())
+    except ValueError:
+        # closed stream
+        return False
+
+
+def iter_plain_text(
+    pieces: Iterable[str], max_chars: Optional[int] = None, max_lines: Optional[int] = None, ensurenl=False
+) -> Iterator[str]:
+    """Yield text of formatted data as the lexer sees it, cut to `max_chars` chars and `max_lines` lines.
+
+    Pieces after the cut are not read, so the rest of data is not serialized.
+
+    Args:
+        pieces: formatted data, e.g. texts of parts from `iter_pretty_parts`.
+        max_chars: max number of chars of result str, the rest is replaced by "several items were not printed".
+        max_lines: max number of lines of result str, the rest is replaced by "several items were not printed".
+        ensurenl: add new line to the end like `ensurenl` option of lexer.
+    """
+    marker = f" {NOT_PRINTED_MESSAGE}"
+    marker_start = None if max_chars is None else max(max_chars - len(marker), 0)
+    # text after `marker_start` is kept until the end of str is known, new lines are kept until the next text
+    pending: List[str] = []
+    new_lines = ""
+    pending_start = position = lines = 0
+    at_start = True
+    for piece in pieces:
+        piece = piece.replace("\r\n", "\n").replace("\r", "\n") if "\r" in piece else piece
+        if at_start:
+            piece = piece[1:] if piece.startswith("\ufeff") else piece
+            piece = piece.lstrip("\n")
+            if not piece:
+                continue
+            at_start = False
+        body = piece.rstrip("\n")
+        if not body:
+            new_lines += piece
+            continue
+        text = new_lines + body
+        new_lines = piece[len(body) :]
+
+        cut = None
+        if max_lines is not None and "\n" in text:
+            count = text.count("\n")
+            if lines + count >= max_lines:
+                cut = position + _nth_index(text, "\n", max_lines - lines)
+            lines += count
+        if max_chars is not None and marker_start is not None and (cut is not None or position + len(text) > max_chars):
+            cut = marker_start if cut is None else min(cut, marker_start)
+
+        if cut is not None:
+            if not pending:
+                pending_start = position
+            pending.append(text)
+            yield "".join(pending)[: cut - pending_start] + marker
+            return
+
+        if pending or (marker_start is not None and position + len(text) > marker_start):
+            if not pending:
+                pending_start = position
+            pending.append(text)
+        else:
+            yield text
+        position += len(text)
+    yield from pending
+    if ensurenl:
+        yield "\n"
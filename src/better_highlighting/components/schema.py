@@ -0,0 +1,145 @@
+"""Schema summary of record lists: shared keys, types, null counts, ranges and distinct counts of values.
+
+Records are read once to count their shapes (tuples of keys), then values of every key are taken as one column and
+are checked by builtins (`Counter`, `min`, `max`, `set`) without Python loops over values. Columns of pandas DataFrame
+are checked by pandas. Size of summary depends on number of keys, not on number of records.
+"""
+import sys
+from collections import Counter
+from operator import itemgetter
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+)
+
+from better_highlighting.components.adapters import (
+    _column_names,
+    _scalar,
+    object_fields,
+)
+from better_highlighting.data_format import NOT_PRINTED_MESSAGE
+
+
+def records_summary(value, max_keys: int) -> Any:
+    """Summary of list or tuple of records or of pandas DataFrame, other values are returned as is.
+
+    Records are dicts, dataclass instances or slotted objects, other items are counted by type.
+
+    Args:
+        value: records to summarize.
+        max_keys: number of kept keys, the rest of keys is counted.
+    """
+    pandas = sys.modules.get("pandas")
+    if pandas is not None and isinstance(value, pandas.DataFrame):
+        return _frame_summary(value, max_keys)
+    if not isinstance(value, (list, tuple)):
+        return value
+
+    rows: List[dict] = []
+    other: Counter = Counter()
+    for item in value:
+        if isinstance(item, dict):
+            rows.append(item)
+            continue
+        fields = object_fields(item)
+        if fields is None:
+            other[type(item).__name__] += 1
+        else:
+            rows.append(fields)
+
+    shapes = Counter(map(tuple, rows))
+    presence: Counter = Counter()
+    for shape, count in shapes.items():
+        for key in shape:
+            presence[key] += count
+
+    keys: Dict[Any, Any] = {}
+    for key, count in presence.items():
+        if len(keys) == max_keys:
+            keys[NOT_PRINTED_MESSAGE] = len(presence) - max_keys
+            break
+        if count == len(rows):
+            values = list(map(itemgetter(key), rows))
+        else:
+            values = [row[key] for row in rows if key in row]
+        keys[key] = _column_summary(values, len(rows) - count)
+
+    summary: Dict[str, Any] = {"type": type(value).__name__, "length": len(value), "shapes": len(shapes), "keys": keys}
+    if other:
+        summary["other items"] = dict(other.most_common())
+    return summary
+
+
+def schema_rows(summary) -> Any:
+    """Rows of table with one row for every key of `records_summary` result, other values are returned as is.
+
+    Args:
+        summary: result of `records_summary`.
+    """
+    if not (isinstance(summary, dict) and isinstance(summary.get("keys"), dict)):
+        return summary
+    rows = []
+    for key, stats in summary["keys"].items():
+        if key == NOT_PRINTED_MESSAGE:
+            rows.append({"key": f"{NOT_PRINTED_MESSAGE} {stats}"})
+        else:
+            rows.append({"key": key, **stats})
+    return rows
+
+
+def _is_ordered(types) -> bool:
+    """Values of types can be compared by `min` and `max`: numbers without bool or str only."""
+    numbers = all(issubclass(cls, (int, float)) and not issubclass(cls, bool) for cls in types)
+    return numbers or all(issubclass(cls, str) for cls in types)
+
+
+def _column_summary(values: list, missing: int) -> Dict[str, Any]:
+    types = Counter(map(type, values))
+    nulls = types.pop(type(None), 0)
+    present = [item for item in values if item is not None] if nulls else values
+    summary: Dict[str, Any] = {
+        "types": {cls.__name__: count for cls, count in types.most_common()},
+        "nulls": nulls,
+        "missing": missing,
+    }
+    if any(issubclass(cls, float) for cls in types):
+        # NaN is not ordered, it is counted as null
+        numbers = [item for item in present if item == item]  # pylint: disable=comparison-with-itself
+        summary["nulls"] += len(present) - len(numbers)
+        present = numbers
+    if present and _is_ordered(types):
+        summary["min"] = min(present)
+        summary["max"] = max(present)
+    distinct = _distinct(present)
+    if distinct is not None:
+        summary["distinct"] = distinct
+    return summary
+
+
+def _distinct(values: list) -> Optional[int]:
+    """Number of distinct values, None if some values are not hashable."""
+    try:
+        return len(set(values))
+    except TypeError:
+        return None
+
+
+def _frame_summary(frame, max_keys: int) -> Dict[str, Any]:
+    keys: Dict[Any, Any] = {}
+    columns = [frame.iloc[:, position] for position in range(min(max_keys, frame.shape[1]))]
+    for name, column in zip(_column_names(columns), columns):
+        nulls = int(column.isna().sum())
+        summary: Dict[str, Any] = {"types": {str(column.dtype): len(column) - nulls}, "nulls": nulls, "missing": 0}
+        if column.dtype.kind in "iuf" and nulls < len(column):
+            summary["min"] = _scalar(column.min())
+            summary["max"] = _scalar(column.max())
+        try:
+            summary["distinct"] = int(column.nunique())
+        except TypeError:
+            pass
+        keys[name] = summary
+    if frame.shape[1] > max_keys:
+        keys[NOT_PRINTED_MESSAGE] = frame.shape[1] - max_keys
+    return {"type": "DataFrame", "length": len(frame), "shapes": 1, "keys": keys}
@@ -0,0 +1,274 @@
+"""Columnar table engine, draws tables with `fancy_grid` box chars without pandas and tabulate.
+
+Cells are typed and aligned with the same rules as `tabulate(..., tablefmt="fancy_grid", colalign=("left",))`:
+columns of numbers are aligned by decimal point, other columns and the first one are aligned to the left. Tables are
+yielded as structure and value parts for the direct tokens emitter: box chars and padding are structure, every line of
+cell is one value. Widths of cells are counted in terminal cells, so borders stay aligned for CJK and emoji.
+"""
+import math
+import re
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from better_highlighting.components.text_wrap import (
+    display_width,
+    pad_text,
+)
+
+ROWS_PER_TABLE = 4
+# rows of one page of streamed table and rows read ahead to find widths of columns shared by pages
+ROWS_PER_PAGE = 100
+WIDTH_SAMPLE_ROWS = 1000
+
+LINE_ABOVE = ("╒", "═", "╤", "╕")
+LINE_BETWEEN_ROWS = ("├", "─", "┼", "┤")
+LINE_BELOW = ("╘", "═", "╧", "╛")
+DATA_ROW = ("│", "│", "│")
+PADDING = 1
+
+_NONE, _BOOL, _INT, _FLOAT, _TEXT = range(5)
+
+_NEW_LINE = re.compile(r"[\r\n]")
+_THOUSANDS_NUMBER = re.compile(r"^(([+-]?[0-9]{1,3})(?:,([0-9]{3}))*)?(?(1)\.[0-9]*|\.[0-9]+)?$")
+
+
+def table_columns(rows: Iterable[Any]) -> Tuple[List[Hashable], List[Dict[Hashable, Any]]]:
+    """Get columns of rows and every row as dict.
+
+    Dict rows are used as is, list and tuple rows are columns by position, other values are one column `0`.
+
+    Args:
+        rows: table rows.
+
+    Returns:
+        columns in order of the first appearance and rows as dict.
+    """
+    columns: Dict[Hashable, None] = {}
+    dict_rows = []
+    for row in rows:
+        row = row_as_dict(row)
+        columns.update(dict.fromkeys(row))
+        dict_rows.append(row)
+    return list(columns), dict_rows
+
+
+def row_as_dict(row: Any) -> Dict[Hashable, Any]:
+    """Dict row as is, list and tuple row with positions as columns, other value as one column `0`."""
+    if isinstance(row, dict):
+        return row
+    return dict(enumerate(row)) if isinstance(row, (list, tuple)) else {0: row}
+
+
+def iter_cell_tables(
+    cells: List[List[Optional[str]]], headers: List[str], transpose=False, show_headers=False
+) -> Iterator[List[List[Any]]]:
+    """Yield cells of tables for every `ROWS_PER_TABLE` rows.
+
+    Args:
+        cells: cells of all rows, every row has cell for every column, None is missing cell.
+        headers: names of columns.
+        transpose: rows of table are columns of data.
+        show_headers: add the first column with names of columns for transposed table or with numbers of rows.
+    """
+    for start in range(0, len(cells), ROWS_PER_TABLE):
+        yield cell_table(cells[start : start + ROWS_PER_TABLE], headers, transpose, show_headers, start)
+
+
+def cell_table(
+    cells: List[List[Any]], headers: List[str], transpose=False, show_headers=False, start=0
+) -> List[List[Any]]:
+    """Cells of one table of rows.
+
+    Args:
+        cells: cells of rows of the table, every row has cell for every column.
+        headers: names of columns.
+        transpose: rows of table are columns of data.
+        show_headers: add the first column with names of columns for transposed table or with numbers of rows.
+        start: number of the first row.
+    """
+    table = cells
+    if transpose:
+        table = [list(column) for column in zip(*table)]
+        if show_headers:
+            table = [[header, *row] for header, row in zip(headers, table)]
+    elif show_headers:
+        table = [[number, *row] for number, row in enumerate(table, start=start)]
+    return table
+
+
+def _is_int(cell) -> bool:
+    if type(cell) is int:  # pylint: disable=unidiomatic-typecheck
+        return True
+    if not isinstance(cell, str):
+        return False
+    try:
+        int(cell)
+    except ValueError:
+        return False
+    return True
+
+
+def _is_number(cell) -> bool:
+    try:
+        number = float(cell)
+    except (ValueError, TypeError):
+        return False
+    if isinstance(cell, str) and (math.isinf(number) or math.isnan(number)):
+        return cell.lower() in ("inf", "-inf", "nan")
+    return True
+
+
+def _cell_type(cell) -> int:
+    if cell is None:
+        return _NONE
+    if cell in ("True", "False"):
+        return _BOOL
+    if _is_int(cell):
+        return _INT
+    if _is_number(cell):
+        return _FLOAT
+    return _TEXT
+
+
+def _after_point(cell: str) -> int:
+    """Number of chars after decimal point, -1 for int or not a number."""
+    if not (_is_number(cell) or _THOUSANDS_NUMBER.match(cell)) or _is_int(cell):
+        return -1
+    position = cell.rfind(".")
+    position = cell.lower().rfind("e") if position < 0 else position
+    return len(cell) - position - 1 if position >= 0 else -1
+
+
+def _str(cell) -> str:
+    return "" if cell is None else str(cell)
+
+
+def _width(cell: str, multiline: bool) -> int:
+    """Number of terminal cells of the widest line of cell."""
+    return max(map(display_width, _NEW_LINE.split(cell))) if multiline else display_width(cell)
+
+
+def _align_column(column: Sequence[Any], first: bool, multiline: bool, min_width=0) -> Tuple[List[str], int]:
+    """Format cells of column as str and pad them to the same width.
+
+    Args:
+        column: cells of column, None is missing cell which is empty and does not change type of column.
+        first: column is aligned to the left even if it has numbers only.
+        multiline: some cells of table have several lines.
+        min_width: cells are padded at least to this width.
+
+    Returns:
+        padded cells and width of column.
+    """
+    column_type = max(map(_cell_type, column), default=_BOOL)
+    if column_type == _FLOAT:
+        # tabulate fails on "True" in column of floats, it is kept as is here
+        cells = [format(float(cell), "g") if _is_number(cell) else _str(cell) for cell in column]
+    else:
+        cells = list(map(_str, column))
+
+    if not first and column_type in (_INT, _FLOAT):
+        points = list(map(_after_point, cells))
+        max_points = max(points)
+        cells = [cell + " " * (max_points - point) for cell, point in zip(cells, points)]
+        right = True
+    else:
+        cells = [cell.strip() for cell in cells]
+        right = False
+
+    width = max(min_width, *(_width(cell, multiline) for cell in cells))
+    if multiline:
+        cells = ["\n".join(pad_text(line, width, right) for line in cell.splitlines()) for cell in cells]
+    else:
+        cells = [pad_text(cell, width, right) for cell in cells]
+    return cells, max(_width(cell, multiline) for cell in cells)
+
+
+def _line(widths: Sequence[int], chars: Tuple[str, str, str, str]) -> str:
+    begin, fill, separator, end = chars
+    return begin + separator.join(fill * (width + 2 * PADDING) for width in widths) + end
+
+
+def _cell_parts(line: str) -> Iterator[Tuple[bool, str]]:
+    """Spaces around cell text are structure parts, text is value part."""
+    text = line.strip()
+    if not text:
+        yield False, line
+        return
+    start = len(line) - len(line.lstrip())
+    yield False, line[:start]
+    yield True, text
+    yield False, line[start + len(text) :]
+
+
+def _row_parts(cells: Sequence[str], widths: Sequence[int], multiline: bool) -> Iterator[Tuple[bool, str]]:
+    begin, separator, end = DATA_ROW
+    padding = " " * PADDING
+    cells_lines = [cell.splitlines() if multiline else [cell] for cell in cells]
+    lines_count = max(map(len, cells_lines), default=1)
+    for number in range(lines_count):
+        yield False, "\n" + begin
+        for i, (lines, width) in enumerate(zip(cells_lines, widths)):
+            yield False, (separator + padding) if i else padding
+            yield from _cell_parts(lines[number] if number < len(lines) else " " * width)
+            yield False, padding
+        yield False, end
+
+
+def _multiline(table: List[List[Any]]) -> bool:
+    return any(isinstance(cell, str) and _NEW_LINE.search(cell) for row in table for cell in row)
+
+
+def column_widths(table: List[List[Any]]) -> List[int]:
+    """Widths of aligned columns of table without padding.
+
+    Args:
+        table: rows of the same length, cells are str, int or None.
+    """
+    multiline = _multiline(table)
+    return [_align_column(column, first=not i, multiline=multiline)[1] for i, column in enumerate(zip(*table))]
+
+
+def iter_grid_parts(table: List[List[Any]], min_widths: Sequence[int] = ()) -> Iterator[Tuple[bool, str]]:
+    """Yield structure and value parts of table with `fancy_grid` box chars.
+
+    Args:
+        table: rows of the same length, cells are str, int or None, table without columns is empty.
+        min_widths: min widths of columns, e.g. `column_widths` of a sample of rows to align tables of one stream.
+    """
+    if not table or not table[0]:
+        return
+
+    multiline = _multiline(table)
+    columns = []
+    widths = []
+    for i, column in enumerate(zip(*table)):
+        min_width = min_widths[i] if i < len(min_widths) else 0
+        cells, width = _align_column(column, first=not i, multiline=multiline, min_width=min_width)
+        columns.append(cells)
+        widths.append(width)
+
+    yield False, _line(widths, LINE_ABOVE)
+    for i, row in enumerate(zip(*columns)):
+        if i:
+            yield False, "\n" + _line(widths, LINE_BETWEEN_ROWS)
+        yield from _row_parts(row, widths, multiline)
+    yield False, "\n" + _line(widths, LINE_BELOW)
+
+
+def fancy_grid(table: List[List[Any]]) -> str:
+    """Draw table with `fancy_grid` box chars.
+
+    Args:
+        table: rows of the same length, cells are str, int or None.
+    """
+    return "".join(text for _, text in iter_grid_parts(table))
@@ -0,0 +1,142 @@
+"""Line breaking and padding of text by width of terminal cells.
+
+Lines are broken with the same rules as `textwrap.wrap` with default options, but length of text is counted in terminal
+cells: East Asian wide and fullwidth chars (CJK, most emoji) take two cells, combining marks and format chars take none.
+Text of printable chars which fits into width is not split, other text without hyphens is split on spaces without the
+regex of `textwrap`. Wrapped lines of short text are cached by text and width.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+from textwrap import TextWrapper
+from typing import (
+    List,
+    Tuple,
+)
+
+WRAP_CACHE_SIZE = 4096
+# longer text is wrapped every time, it is rarely repeated and would keep large keys in the cache
+MAX_CACHED_WRAP_LENGTH = 1024
+
+_SPACES = re.compile(r"( +)")
+
+
+@lru_cache(maxsize=WRAP_CACHE_SIZE)
+def _char_width(char: str) -> int:
+    if unicodedata.combining(char) or unicodedata.category(char) in ("Mn", "Me", "Cf"):
+        return 0
+    return 2 if unicodedata.east_asian_width(char) in ("W", "F") else 1
+
+
+def display_width(text: str) -> int:
+    """Number of terminal cells of text.
+
+    Args:
+        text: one line of text.
+    """
+    if text.isascii():
+        return len(text)
+    return sum(map(_char_width, text))
+
+
+def pad_text(text: str, width: int, right=False) -> str:
+    """Pad text with spaces to `width` cells, like `str.ljust` or `str.rjust` of chars.
+
+    Args:
+        text: one line of text.
+        width: number of cells of result.
+        right: align text to the right.
+    """
+    fill = " " * (width - display_width(text))
+    return fill + text if right else text + fill
+
+
+def _cells_prefix(text: str, width: int) -> int:
+    """Number of the first chars of text which fit into `width` cells."""
+    if text.isascii():
+        return width
+    used = 0
+    for index, char in enumerate(text):
+        used += _char_width(char)
+        if used > width:
+            return index
+    return len(text)
+
+
+class _CellWrapper(TextWrapper):
+    """`TextWrapper` which counts terminal cells instead of chars, `max_lines` and indents are not supported."""
+
+    def _handle_long_word(self, reversed_chunks, cur_line, cur_len, width):
+        space_left = 1 if width < 1 else width - cur_len
+        chunk = reversed_chunks[-1]
+        end = _cells_prefix(chunk, space_left)
+        if not cur_line:
+            # wide char does not fit into one cell, it takes its own line
+            end = max(end, 1)
+        if end < len(chunk):
+            hyphen = chunk.rfind("-", 0, end)
+            if hyphen > 0 and any(char != "-" for char in chunk[:hyphen]):
+                end = hyphen + 1
+        cur_line.append(chunk[:end])
+        reversed_chunks[-1] = chunk[end:]
+
+    def _wrap_chunks(self, chunks):
+        lines: List[str] = []
+        width = self.width
+        if width <= 0:
+            raise ValueError(f"invalid width {width!r} (must be > 0)")
+        chunks.reverse()
+        while chunks:
+            cur_line: List[str] = []
+            cur_len = 0
+            # whitespace at the beginning of a line is dropped except for the first line
+            if chunks[-1].strip() == "" and lines:
+                del chunks[-1]
+            while chunks:
+                length = display_width(chunks[-1])
+                if cur_len + length > width:
+                    break
+                cur_line.append(chunks.pop())
+                cur_len += length
+            if chunks and display_width(chunks[-1]) > width:
+                self._handle_long_word(chunks, cur_line, cur_len, width)
+            if cur_line and cur_line[-1].strip() == "":
+                del cur_line[-1]
+            if cur_line:
+                lines.append("".join(cur_line))
+        return lines
+
+
+@lru_cache(maxsize=256)
+def _wrapper(width: int) -> _CellWrapper:
+    return _CellWrapper(width=width)
+
+
+def _wrap(text: str, width: int) -> Tuple[str, ...]:
+    # pylint: disable=protected-access
+    wrapper = _wrapper(width)
+    if "-" in text:
+        chunks = wrapper._split_chunks(text)
+    else:
+        # without hyphens words of `textwrap` are runs of not space chars
+        chunks = [chunk for chunk in _SPACES.split(wrapper._munge_whitespace(text)) if chunk]
+    return tuple(wrapper._wrap_chunks(chunks))
+
+
+_cached_wrap = lru_cache(maxsize=WRAP_CACHE_SIZE)(_wrap)
+
+
+def wrap_text(text: str, width: int = 70) -> Tuple[str, ...]:
+    """Wrap text to lines of at most `width` cells, result is the same as `textwrap.wrap` for text of narrow chars.
+
+    Args:
+        text: text to wrap, tabs are expanded and other whitespaces are replaced by spaces.
+        width: max number of cells of line, a wide char is kept whole even if width is 1.
+    """
+    # printable text has no whitespaces but spaces, if it fits it is the only line without trailing spaces
+    if text.isprintable() and (len(text) if text.isascii() else display_width(text)) <= width:
+        line = text.rstrip(" ")
+        return (line,) if line else ()
+    if len(text) <= MAX_CACHED_WRAP_LENGTH:
+        return _cached_wrap(text, width)
+    return _wrap(text, width)
@@ -0,0 +1,204 @@
+"""Tokens of rendered data which are made once and are emitted by several output backends.
+
+Stream keeps one text buffer and parallel arrays of offsets, lengths and ids of token types, names of token types and
+style are plain tuples, so stream is pickled in worker process and emitted in another one. Backends do not serialize
+and lex data again: "ansi256" result is the same as highlighted str of printer, "ansi16" and "truecolor" use the same
+style with other escape codes, "plain" is the text buffer itself and "html" has inline styles.
+"""
+from array import array
+from functools import reduce
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from pygments import format as pygments_format
+from pygments.formatter import Formatter
+from pygments.formatters.html import HtmlFormatter
+from pygments.formatters.terminal256 import (
+    Terminal256Formatter,
+    TerminalTrueColorFormatter,
+)
+from pygments.style import Style
+from pygments.token import (
+    Token,
+    _TokenType,
+)
+
+from better_highlighting.components.emitter import (
+    TokenPair,
+    format_tokens,
+)
+from better_highlighting.components.lexers_and_styles.style_builders import (
+    JSONStyle,
+    SimpleStyle,
+)
+from better_highlighting.components.lexers_and_styles.style_cache import (
+    json_formatter,
+    simple_formatter,
+    style_cache,
+)
+
+# names of ANSI colors in order of the first 16 colors of xterm palette of `Terminal256Formatter`
+_ANSI_COLORS = (
+    "ansiblack",
+    "ansired",
+    "ansigreen",
+    "ansiyellow",
+    "ansiblue",
+    "ansimagenta",
+    "ansicyan",
+    "ansigray",
+    "ansibrightblack",
+    "ansibrightred",
+    "ansibrightgreen",
+    "ansibrightyellow",
+    "ansibrightblue",
+    "ansibrightmagenta",
+    "ansibrightcyan",
+    "ansiwhite",
+)
+
+
+class Terminal16Formatter(Terminal256Formatter):
+    """Formatter of style with the closest of 16 ANSI colors, for terminals without 256 colors."""
+
+    name = "Terminal16"
+    aliases = ["terminal16", "console16", "16"]
+
+    def _closest_color(self, r, g, b):
+        distances = [(red - r) ** 2 + (green - g) ** 2 + (blue - b) ** 2 for red, green, blue in self.xterm_colors[:16]]
+        return _ANSI_COLORS[distances.index(min(distances))]
+
+
+class StreamStyle(NamedTuple):
+    """Style of token stream, "json" style of printers with JSON colors or "simple" one of table_color and font."""
+
+    kind: str
+    color_front: Optional[str] = None
+    styles: Tuple[Tuple[str, str], ...] = ()
+
+    def style_obj(self):
+        """Compiled pygments style."""
+        if self.kind == "simple":
+            return SimpleStyle(self.color_front or "").style_obj
+        return JSONStyle(self.color_front, self.styles).style_obj
+
+    def page_style_obj(self):
+        """Compiled pygments style with page colors of `Style`, colors of tokens are chosen for dark terminal."""
+        return type(Style)("PageStyle", (Style,), {"styles": self.style_obj().styles, "background_color": "#000000"})
+
+
+class TokenStream(NamedTuple):
+    """Tokens of highlighted str as one text buffer and parallel arrays.
+
+    Args:
+        text: joined text of all tokens.
+        offsets: start of every token in text.
+        lengths: length of every token.
+        type_ids: index of token type of every token in `type_names`.
+        type_names: names of token types, e.g. `("Literal", "String")` for `Token.Literal.String`.
+        style: style to emit tokens.
+    """
+
+    text: str
+    offsets: array
+    lengths: array
+    type_ids: array
+    type_names: Tuple[Tuple[str, ...], ...]
+    style: StreamStyle
+
+    @classmethod
+    def from_tokens(cls, tokens: Iterable[TokenPair], style: StreamStyle) -> "TokenStream":
+        """Stream of tokens, empty tokens are skipped.
+
+        Args:
+            tokens: pairs of token type and text.
+            style: style to emit tokens.
+        """
+        pieces = []
+        offsets, lengths, type_ids = array("I"), array("I"), array("H")
+        ids: Dict[_TokenType, int] = {}
+        position = 0
+        for ttype, value in tokens:
+            if not value:
+                continue
+            type_id = ids.get(ttype)
+            if type_id is None:
+                type_id = ids[ttype] = len(ids)
+            pieces.append(value)
+            offsets.append(position)
+            lengths.append(len(value))
+            type_ids.append(type_id)
+            position += len(value)
+        return cls("".join(pieces), offsets, lengths, type_ids, tuple(tuple(ttype) for ttype in ids), style)
+
+    def tokens(self) -> Iterator[TokenPair]:
+        """Pairs of token type and text."""
+        types = [reduce(getattr, names, Token) for names in self.type_names]
+        text = self.text
+        for offset, length, type_id in zip(self.offsets, self.lengths, self.type_ids):
+            yield types[type_id], text[offset : offset + length]
+
+
+def _terminal_formatter(style: StreamStyle) -> Formatter:
+    """Formatter of highlighted str of printers."""
+    if style.kind == "simple":
+        return simple_formatter(style.color_front)
+    return json_formatter(style.color_front, style.styles)
+
+
+def _cached_formatter(formatter_class, style: StreamStyle, page=False, **options) -> Formatter:
+    """Formatter of backend with compiled style, `page` style has page colors of `Style`."""
+    return style_cache.get(
+        (formatter_class.__name__, *style),
+        lambda: formatter_class(style=style.page_style_obj() if page else style.style_obj(), **options),
+    )
+
+
+def _emit_ansi16(stream: TokenStream) -> str:
+    return format_tokens(stream.tokens(), _cached_formatter(Terminal16Formatter, stream.style))
+
+
+def _emit_ansi256(stream: TokenStream) -> str:
+    return format_tokens(stream.tokens(), _terminal_formatter(stream.style))
+
+
+def _emit_truecolor(stream: TokenStream) -> str:
+    return format_tokens(stream.tokens(), _cached_formatter(TerminalTrueColorFormatter, stream.style))
+
+
+def _emit_plain(stream: TokenStream) -> str:
+    return stream.text
+
+
+def _emit_html(stream: TokenStream) -> str:
+    return pygments_format(stream.tokens(), _cached_formatter(HtmlFormatter, stream.style, True, noclasses=True))
+
+
+_BACKENDS = {
+    "ansi16": _emit_ansi16,
+    "ansi256": _emit_ansi256,
+    "truecolor": _emit_truecolor,
+    "plain": _emit_plain,
+    "html": _emit_html,
+}
+
+
+def emit(stream: TokenStream, backend="ansi256") -> str:
+    """Highlighted str of token stream.
+
+    Args:
+        stream: tokens from `render_tokens`.
+        backend: "ansi16", "ansi256", "truecolor", "plain" or "html".
+    """
+    if backend not in _BACKENDS:
+        raise ValueError(f"unknown backend: {backend}, expected one of: {', '.join(_BACKENDS)}")
+    try:
+        return _BACKENDS[backend](stream)
+    except (AttributeError, AssertionError) as e:
+        raise e from e
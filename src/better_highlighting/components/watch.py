@@ -0,0 +1,232 @@
+"""Incremental render of data which is highlighted again on every change, e.g. live status dict."""
+from functools import partial
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from pygments.token import Punctuation
+
+from better_highlighting.components.emitter import (
+    format_tokens,
+    iter_tokens,
+)
+from better_highlighting.components.highlighters import _data_tokens
+from better_highlighting.components.lexers_and_styles.style_cache import (
+    json_formatter,
+    json_lexer,
+)
+from better_highlighting.data_format import (
+    RenderConfig,
+    default_config,
+    iter_pretty_parts,
+)
+
+Lines = Tuple[str, ...]
+# kind of block or separator after it and reprs of keys from the top level
+BlockKey = Tuple[Any, ...]
+
+
+class LineChange(NamedTuple):
+    """Lines of the previous frame from `start` to `end` (not included) are replaced by `lines`."""
+
+    start: int
+    end: int
+    lines: Lines
+
+
+def apply_changes(lines: List[str], changes: Iterable[LineChange]) -> List[str]:
+    """Lines of the new frame from lines of the previous frame and changes of `WatchRenderer.update`.
+
+    Args:
+        lines: highlighted lines of the previous frame.
+        changes: changes of the previous frame, their line numbers are numbers of the previous frame.
+    """
+    result = list(lines)
+    for change in sorted(changes, reverse=True):
+        result[change.start : change.end] = change.lines
+    return result
+
+
+class _Block(NamedTuple):
+    """Highlighted lines of one key and fingerprint of its value when it was rendered."""
+
+    fingerprint: Any
+    lines: Lines
+
+
+# values which are compared by type and value, repr of other values is kept because they can be changed in place
+_LEAF_TYPES = (str, int, float, complex, bytes, type(None))
+
+
+def _fingerprint(value) -> Tuple[type, Any]:
+    """Type and value of leaf or type and repr of container, `1` and `True` are equal but rendered differently."""
+    return type(value), value if isinstance(value, _LEAF_TYPES) else repr(value)
+
+
+class WatchRenderer:
+    """Render of data which changes between frames, only changed keys of dict are highlighted again.
+
+    Highlighted lines of every top-level key, and of keys of nested dicts up to `depth`, are kept with fingerprint of
+    the value, leaves are compared by type and value and containers by repr. Keys which value is the same are taken
+    from the previous frame without serialization, lexing and formatting, changed lines are found by keys of blocks.
+    Frames are the same as `highlight_json_style(data, wrap=True)`, data which is not a dict is rendered
+    as a whole. Renderer keeps state of the last frame, it is not shared by threads.
+    """
+
+    def __init__(self, depth=1, config: Optional[RenderConfig] = None):
+        """Init.
+
+        Args:
+            depth: levels of nested dicts which keys are rendered separately, 1 for top-level keys only.
+            config: limits and styles of render, current module limits if None.
+        """
+        self.depth = depth
+        self.config = default_config() if config is None else config
+        self._blocks: Dict[BlockKey, _Block] = {}
+        self._frame: List[Tuple[BlockKey, Lines]] = []
+        self._codes: dict = {}
+
+    @property
+    def lines(self) -> List[str]:
+        """Highlighted lines of the last frame."""
+        return [line for _, block in self._frame for line in block]
+
+    @property
+    def frame(self) -> str:
+        """Highlighted str of the last frame."""
+        return "\n".join(self.lines)
+
+    def render(self, data) -> str:
+        """Render the next frame and get the whole highlighted str.
+
+        Args:
+            data: data of the frame.
+        """
+        self.update(data)
+        return self.frame
+
+    def update(self, data) -> List[LineChange]:
+        """Render the next frame and get changed line ranges of the previous frame.
+
+        Args:
+            data: data of the frame.
+
+        Returns:
+            changes in order of lines, see `apply_changes`.
+        """
+        formatter = json_formatter(styles=self.config.styles)
+        blocks: Dict[BlockKey, _Block] = {}
+        if isinstance(data, dict):
+            comma = format_tokens(((Punctuation, ","),), formatter, self._codes)
+            frame = self._dict_blocks(data, (), 1, self.depth, blocks, formatter, comma)
+        else:
+            text = format_tokens(_data_tokens(data, True, True, config=self.config), formatter, self._codes)
+            frame = [(("data",), tuple(text.split("\n")))] if text else []
+        _strip_last_lines(frame)
+
+        changes = _changes(self._frame, frame)
+        self._blocks = blocks
+        self._frame = frame
+        return changes
+
+    def _dict_blocks(
+        self, data: dict, path, indent, depth, blocks, formatter, comma: str
+    ) -> List[Tuple[BlockKey, Lines]]:
+        """Keys and line blocks of keys of dict with `indent` of items, nested dicts are split up to `depth`."""
+        result: List[Tuple[BlockKey, Lines]] = []
+        last = len(data) - 1
+        for i, (key, value) in enumerate(data.items()):
+            item_path = (*path, repr(key))
+            separator = comma if i < last else ""
+            if depth > 1 and isinstance(value, dict) and value:
+                key_parts = [(False, "\n" + " " * indent), (True, repr(key)), (False, ": ")]
+                block_key = ("key", *item_path)
+                block = self._block(block_key, None, partial(iter, key_parts), blocks, formatter)
+                result.append((block_key, block.lines))
+                result.extend(self._dict_blocks(value, item_path, indent + 2, depth - 1, blocks, formatter, comma))
+                # new line of closing of nested dict
+                result.append((("closing", separator, *item_path), (separator,)))
+                continue
+
+            block_key = (separator, *item_path)
+            block = self._block(
+                block_key,
+                _fingerprint(value),
+                partial(_item_parts, key, value, indent, bool(separator), self.config),
+                blocks,
+                formatter,
+            )
+            result.append((block_key, block.lines))
+        return result
+
+    def _block(self, block_key: BlockKey, fingerprint, make_parts, blocks, formatter) -> _Block:
+        """Block of the previous frame if fingerprint is the same or highlighted lines of parts.
+
+        Args:
+            block_key: kind of block or separator after it and reprs of keys from the top level.
+            fingerprint: fingerprint of value of the block, see `_fingerprint`.
+            make_parts: callable which returns parts of the block from `iter_pretty_parts`.
+            blocks: blocks of the new frame.
+            formatter: formatter with compiled style.
+        """
+        block = self._blocks.get(block_key)
+        if block is None or not (block.fingerprint is fingerprint or block.fingerprint == fingerprint):
+            parts = list(make_parts())
+            text = format_tokens(iter_tokens(parts, json_lexer(ensurenl=False)), formatter, self._codes)
+            plain = "".join(text for _, text in parts)
+            # lexer strips new lines at the end, lines of closings of nested dicts are restored, closing of the dict
+            # around the item is not a part of it
+            closing_lines = max(len(plain) - len(plain.rstrip("\n")) - 1, 0)
+            block = _Block(fingerprint, (*text.split("\n"), *("",) * closing_lines))
+        blocks[block_key] = block
+        return block
+
+
+def _item_parts(key, value, indent: int, comma: bool, config: RenderConfig) -> list:
+    """Parts of one item of dict, comma is lexed with the item because the last value may need it, e.g. `it's`."""
+    parts = list(iter_pretty_parts({key: value}, wrap=True, indent=indent - 1, config=config))
+    if comma:
+        parts[-1] = (False, ",\n")
+    return parts
+
+
+def _strip_last_lines(frame: List[Tuple[BlockKey, Lines]]):
+    """Remove empty lines at the end of frame, lexer strips new lines at the end of the whole str."""
+    while frame and (not frame[-1][1] or frame[-1][1][-1] == ""):
+        block_key, block = frame[-1]
+        frame[-1] = (block_key, block[:-1])
+        if not frame[-1][1]:
+            frame.pop()
+
+
+def _changes(old: List[Tuple[BlockKey, Lines]], new: List[Tuple[BlockKey, Lines]]) -> List[LineChange]:
+    """Changed line ranges between blocks of two frames.
+
+    Blocks are matched by their keys, which are unique in a frame, in one pass over both frames. Block of the new
+    frame is kept if it has the same lines and goes after the last kept block in the previous frame, blocks between
+    kept ones are changed.
+    """
+    positions = {block_key: i for i, (block_key, _) in enumerate(old)}
+    starts = [0]
+    for _, block in old:
+        starts.append(starts[-1] + len(block))
+    changes = []
+    old_end = new_end = 0
+    for j, (block_key, block) in enumerate(new):
+        i = positions.get(block_key, -1)
+        if i < old_end or not (old[i][1] is block or old[i][1] == block):
+            continue
+        if i > old_end or j > new_end:
+            lines = tuple(line for _, changed in new[new_end:j] for line in changed)
+            changes.append(LineChange(starts[old_end], starts[i], lines))
+        old_end, new_end = i + 1, j + 1
+    if old_end < len(old) or new_end < len(new):
+        lines = tuple(line for _, changed in new[new_end:] for line in changed)
+        changes.append(LineChange(starts[old_end], starts[len(old)], lines))
+    return changes
@@ -1,36 +1,121 @@
 """Module contains functions for data conversion to str and further wrap and cut."""
+
 # pylint: disable=line-too-long, too-many-return-statements
-import configparser
 import os
 import sys
-import textwrap as tw
-from dataclasses import (
-    asdict,
-    is_dataclass,
-)
+from functools import lru_cache
+from itertools import islice
 from typing import (
     Any,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    NamedTuple,
     Optional,
+    Set,
+    Tuple,
+    Union,
+    final,
 )
 
+from better_highlighting.components.text_wrap import wrap_text
+
 MIN_LENGTH_STR = 1024
 MIN_LENGTH_LIST = 25
 MIN_LENGTH_DICT = 50
 MIN_LENGTH_STR_IN_DICT = 50
+# total length of keys and values kept by `make_it_short`, None is no limit
+SHORT_BUDGET: Optional[int] = None
+# encoding to count `SHORT_BUDGET` in bytes instead of chars
+SHORT_BUDGET_ENCODING: Optional[str] = None
+# rendered containers which are met again in the same render are reused if they are not shorter than min length,
+# total length of kept fragments is limited by max length, the last max seen containers are checked for repeats
+MIN_MEMO_FRAGMENT_LENGTH = 32
+MAX_MEMO_LENGTH = 1 << 20
+MAX_SEEN_CONTAINERS = 256
+# formatted str and int leaves are cached by value between renders, longer str are formatted every time
+LEAF_CACHE_SIZE = 4096
+MAX_CACHED_LEAF_LENGTH = 1024
 
 MODULE_PATH_CONF = os.path.abspath(sys.path[0])
 config_file = os.path.join(MODULE_PATH_CONF, "better_highlight.cfg")
-if os.path.isfile(config_file):
-    _config = configparser.ConfigParser()
-    with open(config_file, "r", encoding="utf-8") as fl:
-        _config.read_file(fl)
-        MIN_LENGTH_STR = int(_config.get("data_format", "MIN_LENGTH_STR"))
-        MIN_LENGTH_LIST = int(_config.get("data_format", "MIN_LENGTH_LIST"))
-        MIN_LENGTH_DICT = int(_config.get("data_format", "MIN_LENGTH_DICT"))
-        MIN_LENGTH_STR_IN_DICT = int(_config.get("data_format", "MIN_LENGTH_STR_IN_DICT"))
 
 
-def pretty_as_iterator(value, htchar=" ", lfchar="\n", indent=0, key_length=0) -> str:
+class RenderConfig(NamedTuple):
+    """Immutable limits and styles of one render, renders with different configs can run in parallel threads.
+
+    Args:
+        min_length_str: length of str after which it is cut in short mode.
+        min_length_list: number of kept items of list and tuple in short mode.
+        min_length_dict: number of kept items of dict in short mode.
+        min_length_str_in_dict: width of wrapped str and int values.
+        short_budget: total length of keys and values kept in short mode, None is no limit.
+        short_budget_encoding: encoding to count `short_budget` in bytes instead of chars.
+        styles: pairs of pygments token name and style to override JSON style, e.g. `(("String", "ansiblue"),)`.
+    """
+
+    min_length_str: int = MIN_LENGTH_STR
+    min_length_list: int = MIN_LENGTH_LIST
+    min_length_dict: int = MIN_LENGTH_DICT
+    min_length_str_in_dict: int = MIN_LENGTH_STR_IN_DICT
+    short_budget: Optional[int] = SHORT_BUDGET
+    short_budget_encoding: Optional[str] = SHORT_BUDGET_ENCODING
+    styles: Tuple[Tuple[str, str], ...] = ()
+
+
+def _read_config_file(path: str) -> Optional[RenderConfig]:
+    """Config with limits of `better_highlight.cfg`, None if there is no file.
+
+    Args:
+        path: path of config file.
+    """
+    if not os.path.isfile(path):
+        return None
+    import configparser  # pylint: disable=import-outside-toplevel
+
+    parser = configparser.ConfigParser()
+    with open(path, "r", encoding="utf-8") as fl:
+        parser.read_file(fl)
+    short_budget = parser.get("data_format", "SHORT_BUDGET", fallback="")
+    return RenderConfig(
+        int(parser.get("data_format", "MIN_LENGTH_STR")),
+        int(parser.get("data_format", "MIN_LENGTH_LIST")),
+        int(parser.get("data_format", "MIN_LENGTH_DICT")),
+        int(parser.get("data_format", "MIN_LENGTH_STR_IN_DICT")),
+        int(short_budget) if short_budget else SHORT_BUDGET,
+        parser.get("data_format", "SHORT_BUDGET_ENCODING", fallback=SHORT_BUDGET_ENCODING),
+    )
+
+
+# limits of config file are initial values of module limits, limits changed at runtime are used instead of them
+_FILE_CONFIG = _read_config_file(config_file)
+if _FILE_CONFIG is not None:
+    (
+        MIN_LENGTH_STR,
+        MIN_LENGTH_LIST,
+        MIN_LENGTH_DICT,
+        MIN_LENGTH_STR_IN_DICT,
+        SHORT_BUDGET,
+        SHORT_BUDGET_ENCODING,
+    ) = _FILE_CONFIG[:6]
+
+
+def default_config() -> RenderConfig:
+    """Config with the current values of module limits, read once per render."""
+    return RenderConfig(
+        MIN_LENGTH_STR,
+        MIN_LENGTH_LIST,
+        MIN_LENGTH_DICT,
+        MIN_LENGTH_STR_IN_DICT,
+        SHORT_BUDGET,
+        SHORT_BUDGET_ENCODING,
+    )
+
+
+def pretty_as_iterator(
+    value, htchar=" ", lfchar="\n", indent=0, key_length=0, config: Optional[RenderConfig] = None
+) -> str:
     """Format provided data in str with wraps and indents.
 
     In result, it returns str that looks pretty iterator type.
@@ -41,34 +126,29 @@ def pretty_as_iterator(value, htchar=" ", lfchar="\n", indent=0, key_length=0) -
         lfchar: char that will be use as end indents of font_1 line.
         indent: ,
         key_length: provided length of key value if data is iterator dict.
+        config: limits of render, `default_config()` if None.
     """
+    return "".join(_pretty_buffer(value, True, htchar, lfchar, indent, key_length, config))
+
+
+def _iterator_leaf(value, htchar, lfchar, indent, key_length, line_width) -> str:
+    """Format not iterable value for `pretty_as_iterator`, indent is already increased for this level."""
+    if type(value) in _CACHED_LEAF_TYPES and not (isinstance(value, str) and len(value) > MAX_CACHED_LEAF_LENGTH):
+        return _cached_iterator_leaf(value, htchar, lfchar, indent, key_length, line_width)
+    return _format_iterator_leaf(value, htchar, lfchar, indent, key_length, line_width)
+
+
+def _format_iterator_leaf(value, htchar, lfchar, indent, key_length, line_width) -> str:
     tab_key_length = 4 if key_length != 0 else 0
-    indent += 1
-    nlch = lfchar + htchar * indent
-    if isinstance(value, dict):
-        items = [
-            nlch
-            + repr(key)
-            + ": "
-            + pretty_as_iterator(value[key], htchar, lfchar, indent + 1, key_length=len(str(key)))
-            for key in value
-        ]
-        return f'{",".join(items) + lfchar}'  # "{%s}" % (",".join(items) + lfchar)  # + htchar * indent)
-    if isinstance(value, list):
-        items = [nlch + pretty_as_iterator(item, htchar, lfchar, indent + 1, key_length=0) for item in value]
-        return f"[{','.join(items) + lfchar + htchar * indent}]"
-    if isinstance(value, tuple):
-        items = [nlch + pretty_as_iterator(item, htchar, lfchar, indent + 1, key_length=0) for item in value]
-        return f"({','.join(items) + lfchar + htchar * indent})"
     if isinstance(value, str):
-        width = MIN_LENGTH_STR_IN_DICT - (len(lfchar) + len(htchar) * (indent + (key_length + tab_key_length)))
-        value = tw.wrap(value, width=width + 1)
+        width = line_width - (len(lfchar) + len(htchar) * (indent + (key_length + tab_key_length)))
+        value = wrap_text(value, max(width + 1, 1))
 
         return f" {lfchar + htchar * (indent + key_length)}  ".join(value)
         # return f"{lfchar + htchar * (indent + (key_length + tab_key_length))}+".join(value) #For table format
     if isinstance(value, int):
-        width = MIN_LENGTH_STR_IN_DICT - (len(lfchar) + len(htchar) * (indent + (key_length + tab_key_length)))
-        value = tw.wrap(str(value), width=width + 1)
+        width = line_width - (len(lfchar) + len(htchar) * (indent + (key_length + tab_key_length)))
+        value = wrap_text(str(value), max(width + 1, 1))
         return f" {lfchar + htchar * (indent + key_length)}+".join(value)
     return repr(value)
 
@@ -79,87 +159,512 @@ def pretty_as_text(value) -> str:
     Args:
         value: convert to str.
     """
-    if isinstance(value, dict):
-        items = [f"{repr(key)}: {pretty_as_text(value[key])}" for key in value]
-        return f'{", ".join(items)}'
-    if isinstance(value, list):
-        items = [pretty_as_text(item) for item in value]
-        return f"[{', '.join(items)}]"
-    if isinstance(value, tuple):
-        items = [pretty_as_text(item) for item in value]
-        return f"({', '.join(items)})"
+    return "".join(_pretty_buffer(value))
+
+
+def _text_leaf(value) -> str:
+    """Format not iterable value for `pretty_as_text`."""
     if isinstance(value, str):
-        value = tw.wrap(value)
-        return " ".join(value)
+        if type(value) is str and len(value) <= MAX_CACHED_LEAF_LENGTH:  # pylint: disable=unidiomatic-typecheck
+            return _cached_text(value)
+        return " ".join(wrap_text(value))
 
     return repr(value)
 
 
-def make_it_short(value: Any, nested: Optional[bool] = False):
+# exact types, formatting of subclasses can depend on their state, bool and int keys are separated by `typed`
+_CACHED_LEAF_TYPES = (str, int, bool)
+_cached_iterator_leaf = lru_cache(maxsize=LEAF_CACHE_SIZE, typed=True)(_format_iterator_leaf)
+
+
+@lru_cache(maxsize=LEAF_CACHE_SIZE)
+def _cached_text(value: str) -> str:
+    return " ".join(wrap_text(value))
+
+
+_CYCLE_MARKERS = {list: "[...]", tuple: "(...)"}
+
+
+def _cycle_marker(value) -> str:
+    """Marker of container which is printed inside of itself, the same as in `repr`."""
+    for container_type, marker in _CYCLE_MARKERS.items():
+        if isinstance(value, container_type):
+            return marker
+    return "{...}"
+
+
+class _Fragments:
+    """Rendered containers of one render by identity and containers on the current path.
+
+    Container is rendered again and kept when it is met the second time, so unique containers are not copied.
+    Seen containers are forgotten in batches, memory of streaming render does not depend on size of data.
+    Cycle marker depends on the path to the container, so containers with markers inside are not kept.
+    """
+
+    __slots__ = ("seen", "active", "memo", "length", "markers")
+
+    def __init__(self):
+        self.seen: Set[int] = set()
+        self.active: Set[int] = set()
+        self.memo: Dict[Hashable, Any] = {}
+        self.length = 0
+        self.markers = 0
+
+    def marker(self, value) -> str:
+        """Cycle marker of container on the current path, containers around it are not kept."""
+        self.markers += 1
+        return _cycle_marker(value)
+
+    def should_keep(self, value) -> bool:
+        """Container was met before, the next its copies can be taken from memo."""
+        if id(value) in self.seen:
+            return True
+        if len(self.seen) >= MAX_SEEN_CONTAINERS:
+            self.seen.clear()
+        self.seen.add(id(value))
+        return False
+
+    def keep(self, key: Hashable, fragment, length: int):
+        """Keep rendered container if it is long enough and total length is in limit."""
+        if length >= MIN_MEMO_FRAGMENT_LENGTH and self.length + length <= MAX_MEMO_LENGTH:
+            self.memo[key] = fragment
+            self.length += length
+
+
+class _Layout(NamedTuple):
+    """Indents and width of lines of `pretty_as_iterator` result, `wrap` is False for `pretty_as_text` result."""
+
+    wrap: bool
+    htchar: str
+    lfchar: str
+    line_width: int
+
+    def leaf(self, value, indent: int, key_length: int) -> str:
+        """Not iterable value, `indent` is indent of the container of value."""
+        if self.wrap:
+            return _iterator_leaf(value, self.htchar, self.lfchar, indent + 1, key_length, self.line_width)
+        return _text_leaf(value) if isinstance(value, str) else repr(value)
+
+    def frame(self, value, indent: int) -> Tuple[str, List[Any]]:
+        """Opening bracket of container and `[items, dict or None, prefix, separator, closing, indent]` of its frame."""
+        is_dict = isinstance(value, dict)
+        brackets = "" if is_dict else "[]" if isinstance(value, list) else "()"
+        mapping = value if is_dict else None
+        if not self.wrap:
+            return brackets[:1], [iter(value), mapping, "", ", ", brackets[1:], 0]
+        nlch = self.lfchar + self.htchar * (indent + 1)
+        closing = self.lfchar if is_dict else nlch + brackets[1:]
+        return brackets[:1], [iter(value), mapping, nlch, "," + nlch, closing, indent + 2]
+
+    def parts(self, value, indent: int) -> Iterator[Any]:
+        """Parts of container, nested containers are yielded as `_Nested`."""
+        if self.wrap:
+            return _wrapped_container_parts(value, self.htchar, self.lfchar, indent + 1, self.line_width)
+        return _text_container_parts(value)
+
+
+def _pretty_buffer(
+    value, wrap=False, htchar=" ", lfchar="\n", indent=0, key_length=0, config: Optional[RenderConfig] = None
+) -> List[str]:
+    """Write result of `pretty_as_iterator` or `pretty_as_text` to one buffer.
+
+    Args:
+        value: convert to str.
+        wrap: write `pretty_as_iterator` result instead of `pretty_as_text` one.
+        htchar: char that will be used as start indents of font_1 line.
+        lfchar: char that will be use as end indents of font_1 line.
+        indent: ,
+        key_length: provided length of key value if data is iterator dict.
+        config: limits of render, `default_config()` if None.
+    """
+    layout = _Layout(wrap, htchar, lfchar, (config or default_config()).min_length_str_in_dict)
+    if not isinstance(value, (dict, list, tuple)):
+        return [layout.leaf(value, indent, key_length) if wrap else _text_leaf(value)]
+    return _containers_buffer(value, indent, layout)
+
+
+def _containers_buffer(value, indent: int, layout: _Layout) -> List[str]:
+    """Write container to buffer.
+
+    Containers are walked with explicit stack instead of recursion, every frame is
+    `[keys or items iterator, dict or None, prefix of the next item, separator, closing str, indent of items,
+    container, memo key, buffer position if container is kept and number of cycle markers before it]`. Containers
+    which are met again are written from memo, containers inside of themselves are written as cycle markers.
+    """
+    buffer: List[str] = []
+    write = buffer.append
+    fragments = _Fragments()
+    stack: List[List[Any]] = [[iter((value,)), None, "", "", "", indent, None, None, None, 0]]
+    while stack:
+        frame = stack[-1]
+        items, mapping, _, separator, _, items_indent = frame[:6]
+        for item in items:
+            write(frame[2])
+            frame[2] = separator
+            if mapping is None:
+                value, key_length = item, 0
+            else:
+                write(repr(item) + ": ")
+                value, key_length = mapping[item], len(str(item)) if layout.wrap else 0
+
+            if isinstance(value, (dict, list, tuple)):
+                if _open_container(value, items_indent, layout, fragments, stack, buffer):
+                    break
+            elif layout.wrap:
+                write(
+                    _iterator_leaf(value, layout.htchar, layout.lfchar, items_indent + 1, key_length, layout.line_width)
+                )
+            else:
+                write(_text_leaf(value) if isinstance(value, str) else repr(value))
+        else:
+            write(frame[4])
+            stack.pop()
+            _close_container(frame, fragments, buffer)
+    return buffer
+
+
+def _open_container(value, indent: int, layout: _Layout, fragments: _Fragments, stack: list, buffer: List[str]) -> bool:
+    """Write container from memo or as cycle marker, or write its opening bracket and push its frame to stack."""
+    if id(value) in fragments.active:
+        buffer.append(fragments.marker(value))
+        return False
+    key = (id(value), indent)
+    if key in fragments.memo:
+        buffer.append(fragments.memo[key])
+        return False
+    fragments.active.add(id(value))
+    start = len(buffer) if fragments.should_keep(value) else None
+    opening, frame = layout.frame(value, indent)
+    buffer.append(opening)
+    stack.append(frame + [value, key, start, fragments.markers])
+    return True
+
+
+def _close_container(frame: List[Any], fragments: _Fragments, buffer: List[str]):
+    """Forget finished container on the current path, keep its str in memo if it is met again."""
+    container, key, start, markers = frame[6:]
+    fragments.active.discard(id(container))
+    if start is not None and markers == fragments.markers:
+        fragment = "".join(buffer[start:])
+        del buffer[start:]
+        buffer.append(fragment)
+        fragments.keep(key, fragment, len(fragment))
+
+
+@final
+class _Nested(NamedTuple):
+    """Container inside of container, its parts are yielded after parts of container before it."""
+
+    value: Any
+    indent: int
+
+
+_Part = Union[_Nested, Tuple[bool, str]]
+
+
+def iter_pretty_parts(
+    value, wrap=False, htchar=" ", lfchar="\n", indent=0, key_length=0, config: Optional[RenderConfig] = None
+) -> Iterator[Tuple[bool, str]]:
+    """Split result of `pretty_as_iterator` or `pretty_as_text` on parts.
+
+    Structure parts (brackets, separators, indents) are yielded with `False` flag, keys and values with `True` flag,
+    so highlighter can get tokens of the structure without lexing of the whole str. Containers are walked with explicit
+    stack, so depth of data is not limited by recursion limit.
+
+    Args:
+        value: convert to str.
+        wrap: split `pretty_as_iterator` result instead of `pretty_as_text` one.
+        htchar: char that will be used as start indents of font_1 line.
+        lfchar: char that will be use as end indents of font_1 line.
+        indent: ,
+        key_length: provided length of key value if data is iterator dict.
+        config: limits of render, `default_config()` if None.
+    """
+    layout = _Layout(wrap, htchar, lfchar, (config or default_config()).min_length_str_in_dict)
+    if not isinstance(value, (dict, list, tuple)):
+        return iter(((True, layout.leaf(value, indent, key_length) if wrap else _text_leaf(value)),))
+    return _containers_parts(value, indent, layout)
+
+
+def _containers_parts(value, indent: int, layout: _Layout) -> Iterator[Tuple[bool, str]]:
+    """Parts of container, containers which are met again are taken from memo."""
+    fragments = _Fragments()
+    stack: List[Iterator[_Part]] = [iter((_Nested(value, indent),))]
+    # container, memo key and number of cycle markers before it of every generator in stack
+    containers: List[Any] = [(None, None, 0)]
+    # parts of containers which are kept, by stack length when they are finished
+    captures: List[Tuple[int, List[Tuple[bool, str]]]] = []
+    while stack:
+        for item in stack[-1]:
+            # exact type is checked faster than `isinstance` for tuples of parts, `_Nested` is final
+            if type(item) is _Nested:  # pylint: disable=unidiomatic-typecheck
+                container = item.value
+                key = (id(container), item.indent)
+                parts: Optional[Tuple[Tuple[bool, str], ...]]
+                if id(container) in fragments.active:
+                    parts = ((True, fragments.marker(container)),)
+                else:
+                    parts = fragments.memo.get(key)
+                if parts is not None:
+                    for _, captured in captures:
+                        captured.extend(parts)
+                    yield from parts
+                    continue
+
+                fragments.active.add(id(container))
+                if fragments.should_keep(container):
+                    captures.append((len(stack), []))
+                containers.append((container, key, fragments.markers))
+                stack.append(layout.parts(container, item.indent))
+                break
+            for _, captured in captures:
+                captured.append(item)
+            yield item
+        else:
+            stack.pop()
+            container, key, markers = containers.pop()
+            fragments.active.discard(id(container))
+            if captures and captures[-1][0] == len(stack):
+                kept = tuple(captures.pop()[1])
+                if markers == fragments.markers:
+                    fragments.keep(key, kept, sum(len(text) for _, text in kept))
+
+
+def _text_container_parts(value) -> Iterator[Any]:
+    """Parts of container for `pretty_as_text`, nested containers are yielded as `_Nested`."""
+    if isinstance(value, dict):
+        for i, key in enumerate(value):
+            if i:
+                yield False, ", "
+            yield True, repr(key)
+            yield False, ": "
+            item = value[key]
+            yield _Nested(item, 0) if isinstance(item, (dict, list, tuple)) else (True, _text_leaf(item))
+        return
+
+    yield False, "[" if isinstance(value, list) else "("
+    for i, item in enumerate(value):
+        if i:
+            yield False, ", "
+        yield _Nested(item, 0) if isinstance(item, (dict, list, tuple)) else (True, _text_leaf(item))
+    yield False, "]" if isinstance(value, list) else ")"
+
+
+def _wrapped_container_parts(value, htchar, lfchar, indent, line_width) -> Iterator[Any]:
+    """Parts of container for `pretty_as_iterator`, indent is already increased for this level."""
+    nlch = lfchar + htchar * indent
+    if isinstance(value, dict):
+        for i, key in enumerate(value):
+            yield False, "," + nlch if i else nlch
+            yield True, repr(key)
+            yield False, ": "
+            item = value[key]
+            if isinstance(item, (dict, list, tuple)):
+                yield _Nested(item, indent + 1)
+            else:
+                yield True, _iterator_leaf(item, htchar, lfchar, indent + 2, len(str(key)), line_width)
+        yield False, lfchar
+        return
+
+    yield False, "[" if isinstance(value, list) else "("
+    for i, item in enumerate(value):
+        yield False, "," + nlch if i else nlch
+        if isinstance(item, (dict, list, tuple)):
+            yield _Nested(item, indent + 1)
+        else:
+            yield True, _iterator_leaf(item, htchar, lfchar, indent + 2, 0, line_width)
+    yield False, lfchar + htchar * indent + ("]" if isinstance(value, list) else ")")
+
+
+NOT_PRINTED_MESSAGE = "several items were not printed"
+
+
+class _Budget:
+    """Length of output left for `make_it_short`, counted in chars or in bytes of encoding.
+
+    It also keeps containers on the current path, shortened containers of one call by identity and number of cycle
+    markers. Summaries built for the call are kept until its end, so ids of their temporary containers are not reused
+    by the next summaries.
+    """
+
+    __slots__ = ("left", "encoding", "config", "active", "done", "markers", "summaries")
+
+    def __init__(self, limit: Optional[int], encoding: Optional[str], config: RenderConfig):
+        self.left = limit
+        self.encoding = encoding
+        self.config = config
+        self.active: Set[int] = set()
+        self.done: Dict[Tuple[int, Optional[bool]], Any] = {}
+        self.markers = 0
+        self.summaries: List[Dict[str, Any]] = []
+
+    @property
+    def exhausted(self) -> bool:
+        """Nothing more can be kept."""
+        return self.left is not None and self.left <= 0
+
+    def spend(self, text: str):
+        """Count text as kept."""
+        if self.left is not None:
+            self.left -= self.length(text)
+
+    def length(self, text: str) -> int:
+        """Length of text in units of budget."""
+        if self.encoding is None or text.isascii():
+            return len(text)
+        return len(text.encode(self.encoding, errors="replace"))
+
+    def cut(self, text: str) -> str:
+        """Get the beginning of text which fits to the budget."""
+        if self.left is None or self.length(text) <= self.left:
+            return text
+        if self.encoding is None or text.isascii():
+            return text[: self.left]
+        encoded = text[: self.left].encode(self.encoding, errors="replace")
+        return encoded[: self.left].decode(self.encoding, errors="ignore")
+
+
+def make_it_short(
+    value: Any,
+    nested: Optional[bool] = False,
+    budget: Optional[int] = None,
+    encoding: Optional[str] = None,
+    config: Optional[RenderConfig] = None,
+):
     """Format provided data in str anf cut length of provided data.
 
+    Only kept items of lists, tuples and dicts are read, discarded ones are not copied. The budget stops walking
+    of data after total length of kept keys and values, so cost of huge containers does not depend on their length.
+
     Args:
         value: convert to str and cut.
         nested: id provided data is nested part of already provided value.
+        budget: approximate max length of result str, `short_budget` of config if None, indents of wraps are not
+            counted.
+        encoding: count budget in bytes of encoding instead of chars, `short_budget_encoding` of config if None.
+        config: limits of render, `default_config()` if None.
     """
-    if isinstance(value, list):
-        if (length := len(value)) > MIN_LENGTH_LIST:
-            formatted_list = value.copy()
-            del formatted_list[MIN_LENGTH_LIST:]
-            if not nested:
-                formatted_list.append(f"several items were not printed {length - MIN_LENGTH_LIST}")
-
-            return [make_it_short(item) for item in formatted_list]
-        return [make_it_short(item) for item in value]
-
-    if isinstance(value, tuple):
-        if (length := len(value)) > MIN_LENGTH_LIST:
-            formatted_list = list(value).copy()
-            del formatted_list[MIN_LENGTH_LIST:]
-            if not nested:
-                formatted_list.append(f"several items were not printed {length - MIN_LENGTH_LIST}")
-
-            return tuple(make_it_short(item) for item in formatted_list)
-        return tuple(make_it_short(item) for item in value)
+    config = config or default_config()
+    limit = config.short_budget if budget is None else budget
+    return _make_it_short(value, nested, _Budget(limit, encoding or config.short_budget_encoding, config))
 
-    if isinstance(value, dict):
-        if (length := len(value)) > MIN_LENGTH_DICT:
-            return _dict_processing(value, nested, length)
-        return {key: make_it_short(value[key]) for key in value}
 
-    if is_dataclass(value):
-        return make_it_short(asdict(value))
+def _not_printed(count: int) -> str:
+    return f"{NOT_PRINTED_MESSAGE} {count}"
+
+
+def _short_items(items: Iterator[Any], budget: _Budget) -> List[Any]:
+    """Shorten items while budget is not exhausted, separators are counted as 2 chars."""
+    result: List[Any] = []
+    if budget.exhausted:
+        return result
+    for item in items:
+        if result:
+            budget.spend(", ")
+        result.append(_make_it_short(item, False, budget))
+        if budget.exhausted:
+            break
+    return result
+
+
+# values which are cut or printed by repr, other objects can have fields or summary and can be inside of themselves
+_SHORT_LEAF_TYPES = (str, int, float, complex, bytes, type(None))
+
+
+def _make_it_short(value: Any, nested: Optional[bool], budget: _Budget):
+    """Shorten value, container inside of itself is replaced by cycle marker.
+
+    Without budget the result of container does not depend on the place of it, so shared containers are shortened
+    once and their copies share the result. Results with cycle markers depend on the path, so they are not shared.
+    """
+    if not isinstance(value, _SHORT_LEAF_TYPES):
+        if id(value) in budget.active:
+            marker = _cycle_marker(value)
+            budget.markers += 1
+            budget.spend(marker)
+            return marker
+        key = (id(value), nested)
+        if key in budget.done:
+            return budget.done[key]
+
+        markers = budget.markers
+        budget.active.add(id(value))
+        try:
+            if isinstance(value, (list, tuple)):
+                length = len(value)
+                formatted_list = _short_items(islice(value, budget.config.min_length_list), budget)
+                if len(formatted_list) < length and not nested:
+                    formatted_list.append(_not_printed(length - len(formatted_list)))
+                result = formatted_list if isinstance(value, list) else tuple(formatted_list)
+            elif isinstance(value, dict):
+                result = _dict_processing(value, nested, budget)
+            else:
+                result = _object_processing(value, budget)
+        finally:
+            budget.active.discard(id(value))
+        if budget.left is None and markers == budget.markers:
+            budget.done[key] = result
+        return result
 
     if isinstance(value, str):
-        max_size = MIN_LENGTH_STR // 5
-        if (length := len(value)) > MIN_LENGTH_STR:
-            formatted_str = []
-            i = 0
-            for k in range(max_size, length, max_size):
-                formatted_str.append(value[i:k])
-                i += max_size
-            formatted_data = make_it_short(formatted_str, nested=True)
-            return f'{"".join(formatted_data)} ...'
-        return value
+        config = budget.config
+        max_size = config.min_length_str // 5
+        if (length := len(value)) > config.min_length_str:
+            # the same as slices of `max_size` chars without the last one, and at most `min_length_list` of them
+            kept = budget.cut(value[: max_size * min(config.min_length_list, (length - 1) // max_size)])
+            budget.spend(kept)
+            return f"{kept} ..."
+        kept = budget.cut(value)
+        budget.spend(kept)
+        return value if kept is value else f"{kept} ..."
 
+    if budget.left is not None:
+        # repr is built only to count it
+        budget.spend(repr(value))
     return value
 
 
-# TODO Rename this here and in `make_it_short`
-def _dict_processing(value, nested, length):
-    formatted_data = value.copy()
-    keys = list(value.keys())
-    del keys[:MIN_LENGTH_DICT]
-    for key in keys:
-        del formatted_data[key]
+def _object_processing(value: Any, budget: _Budget):
+    """Shorten fields or summary of object, other objects are kept as they are."""
+    # pylint: disable=import-outside-toplevel
+    from better_highlighting.components.adapters import (
+        data_summary,
+        object_fields,
+    )
 
-    formatted_data = {key: make_it_short(formatted_data[key]) for key in formatted_data}
+    fields = object_fields(value)
+    if fields is not None:
+        return _dict_processing(fields, False, budget)
+    summary = data_summary(value, budget.config.min_length_list, budget.config.min_length_dict)
+    if summary is not None:
+        return _summary_processing(summary, budget)
+    if budget.left is not None:
+        budget.spend(repr(value))
+    return value
 
-    return (
-        formatted_data
-        if nested
-        else [
-            formatted_data,
-            f"several items were not printed {length - MIN_LENGTH_DICT}",
-        ]
-    )
+
+def _dict_processing(value: dict, nested: Optional[bool], budget: _Budget):
+    formatted_data = {}
+    for key in islice(value, 0 if budget.exhausted else budget.config.min_length_dict):
+        if budget.left is not None:
+            budget.spend(repr(key))
+            budget.spend(": , ")
+        formatted_data[key] = _make_it_short(value[key], False, budget)
+        if budget.exhausted:
+            break
+
+    if len(formatted_data) == len(value) or nested:
+        return formatted_data
+    return [formatted_data, _not_printed(len(value) - len(formatted_data))]
+
+
+def _summary_processing(summary: dict, budget: _Budget) -> dict:
+    """Shorten items of summary, all keys are kept, kept items and columns are already limited by config."""
+    budget.summaries.append(summary)
+    formatted_data = {}
+    for key, item in summary.items():
+        if budget.left is not None:
+            budget.spend(repr(key))
+            budget.spend(": , ")
+        formatted_data[key] = _make_it_short(item, False, budget)
+    return formatted_data
@@ -0,0 +1,258 @@
+"""Logging integration: formatter which highlights logged data and queue handler which renders it in background.
+
+`HighlightFormatter` highlights dicts, lists and tuples of `record.msg` and `record.args`. `HighlightQueueHandler`
+only puts records to bounded queue on the calling thread, the listener thread formats and writes them by the target
+handlers, so latency of the logging call does not depend on size of logged data. Data is rendered after the call
+returns, it should not be changed after it is logged.
+"""
+import logging
+from concurrent.futures import Executor
+from copy import copy
+from logging.handlers import (
+    QueueHandler,
+    QueueListener,
+)
+from queue import (
+    Empty,
+    Full,
+    Queue,
+)
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    Mapping,
+    Optional,
+)
+
+from better_highlighting.better_highlitghting import _CREATORS
+
+# records in the queue of `HighlightQueueHandler`, the next records follow the policy of the handler
+DEFAULT_QUEUE_SIZE = 10_000
+
+# "block" waits for free place up to timeout, "drop_new" drops the logged record, "drop_oldest" the oldest queued one
+QUEUE_POLICIES = ("block", "drop_new", "drop_oldest")
+
+_DATA_TYPES = (dict, list, tuple)
+
+
+def _has_data(msg, args) -> bool:
+    if isinstance(msg, _DATA_TYPES) or isinstance(args, Mapping):
+        return True
+    return any(isinstance(value, _DATA_TYPES) for value in args or ())
+
+
+class HighlightFormatter(logging.Formatter):
+    """Formatter which highlights dicts, lists and tuples of message and of its arguments.
+
+    `logger.info(payload)` logs highlighted payload, `logger.info("user %s", user)` puts highlighted user in the
+    message, other arguments and messages are formatted as by `logging.Formatter`.
+    """
+
+    def __init__(
+        self, fmt=None, datefmt=None, style="%", *, highlight="json", short=False, wrap=False, color_font=None, **kwargs
+    ):
+        """Init.
+
+        Args:
+            fmt: format of record, `logging.Formatter` argument.
+            datefmt: format of date, `logging.Formatter` argument.
+            style: "%", "{" or "$" style of `fmt`, `logging.Formatter` argument.
+            highlight: "json", "color" or "table" for `highlight_json_style`, `highlight_color_font`
+                or `tabulate_with_color_font` style.
+            short: cut to make highlighted data short.
+            wrap: wrap highlighted data.
+            color_font: table_color and font for "color" and "table" styles.
+            **kwargs: other arguments of highlighter of the style, e.g. `color="never"` for log files.
+        """
+        super().__init__(fmt, datefmt, style)
+        if highlight not in _CREATORS:
+            raise ValueError(f"unknown style: {highlight}, expected one of: {', '.join(_CREATORS)}")
+        options = {"wrap": wrap, "short": short, **kwargs}
+        if color_font is not None:
+            options["color_front"] = color_font
+        self._creator = _CREATORS[highlight](**options)
+
+    def render_message(self, msg, args) -> str:
+        """Message of record with highlighted data.
+
+        Args:
+            msg: `record.msg`, format str or data.
+            args: `record.args`, arguments of format str.
+        """
+        if not args:
+            return self._value(msg) if isinstance(msg, _DATA_TYPES) else str(msg)
+        message = str(msg)
+        if isinstance(args, Mapping):
+            if "%(" in message:
+                return message % {key: self._value(value) for key, value in args.items()}
+            if "%" not in message.replace("%%", ""):
+                # message without placeholders is formatted as by `logging`, the mapping is not rendered
+                return message % args
+            # logging keeps the only dict argument as mapping of named arguments
+            args = (args,)
+        return message % tuple(map(self._value, args))
+
+    def _value(self, value):
+        if isinstance(value, _DATA_TYPES):
+            return self._creator.highlighter(value)
+        return value
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Format record, the message is taken from `HighlightQueueHandler` if it was rendered by its executor.
+
+        Args:
+            record: logged record.
+        """
+        rendered: Dict[Any, str] = getattr(record, "highlighted_messages", {})
+        message = rendered[self] if self in rendered else self.render_message(record.msg, record.args)
+        record = copy(record)
+        record.msg = message
+        record.args = None
+        return super().format(record)
+
+
+class _HighlightListener(QueueListener):
+    """Listener which renders messages of records with data in executor before they are handled."""
+
+    # the same sentinel as of `QueueListener`, it stops the thread
+    _sentinel: ClassVar[None] = None
+
+    def __init__(self, queue: Queue, *handlers: logging.Handler, executor: Optional[Executor] = None):
+        super().__init__(queue, *handlers, respect_handler_level=True)
+        self.queue: Queue = queue
+        self.executor = executor
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if self.executor is None or not _has_data(record.msg, record.args):
+            return record
+        formatters = {handler.formatter for handler in self.handlers}
+        rendered = {}
+        for formatter in formatters:
+            if not isinstance(formatter, HighlightFormatter):
+                continue
+            try:
+                rendered[formatter] = self.executor.submit(formatter.render_message, record.msg, record.args).result()
+            except Exception:  # pylint: disable=broad-except
+                # data which is not picklable is rendered by formatter in the listener thread
+                pass
+        setattr(record, "highlighted_messages", rendered)
+        return record
+
+    def enqueue_sentinel(self):
+        # the queue is bounded, the sentinel waits for place instead of raising `queue.Full`
+        self.queue.put(self._sentinel)
+
+
+class HighlightQueueHandler(QueueHandler):
+    """Handler which puts records to bounded queue, they are formatted and written by handlers in background thread.
+
+    The calling thread only copies record, exception is formatted to text as by `QueueHandler`. When the queue is
+    full, `policy` blocks the caller or drops records, number of dropped records is kept in `dropped` and is logged
+    when handler is closed. `close` and `logging.shutdown` write all queued records before return.
+    """
+
+    def __init__(
+        self,
+        *handlers: logging.Handler,
+        maxsize=DEFAULT_QUEUE_SIZE,
+        policy="block",
+        timeout: Optional[float] = None,
+        executor: Optional[Executor] = None,
+    ):
+        """Init.
+
+        Args:
+            *handlers: handlers which write records, `HighlightFormatter` is their formatter to highlight data.
+            maxsize: max number of records in the queue.
+            policy: "block", "drop_new" or "drop_oldest" when the queue is full.
+            timeout: max seconds to wait for place in the queue with "block" policy, the record is dropped after it,
+                wait without limit if None.
+            executor: process pool to render highlighted messages out of the process, listener thread renders them
+                if None.
+        """
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"unknown queue policy: {policy}, expected one of: {', '.join(QUEUE_POLICIES)}")
+        queue: Queue = Queue(maxsize)
+        super().__init__(queue)
+        self.queue: Queue = queue
+        self.policy = policy
+        self.timeout = timeout
+        self.dropped = 0
+        self.listener: Optional[_HighlightListener] = _HighlightListener(self.queue, *handlers, executor=executor)
+        self.listener.start()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Copy of record without traceback, message is not formatted to keep the caller fast.
+
+        Args:
+            record: logged record.
+        """
+        record = copy(record)
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        """Put record to the queue according to policy.
+
+        Args:
+            record: prepared record.
+        """
+        if self.policy == "block":
+            try:
+                self.queue.put(record, timeout=self.timeout)
+            except Full:
+                self._drop()
+            return
+        while True:
+            try:
+                self.queue.put_nowait(record)
+                return
+            except Full:
+                if self.policy == "drop_new":
+                    self._drop()
+                    return
+            try:
+                self.queue.get_nowait()
+            except Empty:
+                continue
+            self.queue.task_done()
+            self._drop()
+
+    def _drop(self):
+        """Count dropped record, records are put to the queue by any number of threads."""
+        self.acquire()
+        try:
+            self.dropped += 1
+        finally:
+            self.release()
+
+    def flush(self):
+        """Wait until all queued records are written."""
+        if self.listener is not None:
+            self.queue.join()
+
+    def close(self):
+        """Write queued records, stop the listener thread and log number of dropped records."""
+        listener = self.listener
+        self.listener = None
+        if listener is not None:
+            listener.stop()
+            if self.dropped:
+                listener.handle(
+                    logging.makeLogRecord(
+                        {
+                            "name": __name__,
+                            "levelno": logging.WARNING,
+                            "levelname": logging.getLevelName(logging.WARNING),
+                            "msg": "%d log records were dropped by full queue",
+                            "args": (self.dropped,),
+                        }
+                    )
+                )
+            for handler in listener.handlers:
+                handler.flush()
+        super().close()
@@ -0,0 +1,260 @@
+"""Benchmarks of public functions on generated payloads.
+
+Every public function is timed on flat, deep, wide and string-heavy payloads of the given sizes, results are saved as
+JSON to compare two runs:
+
+    python tests/benchmark.py --sizes 1KB,1MB --save .benchmarks/base.json
+    python tests/benchmark.py --sizes 1KB,1MB --compare .benchmarks/base.json
+"""
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+)
+
+from better_highlighting.better_highlitghting import (
+    highlight_color_font,
+    highlight_json_style,
+    tabulate_with_color_font,
+    warm_up,
+)
+
+UNITS = {"B": 1, "KB": 1024, "MB": 1024**2}
+DEFAULT_SIZES = "1KB,100KB,1MB"
+# changes of time and memory less than threshold are noise of the same machine
+CHANGE_THRESHOLD = 0.1
+
+CASES: Dict[str, Callable[[Any], str]] = {
+    "color_font": lambda data: highlight_color_font(data, "ansired bold"),
+    "json": highlight_json_style,
+    "json_wrap": lambda data: highlight_json_style(data, wrap=True),
+    "json_short": lambda data: highlight_json_style(data, short=True),
+    "json_wrap_short": lambda data: highlight_json_style(data, wrap=True, short=True),
+    "table": tabulate_with_color_font,
+    "table_transpose": lambda data: tabulate_with_color_font(data, transpose=True),
+}
+
+
+def _flat_item(i: int):
+    return {"id": i, "name": f"user_{i}", "score": i * 0.5, "active": not i % 2, "tags": ["a", "b"]}
+
+
+def _deep_item(i: int, depth: int = 50):
+    item: Dict[str, Any] = {"level": depth, "value": f"leaf_{i}"}
+    for level in range(depth - 1, -1, -1):
+        item = {"level": level, "next": item}
+    return item
+
+
+def _string_item(i: int):
+    return f"{i} " + "lorem ipsum dolor sit amet, 'consectetur' adipiscing elit " * 16
+
+
+def _wide_item(i: int):
+    return f"key_{i}", i
+
+
+def _entry_length(item) -> int:
+    """Length of item repr with separator, key and value for dict items."""
+    return len(repr(item)) + 2
+
+
+def _items(make_item: Callable[[int], Any], size: int, length: Callable[[Any], int] = _entry_length) -> Iterator[Any]:
+    """Yield items until their repr reaches size in bytes, at least one item."""
+    total = i = 0
+    while not i or total < size:
+        item = make_item(i)
+        total += length(item)
+        i += 1
+        yield item
+
+
+SHAPES: Dict[str, Callable[[int], Any]] = {
+    "flat": lambda size: list(_items(_flat_item, size)),
+    "deep": lambda size: list(_items(_deep_item, size)),
+    "wide": lambda size: dict(_items(_wide_item, size, lambda item: _entry_length(item) - 4)),
+    "strings": lambda size: list(_items(_string_item, size)),
+}
+
+
+def parse_size(size: str) -> int:
+    """Size in bytes of str like "100KB".
+
+    Args:
+        size: number with unit B, KB or MB.
+    """
+    size = size.strip().upper()
+    for unit in sorted(UNITS, key=len, reverse=True):
+        if size.endswith(unit):
+            return int(float(size[: -len(unit)]) * UNITS[unit])
+    return int(size)
+
+
+def format_size(size: int) -> str:
+    """Short str of size in bytes."""
+    for unit in sorted(UNITS, key=UNITS.get, reverse=True):
+        if size >= UNITS[unit] and not size % UNITS[unit]:
+            return f"{size // UNITS[unit]}{unit}"
+    return f"{size}B"
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """Value below which `percent` of values are, nearest-rank method."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(len(ordered) * percent / 100) - 1, 0)]
+
+
+def measure(function: Callable[[Any], str], data, min_time=1.0, max_repeats=20, memory=True) -> Dict[str, Any]:
+    """Time function on data and measure its peak memory in a separate call.
+
+    Args:
+        function: benchmarked function.
+        data: payload.
+        min_time: function is repeated until total time reaches it, if repeats are below max.
+        max_repeats: max number of timed calls.
+        memory: measure peak memory with tracemalloc.
+    """
+    latencies = []
+    while not latencies or (sum(latencies) < min_time and len(latencies) < max_repeats):
+        start = time.perf_counter()
+        function(data)
+        latencies.append(time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            function(data)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return {
+        "repeats": len(latencies),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "peak_memory_mb": None if peak is None else peak / UNITS["MB"],
+    }
+
+
+def run_benchmarks(
+    cases: List[str],
+    shapes: List[str],
+    sizes: List[int],
+    min_time=1.0,
+    max_repeats=20,
+    memory=True,
+    report: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> List[Dict[str, Any]]:
+    """Measure every case on every payload.
+
+    Args:
+        cases: names of `CASES`.
+        shapes: names of `SHAPES`.
+        sizes: sizes of payloads in bytes.
+        min_time: min time of timed calls of every case.
+        max_repeats: max number of timed calls of every case.
+        memory: measure peak memory with tracemalloc.
+        report: called with every result when it is ready.
+    """
+    # the first highlight compiles lexer and styles, it is not a part of timings
+    warm_up("ansired bold")
+    results = []
+    for shape in shapes:
+        for size in sizes:
+            data = SHAPES[shape](size)
+            for case in cases:
+                result = measure(CASES[case], data, min_time, max_repeats, memory)
+                result["throughput_mb_s"] = size / UNITS["MB"] / (result["p50_ms"] / 1000)
+                results.append({"case": case, "shape": shape, "size": format_size(size), **result})
+                if report:
+                    report(results[-1])
+    return results
+
+
+def _key(result: Dict[str, Any]):
+    return result["case"], result["shape"], result["size"]
+
+
+def compare(baseline: List[Dict[str, Any]], results: List[Dict[str, Any]], threshold=CHANGE_THRESHOLD) -> List[str]:
+    """Lines with change of p50 latency and peak memory for results which are in baseline.
+
+    Args:
+        baseline: results of previous run.
+        results: results of this run.
+        threshold: relative change which is reported as faster/slower instead of same.
+    """
+    previous = {_key(result): result for result in baseline}
+    lines = []
+    for result in results:
+        old = previous.get(_key(result))
+        if old is None:
+            continue
+        ratio = result["p50_ms"] / old["p50_ms"] if old["p50_ms"] else 1.0
+        verdict = "slower" if ratio > 1 + threshold else "faster" if ratio < 1 - threshold else "same"
+        line = f"{' '.join(_key(result)):40} p50 {old['p50_ms']:10.2f} -> {result['p50_ms']:10.2f} ms"
+        line += f" x{ratio:.2f} {verdict}"
+        if old.get("peak_memory_mb") and result.get("peak_memory_mb") is not None:
+            line += f", peak {old['peak_memory_mb']:.1f} -> {result['peak_memory_mb']:.1f} MB"
+        lines.append(line)
+    return lines
+
+
+def format_result(result: Dict[str, Any]) -> str:
+    """One line report of result."""
+    memory = "" if result["peak_memory_mb"] is None else f" peak {result['peak_memory_mb']:8.1f} MB"
+    return (
+        f"{' '.join(_key(result)):40} {result['throughput_mb_s']:8.2f} MB/s p50 {result['p50_ms']:10.2f} ms "
+        f"p99 {result['p99_ms']:10.2f} ms{memory} ({result['repeats']} runs)"
+    )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmarks of public functions of better_highlighting.")
+    parser.add_argument("--cases", default=",".join(CASES), help=f"comma separated cases: {', '.join(CASES)}")
+    parser.add_argument("--shapes", default=",".join(SHAPES), help=f"comma separated payloads: {', '.join(SHAPES)}")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma separated payload sizes from 1KB to 100MB")
+    parser.add_argument("--min-time", type=float, default=1.0, help="min seconds of timed calls of every case")
+    parser.add_argument("--max-repeats", type=int, default=20, help="max number of timed calls of every case")
+    parser.add_argument("--no-memory", action="store_true", help="do not measure peak memory with tracemalloc")
+    parser.add_argument("--save", type=Path, help="JSON file to save results")
+    parser.add_argument("--compare", type=Path, help="JSON file with baseline results to compare with")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run benchmarks, print, save and compare results."""
+    args = parse_args(argv)
+    results = run_benchmarks(
+        args.cases.split(","),
+        args.shapes.split(","),
+        [parse_size(size) for size in args.sizes.split(",")],
+        args.min_time,
+        args.max_repeats,
+        not args.no_memory,
+        report=lambda result: print(format_result(result), flush=True),
+    )
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        report = {"python": sys.version.split()[0], "platform": platform.platform(), "results": results}
+        args.save.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if args.compare:
+        for line in compare(json.loads(args.compare.read_text(encoding="utf-8"))["results"], results):
+            print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
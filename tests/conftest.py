@@ -14,3 +14,23 @@ for x, (d, l) in enumerate(zip(dark_colors, light_colors), start=30):
 COLORS["ansiwhite"] = f"{esc}01m"
 
 FONTS = {d: f"{esc}0{(x if x == 1 else x + 1)}m" for x, d in enumerate(["bold", "italic", "underline"], start=1)}
+
+# data with tuple, int key and long str to wrap, it is rendered by several chunks
+PAYLOAD = {
+    "Header_1": ["list_element_1", "list_element_2", "it's"],
+    "HEADER_2": ("tuple _element_1", 1, 2),
+    1234567: 5555888999,
+    "long_value_str": "long string to check wrap " * 10,
+}
+
+
+class CountingList(list):
+    """List which counts read items."""
+
+    read = 0
+
+    def __iter__(self):
+        """Iterate items and count them."""
+        for item in super().__iter__():
+            self.read += 1
+            yield item
@@ -0,0 +1,188 @@
+"""Tests for short views of dataclasses, slotted objects, NumPy and pandas data."""
+import subprocess
+import sys
+import time
+from dataclasses import (
+    dataclass,
+    field,
+)
+from typing import Any
+
+import pytest
+
+from better_highlighting.better_highlitghting import highlight_json_style
+from better_highlighting.data_format import (
+    RenderConfig,
+    make_it_short,
+)
+
+CONFIG = RenderConfig(min_length_list=4, min_length_dict=3)
+
+
+@dataclass
+class Model:
+    """Dataclass with large data."""
+
+    name: str
+    data: Any
+    tags: list = field(default_factory=list)
+
+
+class Node:
+    """Slotted object without its own repr, with cycle and with private slot."""
+
+    __slots__ = ("value", "next", "__secret")
+
+    def __init__(self, value):
+        """Init."""
+        self.value = value
+        self.next = self
+        self.__secret = "hidden"
+
+    @property
+    def secret(self):
+        """Value of private slot."""
+        return self.__secret
+
+
+class Point:
+    """Slotted object with its own repr."""
+
+    __slots__ = ("x", "y")
+
+    def __init__(self, x, y):
+        """Init."""
+        self.x = x
+        self.y = y
+
+    def __repr__(self):
+        """Repr with coordinates."""
+        return f"Point({self.x}, {self.y})"
+
+
+class TestObjectFields:
+    """Class with tests for fields of objects which are read in place."""
+
+    def test_dataclass(self):
+        """Test fields of dataclass are shortened like dict and not copied."""
+        tags = list(range(100))
+        result = make_it_short(Model("m", {"a": 1}, tags), config=CONFIG)
+
+        assert result == {"name": "m", "data": {"a": 1}, "tags": [0, 1, 2, 3, "several items were not printed 96"]}
+
+    def test_slots(self):
+        """Test slots of object without its own repr are fields, cycle is replaced by marker."""
+        node = Node(1)
+
+        assert make_it_short(node) == {"value": 1, "next": "{...}", "_Node__secret": node.secret}
+
+    def test_slots_with_repr(self):
+        """Test object with its own repr is printed by repr."""
+        point = Point(1, 2)
+
+        assert make_it_short([point])[0] is point
+
+
+class TestDataSummary:
+    """Class with tests for summaries of NumPy and pandas data."""
+
+    def test_array(self):
+        """Test array is summarized by stats and by the first and the last items."""
+        numpy = pytest.importorskip("numpy")
+        array = numpy.arange(20, dtype=float).reshape(4, 5)[:, ::2]
+
+        assert make_it_short(array, config=CONFIG) == {
+            "type": "ndarray",
+            "dtype": "float64",
+            "shape": (4, 3),
+            "min": 0.0,
+            "max": 19.0,
+            "mean": 9.5,
+            "head": [0.0, 2.0],
+            "tail": [17.0, 19.0],
+        }
+
+    def test_several_arrays(self):
+        """Test every array of list has its own items, temporary lists of summaries are not shared by id."""
+        numpy = pytest.importorskip("numpy")
+        arrays = [numpy.arange(i * 100, i * 100 + 5) for i in range(6)]
+
+        assert [summary["items"] for summary in make_it_short(arrays)] == [array.tolist() for array in arrays]
+
+    def test_short_array(self):
+        """Test all items of short array are kept, stats of not numeric arrays are skipped."""
+        numpy = pytest.importorskip("numpy")
+
+        expected = {"type": "ndarray", "dtype": "<U1", "shape": (2,), "items": ["a", "b"]}
+        assert make_it_short(numpy.array(["a", "b"])) == expected
+
+    def test_series(self):
+        """Test Series is summarized with its index."""
+        pandas = pytest.importorskip("pandas")
+        series = pandas.Series(range(10), index=[f"r{i}" for i in range(10)], name="count")
+
+        assert make_it_short(series, config=CONFIG) == {
+            "type": "Series",
+            "name": "count",
+            "dtype": "int64",
+            "length": 10,
+            "min": 0,
+            "max": 9,
+            "mean": 4.5,
+            "head": {"r0": 0, "r1": 1},
+            "tail": {"r8": 8, "r9": 9},
+        }
+
+    def test_data_frame(self):
+        """Test DataFrame is summarized by kept columns and rows."""
+        pandas = pytest.importorskip("pandas")
+        frame = pandas.DataFrame({"a": range(10), "b": ["x"] * 10, "c": [0.5] * 10, "d": range(10)})
+
+        result = make_it_short(frame, config=RenderConfig(min_length_list=2, min_length_dict=10))
+
+        assert result == {
+            "type": "DataFrame",
+            "shape": (10, 4),
+            "columns": {"a": "int64", "b": str(frame.dtypes["b"]), "c": "float64", "d": "int64"},
+            "stats": {
+                "a": {"min": 0, "max": 9, "mean": 4.5},
+                "c": {"min": 0.5, "max": 0.5, "mean": 0.5},
+                "d": {"min": 0, "max": 9, "mean": 4.5},
+            },
+            "head": {0: {"a": 0, "b": "x", "c": 0.5, "d": 0}},
+            "tail": {9: {"a": 9, "b": "x", "c": 0.5, "d": 9}},
+        }
+
+    def test_data_frame_with_repeated_columns(self):
+        """Test columns with the same name are kept by position with numbers of copies."""
+        pandas = pytest.importorskip("pandas")
+        frame = pandas.DataFrame([[1, "x", 2.5, 3]], columns=["a", "a", "a (2)", "b"])
+
+        result = make_it_short(frame)
+
+        assert result["columns"] == {"a": "int64", "a (3)": str(frame.dtypes.iloc[1]), "a (2)": "float64", "b": "int64"}
+        assert result["items"] == {0: {"a": 1, "a (3)": "x", "a (2)": 2.5, "b": 3}}
+
+
+        """Test model with large array is highlighted without copy of the array."""
+        numpy = pytest.importorskip("numpy")
+        model = Model("weights", numpy.random.rand(1_000_000))
+        highlight_json_style(model, short=True)
+
+        start = time.perf_counter()
+        result = highlight_json_style(model, short=True)
+
+        assert time.perf_counter() - start < 0.1
+        assert "ndarray" in result
+
+    def test_libraries_are_not_imported(self):
+        """Test NumPy and pandas are not imported for summary of other objects."""
+        code = (
+            "import sys\n"
+            "from better_highlighting.data_format import make_it_short\n"
+            "make_it_short([object(), 1.5])\n"
+            "print('numpy' in sys.modules, 'pandas' in sys.modules)"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, check=True, text=True)
+
+        assert result.stdout.split() == ["False", "False"]
@@ -0,0 +1,236 @@
+"""Tests for asyncio versions of public functions."""
+import asyncio
+import io
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+from conftest import PAYLOAD
+
+from better_highlighting import observe
+from better_highlighting.async_highlighting import (
+    ahighlight_color_font,
+    ahighlight_json_style,
+    ahighlight_to,
+    aiter_highlight,
+    atabulate_with_color_font,
+)
+from better_highlighting.better_highlitghting import (
+    _ITER_HIGHLIGHTERS,
+    highlight_color_font,
+    highlight_json_style,
+    tabulate_with_color_font,
+    warm_up,
+)
+
+LARGE = {f"key_{i}": {"id": i, "name": f"user {i}", "tags": ["a", "b", i]} for i in range(3000)}
+
+
+class Terminal(io.StringIO):
+    """Stream which is a terminal."""
+
+    def isatty(self):
+        """Terminal."""
+        return True
+
+
+class BufferWriter:
+    """Stream writer which keeps written bytes, `pipe` is its extra info like of pipe transport."""
+
+    def __init__(self, pipe):
+        """Init."""
+        self.transport = SimpleNamespace(get_extra_info=lambda name: pipe if name == "pipe" else None)
+        self.data = []
+
+    def write(self, data: bytes):
+        """Keep written bytes."""
+        self.data.append(data)
+
+    async def drain(self):
+        """Nothing to wait."""
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    """Thread pool which counts max number of jobs at the same time."""
+
+    def __init__(self, *args, **kwargs):
+        """Init."""
+        super().__init__(*args, **kwargs)
+        self.running = self.max_running = 0
+        self.lock = threading.Lock()
+
+    def submit(self, fn, /, *args, **kwargs):
+        def counted():
+            with self.lock:
+                self.running += 1
+                self.max_running = max(self.max_running, self.running)
+            try:
+                time.sleep(0.001)
+                return fn(*args, **kwargs)
+            finally:
+                with self.lock:
+                    self.running -= 1
+
+        return super().submit(counted)
+
+
+class TestAsync:
+    """Class with tests for rendering in executor."""
+
+    @pytest.mark.parametrize("wrap", [False, True])
+    @pytest.mark.parametrize("short", [False, True])
+    def test_json(self, wrap, short):
+        """Test result is the same as result of sync function."""
+        result = asyncio.run(ahighlight_json_style(PAYLOAD, wrap=wrap, short=short))
+
+        assert result == highlight_json_style(PAYLOAD, wrap=wrap, short=short)
+
+    def test_color_and_table(self):
+        """Test results of color and table styles are the same as results of sync functions."""
+
+        async def render():
+            return await asyncio.gather(
+                ahighlight_color_font(PAYLOAD, "ansired bold"),
+                atabulate_with_color_font([PAYLOAD, PAYLOAD], "ansiblue", transpose=True),
+            )
+
+        assert asyncio.run(render()) == [
+            highlight_color_font(PAYLOAD, "ansired bold"),
+            tabulate_with_color_font([PAYLOAD, PAYLOAD], "ansiblue", transpose=True),
+        ]
+
+    def test_unknown_style(self):
+        """Test unknown style is rejected before rendering."""
+
+        async def render():
+            return [chunk async for chunk in aiter_highlight(PAYLOAD, "xml")]
+
+        with pytest.raises(ValueError, match="unknown style"):
+            asyncio.run(render())
+
+    def test_loop_is_not_blocked(self):
+        """Test event loop runs other tasks during rendering."""
+        warm_up()
+
+        async def render():
+            gaps = []
+
+            async def tick():
+                last = time.perf_counter()
+                while True:
+                    await asyncio.sleep(0.001)
+                    gaps.append(time.perf_counter() - last)
+                    last = time.perf_counter()
+
+            ticker = asyncio.create_task(tick())
+            start = time.perf_counter()
+            await ahighlight_json_style(LARGE, chunk_size=4096)
+            duration = time.perf_counter() - start
+            ticker.cancel()
+            return duration, gaps
+
+        duration, gaps = asyncio.run(render())
+
+        assert len(gaps) > 1
+        assert max(gaps) < duration / 2
+
+    def test_concurrency_limit(self):
+        """Test jobs of renders in executor are limited by semaphore."""
+
+        async def render(executor):
+            semaphore = asyncio.Semaphore(2)
+            renders = [
+                ahighlight_json_style(PAYLOAD, chunk_size=64, executor=executor, semaphore=semaphore) for _ in range(10)
+            ]
+            return await asyncio.gather(*renders)
+
+        with CountingExecutor(8) as executor:
+            results = asyncio.run(render(executor))
+
+        assert results == [highlight_json_style(PAYLOAD)] * 10
+        assert executor.max_running == 2
+
+    def test_cancellation(self, monkeypatch):
+        """Test cancelled task stops its render, the chunk rendered during cancellation is finished before close."""
+        reports = []
+        started = threading.Event()
+        release = threading.Event()
+        closed = threading.Event()
+        highlight = _ITER_HIGHLIGHTERS["json"]
+        renders = []
+
+        def blocking_chunks(text, **kwargs):
+            chunks = highlight(text, **kwargs)
+            try:
+                yield next(chunks, "")
+                started.set()
+                release.wait()
+                yield from chunks
+            finally:
+                chunks.close()
+                closed.set()
+
+        def render_chunks(text, **kwargs):
+            # the render is referenced by the test, so it is not closed by garbage collector
+            renders.append(blocking_chunks(text, **kwargs))
+            return renders[-1]
+
+        monkeypatch.setitem(_ITER_HIGHLIGHTERS, "json", render_chunks)
+
+        async def render():
+            loop = asyncio.get_running_loop()
+            with observe(reports.append):
+                task = asyncio.create_task(ahighlight_json_style(LARGE, chunk_size=256))
+                await loop.run_in_executor(None, started.wait, 5)
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+                assert not closed.is_set()
+                # render is closed by executor job after the chunk which was rendered during cancellation
+                release.set()
+                return await loop.run_in_executor(None, closed.wait, 5)
+
+        assert asyncio.run(render())
+        assert len(reports) == 1
+        assert 0 < reports[0].output_chars < len(highlight_json_style(LARGE))
+
+    def test_auto_color_of_writer(self, monkeypatch):
+        """Test auto color mode is checked for the pipe of writer, not for stdout of process."""
+        monkeypatch.delenv("NO_COLOR", raising=False)
+        monkeypatch.setattr(sys, "stdout", Terminal())
+
+        async def render(pipe):
+            writer = BufferWriter(pipe)
+            await ahighlight_to(writer, PAYLOAD, color="auto")
+            return b"".join(writer.data).decode()
+
+        assert asyncio.run(render(None)) == highlight_json_style(PAYLOAD, color="never")
+        assert asyncio.run(render(Terminal())) == highlight_json_style(PAYLOAD)
+
+    def test_write_to_stream(self):
+        """Test chunks are written to asyncio stream."""
+        received = []
+
+        async def render():
+            async def handle(reader, writer):
+                received.append(await reader.read())
+                writer.close()
+
+            server = await asyncio.start_server(handle, "127.0.0.1", 0)
+            async with server:
+                _, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+                written = await ahighlight_to(writer, LARGE, chunk_size=4096)
+                writer.close()
+                await writer.wait_closed()
+                while not received:
+                    await asyncio.sleep(0.01)
+            return written
+
+        written = asyncio.run(render())
+
+        expected = highlight_json_style(LARGE)
+        assert written == len(expected)
+        assert received[0].decode() == expected
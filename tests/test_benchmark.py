@@ -0,0 +1,46 @@
+"""Tests for benchmark suite helpers."""
+import json
+
+import pytest
+from benchmark import (
+    CASES,
+    SHAPES,
+    compare,
+    main,
+    parse_size,
+    percentile,
+)
+
+
+class TestBenchmark:
+    """Class with tests for payloads, measures and comparison of benchmark runs."""
+
+    @pytest.mark.parametrize("size,expected", [("1KB", 1024), ("100MB", 100 * 1024**2), ("0.5KB", 512), ("10", 10)])
+    def test_parse_size(self, size, expected):
+        """Test sizes with units are converted to bytes."""
+        assert parse_size(size) == expected
+
+    @pytest.mark.parametrize("shape", list(SHAPES))
+    def test_payload_size(self, shape):
+        """Test generated payload is about the requested size."""
+        size = 10 * 1024
+
+        assert size <= len(repr(SHAPES[shape](size))) < size * 2
+
+    def test_percentile(self):
+        """Test percentiles by nearest rank."""
+        values = list(range(1, 101))
+
+        assert (percentile(values, 50), percentile(values, 99), percentile([5.0], 99)) == (50, 99, 5.0)
+
+    def test_save_and_compare(self, tmp_path, capsys):
+        """Test every case is measured, saved as JSON and compared with baseline."""
+        baseline = tmp_path / "base.json"
+        main(["--sizes", "1KB", "--shapes", "flat", "--min-time", "0", "--save", str(baseline)])
+        results = json.loads(baseline.read_text(encoding="utf-8"))["results"]
+
+        assert [result["case"] for result in results] == list(CASES)
+        assert all(result["p50_ms"] <= result["p99_ms"] and result["peak_memory_mb"] > 0 for result in results)
+        assert len(compare(results, results)) == len(CASES)
+        assert all("x1.00 same" in line for line in compare(results, results))
+        assert "flat 1KB" in capsys.readouterr().out
@@ -0,0 +1,89 @@
+"""Tests for command line entry point."""
+import io
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from better_highlighting.__main__ import (
+    highlight_streams,
+    iter_line_batches,
+)
+from better_highlighting.better_highlitghting import highlight_json_style
+
+RECORDS = [{"ts": i, "level": "info", "msg": f"request {i} done", "ok": i % 2 == 0} for i in range(100)]
+
+
+def _input(lines):
+    return "".join(f"{line}\n" for line in lines).encode("utf-8")
+
+
+class TestCommandLine:
+    """Class with tests for NDJSON and log lines highlighting."""
+
+    @pytest.mark.parametrize("wrap", [False, True])
+    def test_ndjson(self, wrap):
+        """Test every record is highlighted as JSON style."""
+        output = io.BytesIO()
+        highlight_streams(iter([io.BytesIO(_input(json.dumps(record) for record in RECORDS))]), output, wrap=wrap)
+
+        expected = "".join(f"{highlight_json_style(record, wrap=wrap)}\n" for record in RECORDS)
+        assert output.getvalue().decode("utf-8") == expected
+
+    def test_plain_lines(self):
+        """Test not JSON lines are highlighted as text."""
+        lines = ["2022-03-27 INFO started", "{not json", ""]
+        output = io.BytesIO()
+        highlight_streams(iter([io.BytesIO(_input(lines))]), output)
+
+        expected = "".join(f"{highlight_json_style(line) if line else ''}\n" for line in lines)
+        assert output.getvalue().decode("utf-8") == expected
+
+    def test_workers_keep_order(self):
+        """Test lines rendered by processes are written in order of input."""
+        data = _input(json.dumps(record) for record in RECORDS)
+        single, parallel = io.BytesIO(), io.BytesIO()
+        highlight_streams(iter([io.BytesIO(data)]), single)
+        highlight_streams(iter([io.BytesIO(data)]), parallel, workers=2)
+
+        assert parallel.getvalue() == single.getvalue()
+
+    def test_batches_keep_split_lines(self):
+        """Test lines split between reads are joined."""
+        stream = io.BytesIO("первая\nвторая\nтретья".encode("utf-8"))
+        batches = list(iter_line_batches(stream, read_size=5))
+
+        assert [line for batch in batches for line in batch] == ["первая", "вторая", "третья"]
+
+    def test_module_entry_point(self, tmp_path):
+        """Test `python -m better_highlighting` reads files and stdin."""
+        file = tmp_path / "records.ndjson"
+        file.write_text(json.dumps(RECORDS[0]) + "\n", encoding="utf-8")
+
+        result = subprocess.run(
+            [sys.executable, "-m", "better_highlighting", "--short", "--color", "always", str(file), "-"],
+            input=_input([json.dumps(RECORDS[1])]),
+            capture_output=True,
+            check=True,
+        )
+
+        expected = f"{highlight_json_style(RECORDS[0], short=True)}\n{highlight_json_style(RECORDS[1], short=True)}\n"
+        assert result.stdout.decode("utf-8") == expected
+
+    @pytest.mark.parametrize("env", [{}, {"NO_COLOR": "1"}])
+    def test_pipe_is_plain(self, tmp_path, env):
+        """Test output to pipe or with NO_COLOR is not highlighted in default color mode."""
+        file = tmp_path / "records.ndjson"
+        file.write_text(json.dumps(RECORDS[0]) + "\n", encoding="utf-8")
+
+        result = subprocess.run(
+            [sys.executable, "-m", "better_highlighting", str(file)],
+            capture_output=True,
+            check=True,
+            env={**os.environ, **env},
+        )
+
+        assert result.stdout.decode("utf-8") == f"{highlight_json_style(RECORDS[0], color='never')}\n"
+        assert "\x1b" not in result.stdout.decode("utf-8")
@@ -0,0 +1,132 @@
+"""Tests for per-call render configuration."""
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from better_highlighting import (
+    RenderConfig,
+    data_format,
+)
+from better_highlighting.better_highlitghting import (
+    highlight_json_style,
+    highlight_many,
+    tabulate_with_color_font,
+)
+from better_highlighting.components.lexers_and_styles.style_builders import (
+    JSONStyle,
+)
+from better_highlighting.data_format import (
+    default_config,
+    make_it_short,
+    pretty_as_iterator,
+)
+
+PAYLOAD = {"items": list(range(40)), "text": "word " * 40, "nested": {f"key_{i}": i for i in range(60)}}
+CONFIGS = [
+    RenderConfig(),
+    RenderConfig(min_length_list=3, min_length_dict=2),
+    RenderConfig(min_length_str_in_dict=20),
+    RenderConfig(styles=(("String", "ansiblue"), ("Token.Punctuation", "bold"))),
+]
+
+
+class TestRenderConfig:
+    """Class with tests for limits and styles passed to one render."""
+
+    def test_default_config_follows_module_limits(self, monkeypatch):
+        """Test default config reads current values of module limits."""
+        monkeypatch.setattr(data_format, "MIN_LENGTH_LIST", 3)
+
+        assert default_config().min_length_list == 3
+        assert make_it_short(list(range(10))) == [0, 1, 2, "several items were not printed 7"]
+
+    def test_config_file(self, tmp_path):
+        """Test limits of config file are initial values of module limits, limits changed at runtime are used."""
+        path = tmp_path / "better_highlight.cfg"
+        path.write_text(
+            "[data_format]\nMIN_LENGTH_STR = 10\nMIN_LENGTH_LIST = 2\nMIN_LENGTH_DICT = 3\n"
+            "MIN_LENGTH_STR_IN_DICT = 20\nSHORT_BUDGET = 100\n",
+            encoding="utf-8",
+        )
+        code = (
+            "from better_highlighting import data_format\n"
+            "print(data_format.default_config())\n"
+            "print(data_format.make_it_short([1, 2, 3]))\n"
+            "data_format.MIN_LENGTH_LIST = 5\n"
+            "print(data_format.default_config().min_length_list)\n"
+        )
+        # config file is read from the directory of the script, which is the current directory for `-c`
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, check=True, text=True, cwd=tmp_path)
+
+        assert result.stdout.splitlines() == [
+            repr(RenderConfig(10, 2, 3, 20, 100, None)),
+            repr([1, 2, "several items were not printed 1"]),
+            "5",
+        ]
+
+    def test_short_limits(self):
+        """Test short mode uses limits of config instead of module limits."""
+        config = RenderConfig(min_length_list=2, min_length_dict=1, min_length_str=10)
+
+        assert make_it_short([1, 2, 3], config=config) == [1, 2, "several items were not printed 1"]
+        assert make_it_short({"a": 1, "b": 2}, config=config) == [{"a": 1}, "several items were not printed 1"]
+        assert make_it_short("x" * 11, config=config) == "xx" * config.min_length_list + " ..."
+        assert make_it_short([1, 2, 3]) == [1, 2, 3]
+
+    def test_short_budget(self):
+        """Test budget of config is used if budget argument is not set."""
+        config = RenderConfig(short_budget=5)
+
+        assert make_it_short(["x" * 10], config=config) == ["xxxxx ..."]
+        assert make_it_short(["x" * 10], budget=3, config=config) == ["xxx ..."]
+
+    def test_wrap_width(self):
+        """Test width of wrapped str is taken from config."""
+        text = "word " * 20
+
+        config = RenderConfig(min_length_str_in_dict=20)
+
+        assert pretty_as_iterator({"k": text}, config=config).count("\n") > pretty_as_iterator({"k": text}).count("\n")
+        narrow = highlight_json_style({"k": text}, wrap=True, config=config)
+        assert narrow.count("\n") > highlight_json_style({"k": text}, wrap=True).count("\n")
+
+    def test_styles(self):
+        """Test styles of config override JSON style, default styles are not changed."""
+        config = RenderConfig(styles=(("String", "ansiblue"), ("Token.Number", "ansiblue")))
+
+        assert "\x1b[34m" in highlight_json_style({"a": "b"}, config=config)
+        assert "\x1b[34m" not in highlight_json_style({"a": "b"})
+        assert "\x1b[34m" in tabulate_with_color_font([{"a": 1}], config=config)
+        assert "\x1b[34m" not in tabulate_with_color_font([{"a": 1}])
+
+    def test_default_styles_are_read_only(self):
+        """Test shared default styles can not be changed."""
+        with pytest.raises(TypeError):
+            JSONStyle.styles["String"] = "ansiblue"  # type: ignore[index]
+
+    @pytest.mark.parametrize("wrap", [False, True])
+    @pytest.mark.parametrize("short", [False, True])
+    def test_parallel_renders(self, wrap, short):
+        """Test renders with different configs in threads are the same as sequential renders."""
+        expected = [highlight_json_style(PAYLOAD, wrap=wrap, short=short, config=config) for config in CONFIGS]
+        assert len(set(expected)) > 1
+
+        with ThreadPoolExecutor(8) as pool:
+            results = list(
+                pool.map(
+                    lambda config: highlight_json_style(PAYLOAD, wrap=wrap, short=short, config=config),
+                    CONFIGS * 25,
+                )
+            )
+
+        assert results == expected * 25
+
+    def test_highlight_many(self):
+        """Test config is passed to renders of batches."""
+        config = RenderConfig(min_length_list=2)
+        with ThreadPoolExecutor(2) as pool:
+            result = highlight_many([[1, 2, 3]] * 100, short=True, config=config, executor=pool)
+
+        assert result == [highlight_json_style([1, 2, 3], short=True, config=config)] * 100
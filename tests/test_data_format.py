@@ -0,0 +1,239 @@
+"""Tests for data conversion to str."""
+import random
+import sys
+import time
+
+import pytest
+from conftest import CountingList
+
+from better_highlighting import data_format
+from better_highlighting.better_highlitghting import highlight_json_style
+from better_highlighting.data_format import (
+    MIN_LENGTH_LIST,
+    MIN_LENGTH_STR,
+    iter_pretty_parts,
+    make_it_short,
+    pretty_as_iterator,
+    pretty_as_text,
+)
+
+PAYLOAD = {
+    "Header_1": ["list_element_1", "list_element_2", ("tuple _element_1", 2)],
+    1234567: 5555888999,
+    "empty": [{}, [], ()],
+    "long_value_str": "long string to check wrap " * 5,
+}
+
+
+def _nested(depth: int):
+    data = value = []
+    for i in range(depth):
+        value.append({"level": i, "next": []})
+        value = value[-1]["next"]
+    return data
+
+
+def _cyclic():
+    value = [1, {"x": 2}]
+    value.append(value)
+    value[1]["self"] = value[1]
+    return value
+
+
+def _distinct_copies(value):
+    if isinstance(value, dict):
+        return {key: _distinct_copies(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_distinct_copies(item) for item in value]
+    return value
+
+
+def _random_graph(seed: int):
+    """Lists, dicts and tuples with int leaves which share each other and can be inside of themselves."""
+    rnd = random.Random(seed)
+    containers = [[] if rnd.random() < 0.6 else {} for _ in range(rnd.randint(1, 6))]
+    for container in containers:
+        for i in range(rnd.randint(0, 4)):
+            roll = rnd.random()
+            if roll < 0.5:
+                item = rnd.choice(containers)
+            elif roll < 0.6:
+                item = (rnd.choice(containers), 10**12 + i)
+            else:
+                item = 10**12 + rnd.randrange(1000)
+            if isinstance(container, list):
+                container.append(item)
+            else:
+                container[f"key_{i}"] = item
+    return containers
+
+
+BLOCK = {f"option_{i}": {"enabled": True, "level": i, "name": f"option {i}", "tags": ["a", "b"]} for i in range(20)}
+
+
+class TestDataFormat:
+    """Class with tests for conversion of data to str without recursion."""
+
+    def test_text(self):
+        """Test text of data without wraps."""
+        assert pretty_as_text(PAYLOAD) == (
+            "'Header_1': [list_element_1, list_element_2, (tuple _element_1, 2)], 1234567: 5555888999, "
+            "'empty': [, [], ()], 'long_value_str': long string to check wrap long string to check wrap long "
+            "string to check wrap long string to check wrap long string to check wrap"
+        )
+
+    def test_iterator(self):
+        """Test wraps and indents of nested containers."""
+        assert pretty_as_iterator({"a": [1, {"b": None}], "c": ()}) == (
+            "\n 'a': [\n   1,\n   \n     'b': None\n\n   ],\n 'c': (\n   )\n"
+        )
+
+    @pytest.mark.parametrize("wrap", [False, True])
+    def test_parts_are_the_same_as_str(self, wrap):
+        """Test joined parts are the same as formatted str."""
+        expected = pretty_as_iterator(PAYLOAD) if wrap else pretty_as_text(PAYLOAD)
+
+        assert "".join(text for _, text in iter_pretty_parts(PAYLOAD, wrap=wrap)) == expected
+
+    @pytest.mark.parametrize("wrap", [False, True])
+    def test_depth_above_recursion_limit(self, wrap):
+        """Test data deeper than recursion limit is formatted."""
+        depth = sys.getrecursionlimit() + 100
+        result = pretty_as_iterator(_nested(depth)) if wrap else pretty_as_text(_nested(depth))
+
+        assert result.count("'level'") == depth
+        assert highlight_json_style(_nested(depth), wrap=wrap).count("level") == depth
+
+    def test_cycle_marker(self):
+        """Test container inside of itself is printed as marker like in repr."""
+        value = _cyclic()
+
+        assert pretty_as_text(value) == "[1, 'x': 2, 'self': {...}, [...]]"
+        assert pretty_as_iterator(value).count("{...}") == pretty_as_iterator(value).count("[...]") == 1
+        assert "[...]" in highlight_json_style(value, wrap=True).replace("\x1b[31m", "").replace("\x1b[39m", "")
+
+    @pytest.mark.parametrize("wrap", [False, True])
+    def test_shared_containers_are_the_same_as_copies(self, wrap):
+        """Test containers written from memo are the same as rendered copies."""
+        shared = [{"block": BLOCK, "nested": [BLOCK, (BLOCK,)]} for _ in range(5)]
+        copies = _distinct_copies(shared)
+
+        expected = pretty_as_iterator(copies) if wrap else pretty_as_text(copies)
+        assert (pretty_as_iterator(shared) if wrap else pretty_as_text(shared)) == expected
+        assert "".join(text for _, text in iter_pretty_parts(shared, wrap=wrap)) == expected
+
+    @pytest.mark.parametrize("wrap", [False, True])
+    def test_time_of_shared_containers(self, wrap):
+        """Test repeated container is rendered once, time does not grow with number of copies."""
+        render = pretty_as_iterator if wrap else pretty_as_text
+        distinct = _distinct_copies([BLOCK] * 200)
+        shared = [BLOCK] * 200
+
+        start = time.perf_counter()
+        render(distinct)
+        distinct_time = time.perf_counter() - start
+        start = time.perf_counter()
+        render(shared)
+        shared_time = time.perf_counter() - start
+
+        assert shared_time < distinct_time / 5
+
+    @pytest.mark.parametrize("wrap", [False, True])
+    def test_random_shared_and_cyclic_graphs(self, wrap, monkeypatch):
+        """Test shared and cyclic containers are rendered the same as without memo."""
+        render = pretty_as_iterator if wrap else pretty_as_text
+        graphs = [_random_graph(seed) for seed in range(3000)]
+        rendered = [render(graph) for graph in graphs]
+        parts = ["".join(text for _, text in iter_pretty_parts(graph, wrap=wrap)) for graph in graphs]
+
+        monkeypatch.setattr(data_format, "MIN_MEMO_FRAGMENT_LENGTH", sys.maxsize)
+        expected = [render(graph) for graph in graphs]
+        assert rendered == expected
+        assert parts == expected
+
+
+class TestMakeItShort:
+    """Class with tests for cut of data in short mode."""
+
+    def test_only_kept_items_are_read(self):
+        """Test discarded items of long list are not read."""
+        value = CountingList(range(100_000))
+        result = make_it_short(value)
+
+        assert result == [*range(MIN_LENGTH_LIST), f"several items were not printed {100_000 - MIN_LENGTH_LIST}"]
+        assert value.read == MIN_LENGTH_LIST
+
+    def test_long_str(self):
+        """Test long str is cut by slices of fifth part of max length."""
+        max_size = MIN_LENGTH_STR // 5
+
+        assert make_it_short("x" * (MIN_LENGTH_STR + 1)) == "x" * max_size * 5 + " ..."
+        assert make_it_short("x" * MIN_LENGTH_STR) == "x" * MIN_LENGTH_STR
+
+    def test_budget(self):
+        """Test walk of data stops when budget is exhausted."""
+        value = CountingList([{"key": "value"}] * 1000)
+        result = make_it_short(value, budget=30)
+
+        assert result == [{"key": "value"}, {"key": "value"}, "several items were not printed 998"]
+        assert value.read == 2
+
+    def test_repr_without_budget(self):
+        """Test leaves and keys are not converted to repr when there is no budget to count."""
+        reprs = []
+
+        class Leaf:
+            """Object with its own repr which counts calls."""
+
+            def __repr__(self):
+                """Repr of leaf."""
+                reprs.append(self)
+                return "Leaf()"
+
+        leaf = Leaf()
+
+        assert make_it_short({leaf: [leaf]}) == {leaf: [leaf]}
+        assert not reprs
+        make_it_short({leaf: [leaf]}, budget=100)
+        assert len(reprs) == 2
+
+    def test_budget_cuts_str(self):
+        """Test str is cut to the rest of budget."""
+        result = make_it_short({"a": "x" * 100, "b": 1}, budget=20)
+
+        assert result == [{"a": "x" * 13 + " ..."}, "several items were not printed 1"]
+
+    def test_budget_in_bytes(self):
+        """Test budget is counted in bytes of encoding."""
+        assert make_it_short(["é" * 10], budget=8, encoding="utf-8") == ["éééé ..."]
+        assert make_it_short(["é" * 10], budget=8) == ["éééééééé ..."]
+
+    def test_cycle_marker(self):
+        """Test container inside of itself is replaced by marker."""
+        assert make_it_short(_cyclic()) == [1, {"x": 2, "self": "{...}"}, "[...]"]
+
+    def test_shared_containers(self):
+        """Test shared container is shortened once and the same as its copies."""
+        shared = [BLOCK, BLOCK]
+        result = make_it_short(shared)
+
+        assert result == make_it_short(_distinct_copies(shared))
+        assert result[0] is result[1]
+
+    def test_random_shared_and_cyclic_graphs(self):
+        """Test shortened shared and cyclic containers are the same as repr, markers are cut where repr puts them."""
+        for seed in range(3000):
+            graph = _random_graph(seed)
+            result = repr(make_it_short(graph)).replace("'[...]'", "[...]").replace("'{...}'", "{...}")
+
+            assert result == repr(graph)
+
+    def test_depth(self):
+        """Test depth of shortened data is limited only by recursion limit of two frames per level."""
+        depth = sys.getrecursionlimit() // 2 - 50
+        value = data = []
+        for _ in range(depth):
+            value.append([])
+            value = value[0]
+
+        assert repr(make_it_short(data)) == repr(data)
@@ -0,0 +1,40 @@
+"""Tests for direct tokens emitter."""
+import pytest
+
+from better_highlighting.components.highlighters import (
+    ColorFrontPrinter,
+    JSONPrinter,
+)
+
+LONG_STR = (
+    "This is a long string to check and demo not only table_color formatting but also "
+    "functionality of long sting wrap to new line"
+)
+
+PAYLOADS = [
+    {"Header_1": ["a", LONG_STR], "HEADER_2": (1, 2), 1234567: 5555888999, None: True, "empty": {}},
+    [1, -2, 3.5, -1e-05, 1e16, float("nan"), None, False, "", [], ()],
+    {"it's": "don't", 'say "hi"': "#not comment", "%s": "{0}", "f": "f'{x}'", "r": "r'raw'"},
+    ["x+y", "a||b||c", '"""doc"""', "\\", "several items were not printed 5", "12abc", "  lead", "tab\tin"],
+    {"nested": {"deeper": [{"key": [1, {"last": "value"}]}]}, "after": "it's the end"},
+    [["list_element_1", ("tuple _element_1", 2)], {"a": "", "b": {"c": ""}}],
+]
+
+
+class TestDirectEmitter:
+    """Class with tests for highlighting without lexing of the whole str."""
+
+    @pytest.mark.parametrize("wrap", [False, True])
+    @pytest.mark.parametrize("payload", PAYLOADS)
+    def test_same_as_lexer(self, payload, wrap):
+        """Test direct mode output is the same as output of regex lexer."""
+        expected = JSONPrinter(payload, wrap=wrap, direct=False).format()
+
+        assert JSONPrinter(payload, wrap=wrap).format() == expected
+
+    @pytest.mark.parametrize("payload", PAYLOADS)
+    def test_same_as_lexer_with_color(self, payload):
+        """Test direct mode output with table_color and font is the same as output of regex lexer."""
+        expected = ColorFrontPrinter(payload, color_front="ansired bold", direct=False).format()
+
+        assert ColorFrontPrinter(payload, color_front="ansired bold").format() == expected
@@ -0,0 +1,76 @@
+"""Tests for import time of package."""
+import re
+import subprocess
+import sys
+
+import pytest
+
+# microseconds of `python -X importtime`, budgets are several times above usual values to be stable on slow runners
+PACKAGE_IMPORT_BUDGET = 30_000
+OWN_MODULES_IMPORT_BUDGET = 80_000
+
+IMPORT_TIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def _run(code: str, *options: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *options, "-c", code], capture_output=True, check=True, text=True)
+
+
+def _import_times(code: str):
+    """Self and cumulative import time of every module imported by code."""
+    result = _run(code, "-X", "importtime")
+    return {
+        match.group(4): (int(match.group(1)), int(match.group(2)))
+        for match in map(IMPORT_TIME_LINE.match, result.stderr.splitlines())
+        if match
+    }
+
+
+class TestImportTime:
+    """Class with tests for lazy imports and import time budget."""
+
+    def test_package_import_is_lazy(self):
+        """Test `import better_highlighting` does not import pygments."""
+        result = _run("import sys, better_highlighting; print(sorted(m for m in sys.modules if 'pygments' in m))")
+
+        assert result.stdout.strip() == "[]"
+
+    @pytest.mark.parametrize("module", ["pandas", "tabulate", "dataclasses", "better_highlighting.components.table"])
+    def test_heavy_modules_are_not_imported(self, module):
+        """Test modules are not imported for highlight with table_color and font."""
+        code = f"import sys; from better_highlighting import highlight_color_font; print({module!r} in sys.modules)"
+
+        assert _run(code).stdout.strip() == "False"
+
+    def test_lazy_attributes(self):
+        """Test public functions are available as attributes of package."""
+        import better_highlighting  # pylint: disable=import-outside-toplevel
+        from better_highlighting.better_highlitghting import (  # pylint: disable=import-outside-toplevel
+            highlight_json_style,
+        )
+
+        assert better_highlighting.highlight_json_style is highlight_json_style
+        assert set(better_highlighting.__all__) <= set(dir(better_highlighting))
+        with pytest.raises(AttributeError):
+            better_highlighting.not_existing_function  # pylint: disable=pointless-statement
+
+    def test_import_time_budget(self):
+        """Test import time of package and of own modules with public functions is in budget."""
+        package_times = _import_times("import better_highlighting")
+        times = _import_times("from better_highlighting import highlight_json_style")
+        own_time = sum(own for name, (own, _) in times.items() if name.startswith("better_highlighting"))
+
+        assert package_times["better_highlighting"][1] < PACKAGE_IMPORT_BUDGET
+        assert own_time < OWN_MODULES_IMPORT_BUDGET
+
+    def test_warm_up(self):
+        """Test token tables of lexer are compiled by `warm_up`."""
+        code = (
+            "from better_highlighting import warm_up\n"
+            "from better_highlighting.components.lexers_and_styles.json_lexer import FastJSONPythonLexer\n"
+            "before = '_combined' in FastJSONPythonLexer.__dict__\n"
+            "warm_up()\n"
+            "print(before, '_combined' in FastJSONPythonLexer.__dict__)"
+        )
+
+        assert _run(code).stdout.split() == ["False", "True"]
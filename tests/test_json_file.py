@@ -0,0 +1,129 @@
+"""Tests for highlighting of JSON documents without loading of their data."""
+import io
+import json
+from itertools import (
+    chain,
+    count,
+    islice,
+)
+
+import pytest
+from pygments.token import Number
+
+from better_highlighting import (
+    RenderConfig,
+    highlight_json_file,
+    iter_highlight_json_file,
+)
+from better_highlighting.__main__ import highlight_documents
+from better_highlighting.better_highlitghting import highlight_json_style
+from better_highlighting.components import json_file
+from better_highlighting.components.emitter import iter_tokens
+
+DOCUMENTS = [
+    {"Header_1": ["a", "it's"], "HEADER_2": [1, 2.5, -1e-05, 1e300], "null": None, "empty": {}, "list": []},
+    [{"id": i, "name": f"user {i}", "tags": ["a\\b", 'say "hi"', "é😀"], "ok": i % 2 == 0} for i in range(40)],
+    {"nested": {"deeper": [{"key": [1, {"last": "x" * 300}]}]}, "after": "word " * 80},
+    ["\u0000\n\t", "", 12345678901234567890, -0.0, True, False],
+    "just a str",
+    0,
+]
+
+CONFIGS = [None, RenderConfig(min_length_list=3, min_length_dict=2, min_length_str=20), RenderConfig(short_budget=60)]
+
+
+class TestJSONFile:
+    """Class with tests for JSON documents which are scanned instead of loading."""
+
+    @pytest.mark.parametrize("document", DOCUMENTS)
+    @pytest.mark.parametrize("wrap", [False, True])
+    @pytest.mark.parametrize("indent", [None, 2])
+    def test_same_as_loaded_data(self, document, wrap, indent):
+        """Test result is the same as highlighted data of `json.loads`."""
+        raw = json.dumps(document, indent=indent, ensure_ascii=False).encode("utf-8")
+
+        assert highlight_json_file(raw, wrap) == highlight_json_style(json.loads(raw), wrap)
+
+    @pytest.mark.parametrize("document", DOCUMENTS)
+    @pytest.mark.parametrize("config", CONFIGS)
+    def test_short(self, document, config):
+        """Test skipped items are counted the same way as items cut from loaded data."""
+        raw = json.dumps(document).encode("utf-8")
+        expected = highlight_json_style(json.loads(raw), wrap=True, short=True, config=config)
+
+        assert highlight_json_file(raw, wrap=True, short=True, config=config) == expected
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 16])
+    def test_skip_by_chunks(self, monkeypatch, chunk_size):
+        """Test skipped items are counted the same way when they are scanned by chunks without str."""
+        monkeypatch.setattr(json_file, "SKIP_BY_TOKENS_LENGTH", 0)
+        monkeypatch.setattr(json_file, "SKIP_CHUNK_SIZE", chunk_size)
+        document = [[i, {"k": ["]", "\\", '"[{', i]}, "a\\\\"] for i in range(30)]
+        raw = json.dumps({"data": document, "tail": document}, indent=1).encode("utf-8")
+        config = RenderConfig(min_length_list=2, min_length_dict=1)
+
+        result = highlight_json_file(raw, short=True, config=config)
+        assert result == highlight_json_style(json.loads(raw), short=True, config=config)
+
+    def test_file(self, tmp_path):
+        """Test file is read by its path, BOM is skipped."""
+        file = tmp_path / "data.json"
+        file.write_bytes(b"\xef\xbb\xbf" + json.dumps(DOCUMENTS[1]).encode("utf-8"))
+
+        assert highlight_json_file(file, wrap=True) == highlight_json_style(DOCUMENTS[1], wrap=True)
+        assert highlight_json_file(str(file), short=True) == highlight_json_style(DOCUMENTS[1], short=True)
+
+    def test_max_lines(self):
+        """Test the rest of document is not scanned after the last line."""
+        raw = json.dumps(DOCUMENTS[1], indent=2).encode("utf-8")
+        expected = highlight_json_style(DOCUMENTS[1], wrap=True, max_lines=10)
+
+        assert highlight_json_file(raw + b" broken", wrap=True, max_lines=10) == expected
+
+    def test_chunks(self):
+        """Test chunks are not longer than chunk size."""
+        raw = json.dumps(DOCUMENTS[2]).encode("utf-8")
+        chunks = list(iter_highlight_json_file(raw, wrap=True, chunk_size=64))
+
+        assert all(len(chunk) <= 64 for chunk in chunks)
+        assert "".join(chunks) == highlight_json_file(raw, wrap=True)
+
+    @pytest.mark.parametrize("short", [False, True])
+    @pytest.mark.parametrize(
+        "raw",
+        [b"", b"[1, 2", b'{"a": 1,}', b'{"a" 1}', b"[1] 2", b'["abc', b"[1, [2, 3]", b"nul", b'{"a": [1, "]"'],
+    )
+    def test_invalid(self, raw, short):
+        """Test invalid document raises ValueError like `json.loads`."""
+        with pytest.raises(ValueError):
+            highlight_json_file(raw, short=short)
+
+
+class TestBoundedFallback:
+    """Class with tests for the line fallback of emitter."""
+
+    @pytest.mark.parametrize("value", ["'a", "it's", "a\\"])
+    def test_endless_parts(self, value):
+        """Test only the line of the value which can not be lexed alone is lexed by regex lexer."""
+        elements = (part for i in count() for part in ((False, ",\n  "), (True, str(i))))
+        parts = chain([(False, "[\n  "), (True, "1"), (False, ",\n  "), (True, value)], elements)
+
+        tokens = list(islice(iter_tokens(parts), 30))
+
+        assert (Number.Integer, "3") in tokens
+
+
+class TestCommandLine:
+    """Class with tests for JSON documents of command line."""
+
+    def test_documents(self, tmp_path):
+        """Test every file is highlighted as one document."""
+        files = []
+        for i, document in enumerate(DOCUMENTS[:2]):
+            files.append(tmp_path / f"{i}.json")
+            files[-1].write_text(json.dumps(document, indent=2), encoding="utf-8")
+        output = io.BytesIO()
+        highlight_documents([str(file) for file in files], output, short=True)
+
+        expected = "".join(f"{highlight_json_style(document, short=True)}\n" for document in DOCUMENTS[:2])
+        assert output.getvalue().decode("utf-8") == expected
@@ -0,0 +1,81 @@
+"""Differential tests for fast lexer against `JSONPythonLexer`."""
+import random
+
+import pytest
+
+from better_highlighting.components.lexers_and_styles.json_lexer import (
+    FastJSONPythonLexer,
+    JSONPythonLexer,
+)
+from better_highlighting.components.table import fancy_grid
+from better_highlighting.data_format import (
+    make_it_short,
+    pretty_as_iterator,
+    pretty_as_text,
+)
+
+PAYLOADS = [
+    {"id": 1, "name": "user_1", "score": -0.5, "ok": True, "none": None, "tags": ["a", "it's", ""], 1e20: (1, 2)},
+    ["Trueish", "nonexistent", "False_value", "rb", "f", "u'x'", 'f"{x}"', "%d %(name)s {0:>3}", "#comment", "\\n"],
+    ["docstring", '"""doc"""', "'''doc'''", 'r"""raw"""', "0x1f", "0o17", "0b101", "1_000", "1e5", "12abc", "1.5j"],
+    ["ünïcode", "naïve_key", "١٢٣", "tab\tseparated", "a?b!c", "x@y", "a := b", "a != b", "||ID||", "||"],
+    [f"several items were not printed {i}" for i in range(3)] + [list(range(20)), {"nested": {"deep": [{}]}}],
+]
+TABLES = [[["||ID||", 1, "1.5"], ["||NAME||", "user", "True"]], [["a\nb", "it's", "None"], ["", "0x1f", "-1"]]]
+ALPHABET = list("abTtFfNnrRuUbBsx_019.eE+-jJoOxX '\"\\\n\t|#%{}[]():,;=!?@é١╒═│─") + [
+    "True",
+    "None",
+    "false",
+    "several items were not printed",
+    "'''",
+    '"""',
+    "rb'",
+    "f'",
+    "||ID||",
+    "\n\t.+a",
+]
+
+
+def _texts():
+    for payload in PAYLOADS:
+        yield pretty_as_text(payload)
+        yield pretty_as_iterator(payload)
+        yield pretty_as_text(make_it_short(payload))
+    for table in TABLES:
+        yield fancy_grid(table)
+
+
+def _random_texts(count: int, seed: int = 0):
+    rnd = random.Random(seed)
+    while count:
+        text = "".join(rnd.choice(ALPHABET) for _ in range(rnd.randint(0, 40)))
+        # header rule of `JSONPythonLexer` matches empty str between "||" and "||" without end
+        if "||||" not in text:
+            count -= 1
+            yield text
+
+
+class TestFastLexer:
+    """Class with tests for tokens of fast lexer."""
+
+    @pytest.mark.parametrize("text", list(_texts()))
+    @pytest.mark.parametrize("ensurenl", [False, True])
+    def test_same_as_regex_lexer(self, text, ensurenl):
+        """Test tokens of formatted data are the same as tokens of `JSONPythonLexer`."""
+        expected = list(JSONPythonLexer(ensurenl=ensurenl).get_tokens(text))
+
+        assert list(FastJSONPythonLexer(ensurenl=ensurenl).get_tokens(text)) == expected
+
+    def test_random_text(self):
+        """Test tokens and positions of random text with chars of all rules are the same."""
+        expected_lexer = JSONPythonLexer(stripnl=False)
+        lexer = FastJSONPythonLexer(stripnl=False)
+        for text in _random_texts(3000):
+            assert list(lexer.get_tokens_unprocessed(text)) == list(expected_lexer.get_tokens_unprocessed(text)), text
+
+    def test_states_of_rules(self):
+        """Test str state is kept between lines and reset by new line in the same way."""
+        text = "'abc\ndef' \"x\\\ny\" f'{a!r:>{w}}' r'\\d'"
+        expected = list(JSONPythonLexer().get_tokens_unprocessed(text))
+
+        assert list(FastJSONPythonLexer().get_tokens_unprocessed(text)) == expected
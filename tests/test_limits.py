@@ -0,0 +1,79 @@
+"""Tests for limits of visible chars and lines of highlighted str."""
+import re
+
+import pytest
+from conftest import CountingList
+
+from better_highlighting.better_highlitghting import (
+    highlight_color_font,
+    highlight_json_style,
+    iter_highlight_json_style,
+)
+from better_highlighting.components.emitter import limit_tokens
+from better_highlighting.data_format import NOT_PRINTED_MESSAGE
+
+PAYLOAD = {"numbers": list(range(30)), "name": "user", "nested": {"flag": True, "items": ("a", "b")}}
+
+ESCAPE_CODE = re.compile(r"\x1b\[[0-9;]*m")
+
+
+def _visible(text: str) -> str:
+    return ESCAPE_CODE.sub("", text)
+
+
+class TestLimits:
+    """Class with tests for early stop of rendering by `max_chars` and `max_lines`."""
+
+    @pytest.mark.parametrize("max_chars", [40, 60, 100])
+    @pytest.mark.parametrize("wrap", [False, True])
+    def test_max_chars(self, max_chars, wrap):
+        """Test visible str is bounded and ends with marker."""
+        full = _visible(highlight_json_style(PAYLOAD, wrap=wrap))
+        result = _visible(highlight_json_style(PAYLOAD, wrap=wrap, max_chars=max_chars))
+
+        assert len(result) <= max_chars
+        assert result.endswith(f" {NOT_PRINTED_MESSAGE}")
+        assert full.startswith(result[: -len(NOT_PRINTED_MESSAGE) - 1])
+
+    @pytest.mark.parametrize("max_lines", [1, 2, 10])
+    def test_max_lines(self, max_lines):
+        """Test str is cut to lines and marker is at the end of the last line."""
+        full = _visible(highlight_json_style(PAYLOAD, wrap=True)).splitlines()
+        result = _visible(highlight_json_style(PAYLOAD, wrap=True, max_lines=max_lines)).splitlines()
+
+        assert len(result) == max_lines
+        assert result[:-1] == full[: max_lines - 1]
+        assert result[-1] == f"{full[max_lines - 1]} {NOT_PRINTED_MESSAGE}"
+
+    def test_not_cut_if_fits(self):
+        """Test str which fits to limits is the same as str without limits."""
+        full = highlight_json_style(PAYLOAD, wrap=True)
+        visible = _visible(full)
+
+        max_lines = visible.count("\n") + 1
+
+        assert highlight_json_style(PAYLOAD, wrap=True, max_chars=len(visible), max_lines=max_lines) == full
+
+    def test_color_font(self):
+        """Test limits of str highlighted with table_color and font."""
+        result = highlight_color_font(PAYLOAD, "ansired", max_chars=50)
+
+        assert len(_visible(result)) == 50
+        assert NOT_PRINTED_MESSAGE in result
+
+    @pytest.mark.parametrize("wrap", [False, True])
+    def test_large_data_is_not_read(self, wrap):
+        """Test items after the limit are not serialized."""
+        value = CountingList(range(1_000_000))
+        chunks = list(iter_highlight_json_style(value, wrap=wrap, max_chars=200, max_lines=20))
+
+        assert _visible("".join(chunks)).endswith(NOT_PRINTED_MESSAGE)
+        assert value.read < 1000
+
+    def test_tokens_are_cut_inside(self):
+        """Test the last token is cut at the limit."""
+        tokens = [("a", "12345"), ("b", "67\n89"), ("c", "0")]
+
+        assert list(limit_tokens(tokens, max_lines=1))[:2] == [("a", "12345"), ("b", "67")]
+        assert list(limit_tokens(tokens, max_chars=11)) == tokens
+        assert "".join(text for _, text in limit_tokens(tokens * 4, max_chars=34)) == f"123 {NOT_PRINTED_MESSAGE}"
@@ -0,0 +1,234 @@
+"""Tests for logging formatter and queue handler."""
+import io
+import logging
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from better_highlighting.better_highlitghting import (
+    highlight_json_style,
+    tabulate_with_color_font,
+)
+from better_highlighting.log_highlighting import (
+    HighlightFormatter,
+    HighlightQueueHandler,
+)
+
+PAYLOAD = {"user": {"id": 1, "name": "name"}, "tags": ["a", "b"]}
+LARGE = [{"id": i, "name": f"user {i}", "tags": ["a", "b", i]} for i in range(10_000)]
+
+
+def _record(msg, *args, exc_info=None) -> logging.LogRecord:
+    return logging.LogRecord("test", logging.INFO, __file__, 1, msg, args, exc_info)
+
+
+class BlockingHandler(logging.Handler):
+    """Handler which waits for event before every record and keeps messages."""
+
+    def __init__(self):
+        """Init."""
+        super().__init__()
+        self.event = threading.Event()
+        self.messages = []
+
+    def emit(self, record):
+        """Keep message of record."""
+        self.event.wait()
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture(name="logger")
+def logger_fixture():
+    """Logger without handlers and parents."""
+    logger = logging.getLogger("better_highlighting.tests")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    yield logger
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+
+class TestHighlightFormatter:
+    """Class with tests for formatter of records with data."""
+
+    def test_data_message(self):
+        """Test data of message is highlighted."""
+        formatter = HighlightFormatter("%(levelname)s %(message)s")
+
+        assert formatter.format(_record(PAYLOAD)) == f"INFO {highlight_json_style(PAYLOAD)}"
+
+    def test_arguments(self):
+        """Test data of arguments is highlighted, other arguments are formatted as is."""
+        formatter = HighlightFormatter(color="never", short=True)
+        result = formatter.format(_record("user %s, count %d, name %r", PAYLOAD, 2, "x"))
+
+        assert result == f"user {highlight_json_style(PAYLOAD, short=True, color='never')}, count 2, name 'x'"
+
+    def test_mapping_arguments(self):
+        """Test named arguments and the only dict argument."""
+        formatter = HighlightFormatter(color="never")
+        expected = highlight_json_style(PAYLOAD, color="never")
+
+        assert formatter.format(_record("%(user)s %(id)d", {"user": PAYLOAD, "id": 5})) == f"{expected} 5"
+        assert formatter.format(_record("payload %s", PAYLOAD)) == f"payload {expected}"
+
+    def test_dict_argument_without_placeholders(self):
+        """Test the only dict argument of message without placeholders is ignored as by `logging.Formatter`."""
+        record = _record("done", {"a": 1})
+
+        assert HighlightFormatter().format(record) == logging.Formatter().format(record) == "done"
+        assert HighlightFormatter().format(_record("100%% done", {"a": 1})) == "100% done"
+
+    def test_plain_message(self):
+        """Test record without data is formatted as by `logging.Formatter`."""
+        record = _record("value %s of %d", "a", 3)
+
+        assert HighlightFormatter("%(name)s: %(message)s").format(record) == logging.Formatter(
+            "%(name)s: %(message)s"
+        ).format(record)
+
+    def test_table_style(self):
+        """Test style of highlighter is chosen by argument."""
+        rows = [{"a": 1, "b": 2}]
+
+        assert HighlightFormatter(highlight="table").format(_record(rows)) == tabulate_with_color_font(rows)
+
+    def test_record_is_kept(self):
+        """Test formatter does not change the record."""
+        record = _record("payload %s", ["a"])
+        HighlightFormatter().format(record)
+
+        assert (record.msg, record.args) == ("payload %s", (["a"],))
+
+    def test_unknown_style(self):
+        """Test unknown highlighter style."""
+        with pytest.raises(ValueError, match="unknown style"):
+            HighlightFormatter(highlight="xml")
+
+
+class TestHighlightQueueHandler:
+    """Class with tests for background render of records."""
+
+    def test_records_are_written_on_close(self, logger):
+        """Test queued records are written in order before close returns."""
+        stream = io.StringIO()
+        target = logging.StreamHandler(stream)
+        target.setFormatter(HighlightFormatter("%(levelname)s %(message)s", color="never"))
+        handler = HighlightQueueHandler(target)
+        logger.addHandler(handler)
+
+        for i in range(100):
+            logger.info({"i": i})
+        logger.removeHandler(handler)
+        handler.close()
+
+        assert stream.getvalue() == "".join(f"INFO 'i': {i}\n" for i in range(100))
+
+    def test_latency_does_not_depend_on_payload(self, logger):
+        """Test the logging call returns before large payload is rendered."""
+        stream = io.StringIO()
+        target = logging.StreamHandler(stream)
+        target.setFormatter(HighlightFormatter())
+        handler = HighlightQueueHandler(target)
+        logger.addHandler(handler)
+
+        start = time.perf_counter()
+        logger.info(LARGE)
+        elapsed = time.perf_counter() - start
+        handler.flush()
+
+        assert elapsed < 0.05
+        assert stream.getvalue() == highlight_json_style(LARGE) + "\n"
+
+    def test_exception(self, logger):
+        """Test traceback is formatted to text before record is queued."""
+        stream = io.StringIO()
+        target = logging.StreamHandler(stream)
+        target.setFormatter(HighlightFormatter(color="never"))
+        handler = HighlightQueueHandler(target)
+        logger.addHandler(handler)
+
+        try:
+            raise KeyError("key")
+        except KeyError:
+            logger.exception("error %s", {"a": 1})
+        handler.flush()
+
+        assert stream.getvalue().startswith("error 'a': 1\nTraceback (most recent call last):")
+        assert "KeyError: 'key'" in stream.getvalue()
+
+    @pytest.mark.parametrize(
+        "policy, written", [("drop_new", ["0", "1"]), ("drop_oldest", ["0", "4"]), ("block", ["0", "1", "2", "3", "4"])]
+    )
+    def test_policy(self, logger, policy, written):
+        """Test records of full queue are dropped or wait for place."""
+        target = BlockingHandler()
+        handler = HighlightQueueHandler(target, maxsize=1, policy=policy, timeout=5)
+        logger.addHandler(handler)
+
+        logger.info("0")
+        # the listener takes the first record and waits in handler, the next ones fill the queue
+        while handler.queue.qsize():
+            time.sleep(0.001)
+        if policy == "block":
+            threading.Timer(0.1, target.event.set).start()
+        for i in range(1, 5):
+            logger.info(str(i))
+        target.event.set()
+        logger.removeHandler(handler)
+        handler.close()
+
+        dropped = 5 - len(written)
+        assert handler.dropped == dropped
+        assert target.messages == written + ([f"{dropped} log records were dropped by full queue"] if dropped else [])
+
+    def test_block_timeout(self, logger):
+        """Test record is dropped after timeout of blocked caller."""
+        target = BlockingHandler()
+        handler = HighlightQueueHandler(target, maxsize=1, timeout=0.01)
+        logger.addHandler(handler)
+
+        logger.info("0")
+        while handler.queue.qsize():
+            time.sleep(0.001)
+        for i in range(1, 3):
+            logger.info(str(i))
+        target.event.set()
+        logger.removeHandler(handler)
+        handler.close()
+
+        assert handler.dropped == 1
+        assert len(target.messages) == 3
+
+    def test_executor(self, logger):
+        """Test messages are rendered by process pool, records of other formatters are not changed."""
+        highlighted = io.StringIO()
+        plain = io.StringIO()
+        target = logging.StreamHandler(highlighted)
+        target.setFormatter(HighlightFormatter(short=True))
+        with ProcessPoolExecutor(1) as executor:
+            handler = HighlightQueueHandler(target, logging.StreamHandler(plain), executor=executor)
+            logger.addHandler(handler)
+            logger.info("payload %s", PAYLOAD)
+            logger.info("no data")
+            logger.removeHandler(handler)
+            handler.close()
+
+        assert highlighted.getvalue() == f"payload {highlight_json_style(PAYLOAD, short=True)}\nno data\n"
+        assert plain.getvalue() == f"payload {PAYLOAD}\nno data\n"
+
+    def test_close_twice(self):
+        """Test handler can be closed by application and by `logging.shutdown`."""
+        handler = HighlightQueueHandler(logging.NullHandler())
+        handler.close()
+        handler.close()
+
+        assert handler.listener is None
+
+    def test_unknown_policy(self):
+        """Test unknown policy of full queue."""
+        with pytest.raises(ValueError, match="unknown queue policy"):
+            HighlightQueueHandler(logging.NullHandler(), policy="wait")
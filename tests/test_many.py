@@ -0,0 +1,65 @@
+"""Tests for highlight of many objects at once."""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from better_highlighting.better_highlitghting import (
+    MIN_OBJECTS_FOR_WORKERS,
+    highlight_color_font,
+    highlight_json_style,
+    highlight_many,
+    tabulate_with_color_font,
+)
+
+OBJECTS = [{"id": i, "name": f"user_{i}", "tags": ["a", "it's"], "active": not i % 3} for i in range(100)] + [
+    "plain text",
+    (1, None),
+]
+
+
+class TestHighlightMany:
+    """Class with tests for batch highlight."""
+
+    @pytest.mark.parametrize("wrap", [False, True])
+    @pytest.mark.parametrize("short", [False, True])
+    def test_json(self, wrap, short):
+        """Test every result is the same as result of `highlight_json_style`."""
+        expected = [highlight_json_style(value, wrap=wrap, short=short) for value in OBJECTS]
+
+        assert highlight_many(OBJECTS, wrap=wrap, short=short) == expected
+
+    def test_color(self):
+        """Test every result is the same as result of `highlight_color_font`."""
+        expected = [highlight_color_font(value, "ansired bold") for value in OBJECTS]
+
+        assert highlight_many(OBJECTS, style="color", color_font="ansired bold") == expected
+
+    def test_table(self):
+        """Test every result is the same as result of `tabulate_with_color_font`."""
+        rows = [[{"a": 1, "b": "x"}], [{"a": 2}, {"c": 3}]]
+        expected = [tabulate_with_color_font(value, show_headers=False) for value in rows]
+
+        assert highlight_many(rows, style="table", show_headers=False) == expected
+
+    def test_limits(self):
+        """Test arguments of highlighter are passed to every object."""
+        expected = [highlight_json_style(value, max_chars=40) for value in OBJECTS]
+
+        assert highlight_many(OBJECTS, max_chars=40) == expected
+
+    def test_thread_pool_keeps_order(self):
+        """Test results of batches rendered by executor are in order of objects."""
+        with ThreadPoolExecutor(3) as executor:
+            result = highlight_many(OBJECTS, executor=executor, workers=3)
+
+        assert len(OBJECTS) >= MIN_OBJECTS_FOR_WORKERS
+        assert result == highlight_many(OBJECTS)
+
+    def test_process_workers(self):
+        """Test objects are rendered by process pool."""
+        assert highlight_many(OBJECTS, workers=2) == highlight_many(OBJECTS)
+
+    def test_unknown_style(self):
+        """Test unknown style is rejected."""
+        with pytest.raises(ValueError, match="unknown style"):
+            highlight_many(OBJECTS, style="xml")
@@ -0,0 +1,110 @@
+"""Tests for instrumentation of render pipeline."""
+import threading
+
+import pytest
+
+from better_highlighting.better_highlitghting import (
+    highlight_color_font,
+    highlight_json_style,
+    iter_highlight_json_style,
+    tabulate_with_color_font,
+)
+from better_highlighting.components.metrics import (
+    HISTOGRAM_BUCKETS,
+    NULL_RECORDER,
+    enable_metrics,
+    metrics_snapshot,
+    observe,
+    recorder,
+    reset_metrics,
+)
+
+PAYLOAD = {"items": list(range(200)), "name": "it's a name", "nested": {"flag": True}}
+
+
+@pytest.fixture(name="metrics")
+def fixture_metrics():
+    """Enabled process-wide metrics, they are disabled and removed after test."""
+    reset_metrics()
+    enable_metrics()
+    yield
+    enable_metrics(False)
+    reset_metrics()
+
+
+class TestMetrics:
+    """Class with tests for per-stage reports and process-wide metrics."""
+
+    @pytest.mark.parametrize("wrap", [False, True])
+    def test_json_report(self, wrap):
+        """Test report has stages with sizes of input, tokens and output."""
+        reports = []
+        with observe(reports.append):
+            result = highlight_json_style(PAYLOAD, wrap=wrap, short=True)
+
+        assert len(reports) == 1
+        report = reports[0]
+        assert report.printer == "JSONPrinter"
+        assert list(report.stages) == ["short", "serialize", "lex", "format"]
+        assert report.output_chars == len(result)
+        assert report.tokens == report.stages["lex"].items > 0
+        assert report.input_chars >= report.stages["lex"].chars > 0
+        assert all(stage.seconds >= 0 for stage in report.stages.values())
+        assert report.seconds == sum(stage.seconds for stage in report.stages.values())
+
+    def test_raw_str_report(self):
+        """Test str is serialized eagerly and lexed as a whole."""
+        reports = []
+        with observe(reports.append):
+            highlight_color_font("plain text", "ansired")
+
+        assert reports[0].printer == "ColorFrontPrinter"
+        assert (reports[0].input_chars, reports[0].stages["serialize"].items) == (len("plain text"), 1)
+
+    def test_table_report(self):
+        """Test stages of tables are summed for all tables of 4 rows."""
+        reports = []
+        with observe(reports.append):
+            tabulate_with_color_font([{"a": i} for i in range(9)])
+
+        assert list(reports[0].stages) == ["cells", "serialize", "lex", "format"]
+        assert reports[0].stages["format"].items == 3
+
+    def test_report_of_stopped_iteration(self):
+        """Test report is sent when chunks are not read to the end."""
+        reports = []
+        with observe(reports.append):
+            chunks = iter_highlight_json_style(PAYLOAD, chunk_size=10)
+            next(chunks)
+            chunks.close()
+
+        assert len(reports) == 1
+
+    def test_observer_is_local_to_context(self):
+        """Test renders of other threads and after the context are not observed."""
+        reports = []
+        with observe(reports.append):
+            thread = threading.Thread(target=highlight_json_style, args=(PAYLOAD,))
+            thread.start()
+            thread.join()
+        highlight_json_style(PAYLOAD)
+
+        assert not reports
+
+    def test_disabled(self):
+        """Test stages are not wrapped without observers and metrics."""
+        assert recorder("JSONPrinter") is NULL_RECORDER
+
+    def test_process_metrics(self, metrics):  # pylint: disable=unused-argument
+        """Test counters and histograms of renders."""
+        for _ in range(3):
+            highlight_json_style(PAYLOAD)
+        result = highlight_json_style([1, 2])
+        snapshot = metrics_snapshot()
+        total = snapshot["seconds"]["JSONPrinter"]["total"]
+
+        assert snapshot["counters"]["renders"] == {"JSONPrinter": 4}
+        assert snapshot["counters"]["output_chars"]["JSONPrinter"] > len(result)
+        assert total["count"] == total["buckets"][HISTOGRAM_BUCKETS[-1]] == 4
+        assert list(total["buckets"].values()) == sorted(total["buckets"].values())
+        assert set(snapshot["seconds"]["JSONPrinter"]) == {"total", "serialize", "lex", "format"}
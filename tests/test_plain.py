@@ -0,0 +1,169 @@
+"""Tests for color mode and output without escape codes."""
+import io
+import json
+import re
+
+import pytest
+
+from better_highlighting.better_highlitghting import (
+    highlight_color_font,
+    highlight_json_file,
+    highlight_json_style,
+    highlight_many,
+    highlight_to,
+    iter_highlight_json_style,
+    tabulate_with_color_font,
+)
+from better_highlighting.components import highlighters
+from better_highlighting.components.plain import (
+    iter_plain_text,
+    use_color,
+)
+
+ESCAPE_CODE = re.compile(r"\x1b\[[0-9;]*m")
+LONG = "This is a long string to check wrap of long values to several lines of output"
+DATA = [
+    {"name": "first", "values": [1, 2.5, None, True], "text": LONG, "nested": {"a": ("x", b"y")}},
+    [{"a": i, "b": "multi\nline"} for i in range(10)],
+    "\n\nraw str with new lines\r\n",
+    list(range(100)),
+]
+ROWS = [{"id": i, "text": LONG, "tags": ["a", "b"]} for i in range(6)]
+
+
+class _Terminal(io.StringIO):
+    def isatty(self):
+        return True
+
+
+class TestUseColor:
+    """Class with tests for resolving of color mode."""
+
+    @pytest.mark.parametrize("color, expected", [("always", True), ("never", False)])
+    def test_fixed_modes(self, monkeypatch, color, expected):
+        """Test fixed modes do not depend on stream and environment."""
+        monkeypatch.setenv("NO_COLOR", "1")
+
+        assert use_color(color, io.StringIO()) is expected
+        assert use_color(color, _Terminal()) is expected
+
+    def test_auto(self, monkeypatch):
+        """Test auto mode highlights only terminal output, NO_COLOR which is not empty disables it."""
+        monkeypatch.delenv("NO_COLOR", raising=False)
+        assert use_color("auto", _Terminal())
+        assert not use_color("auto", io.StringIO())
+
+        monkeypatch.setenv("NO_COLOR", "")
+        assert use_color("auto", _Terminal())
+        monkeypatch.setenv("NO_COLOR", "1")
+        assert not use_color("auto", _Terminal())
+
+    def test_unknown_mode(self):
+        """Test unknown mode is rejected."""
+        with pytest.raises(ValueError, match="unknown color mode"):
+            highlight_json_style({"a": 1}, color="sometimes")
+
+
+class TestPlainOutput:
+    """Class with tests for text of "never" color mode."""
+
+    @pytest.mark.parametrize("data", DATA)
+    @pytest.mark.parametrize("wrap, short", [(False, False), (True, False), (True, True)])
+    @pytest.mark.parametrize("max_chars, max_lines", [(None, None), (40, None), (None, 2), (60, 3)])
+    def test_json_style(self, data, wrap, short, max_chars, max_lines):
+        """Test text is highlighted str without escape codes, also cut by limits."""
+        options = {"wrap": wrap, "short": short, "max_chars": max_chars, "max_lines": max_lines}
+        result = highlight_json_style(data, color="never", **options)
+
+        assert result == ESCAPE_CODE.sub("", highlight_json_style(data, **options))
+
+    @pytest.mark.parametrize("data", DATA)
+    def test_color_font(self, data):
+        """Test text of table_color and font style."""
+        result = highlight_color_font(data, "ansired bold", max_lines=3, color="never")
+
+        assert result == ESCAPE_CODE.sub("", highlight_color_font(data, "ansired bold", max_lines=3))
+
+    @pytest.mark.parametrize("transpose", [False, True])
+    def test_table(self, transpose):
+        """Test table layout with separators of every 4 rows."""
+        result = tabulate_with_color_font(ROWS, wrap=True, transpose=transpose, color="never")
+
+        assert result == ESCAPE_CODE.sub("", tabulate_with_color_font(ROWS, wrap=True, transpose=transpose))
+        assert "||" not in result
+
+    def test_chunks(self):
+        """Test chunks of iterator are joined to the same text."""
+        chunks = list(iter_highlight_json_style(DATA[1], wrap=True, chunk_size=16, color="never"))
+
+        assert max(map(len, chunks)) == 16
+        assert "".join(chunks) == highlight_json_style(DATA[1], wrap=True, color="never")
+
+    def test_many(self):
+        """Test every item of batch is plain text."""
+        expected = [highlight_json_style(data, short=True, color="never") for data in DATA]
+
+        assert highlight_many(DATA, short=True, color="never") == expected
+
+    def test_json_file(self, tmp_path):
+        """Test text of JSON document which is not loaded."""
+        file = tmp_path / "data.json"
+        file.write_text(json.dumps(ROWS), encoding="utf-8")
+
+        result = highlight_json_file(str(file), wrap=True, color="never")
+
+        assert result == highlight_json_style(json.loads(file.read_text(encoding="utf-8")), wrap=True, color="never")
+
+    def test_stream_of_highlight_to(self, monkeypatch):
+        """Test auto mode of `highlight_to` checks its own stream."""
+        monkeypatch.delenv("NO_COLOR", raising=False)
+        plain, terminal = io.StringIO(), _Terminal()
+        highlight_to(plain, DATA[0], color="auto")
+        highlight_to(terminal, DATA[0], color="auto")
+
+        assert plain.getvalue() == highlight_json_style(DATA[0], color="never")
+        assert terminal.getvalue() == highlight_json_style(DATA[0])
+
+    def test_not_lexed(self, monkeypatch):
+        """Test lexer and formatter are not used in "never" mode."""
+
+        def fail(*args, **kwargs):
+            raise AssertionError("pygments is used")
+
+        for name in ("json_lexer", "json_formatter", "simple_formatter"):
+            monkeypatch.setattr(highlighters, name, fail)
+
+        highlight_json_style(DATA[0], color="never")
+        highlight_json_style(DATA[2], wrap=True, color="never")
+        highlight_color_font(DATA[1], color="never")
+        tabulate_with_color_font(ROWS, color="never")
+
+
+class TestPlainText:
+    """Class with tests for cut of plain text."""
+
+    @pytest.mark.parametrize(
+        "pieces, expected",
+        [
+            (["\n\n", "a", "\n", "b\n\n"], "a\nb"),
+            (["\ufeffa\r\nb\r"], "a\nb"),
+            (["a\n", "\n"], "a"),
+        ],
+    )
+    def test_new_lines(self, pieces, expected):
+        """Test new lines are normalized and stripped like the lexer does it."""
+        assert "".join(iter_plain_text(pieces)) == expected
+
+    def test_rest_is_not_read(self):
+        """Test pieces after the cut are not taken."""
+        taken = []
+
+        def pieces():
+            for i in range(1000):
+                taken.append(i)
+                yield f"{i}\n"
+
+        result = "".join(iter_plain_text(pieces(), max_lines=3))
+
+        assert result == "0\n1\n2 several items were not printed"
+        assert len(taken) == 4
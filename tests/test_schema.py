@@ -0,0 +1,134 @@
+"""Tests for schema summary of record lists."""
+import time
+from dataclasses import dataclass
+
+import pytest
+
+from better_highlighting.better_highlitghting import (
+    highlight_json_style,
+    highlight_many,
+    tabulate_with_color_font,
+)
+from better_highlighting.components.schema import (
+    records_summary,
+    schema_rows,
+)
+from better_highlighting.data_format import (
+    NOT_PRINTED_MESSAGE,
+    RenderConfig,
+)
+
+RECORDS = [
+    {"id": 1, "name": "b", "score": 0.5, "tags": ["x"]},
+    {"id": 2, "name": "a", "score": None, "tags": []},
+    {"id": 3, "name": "b", "score": float("nan")},
+]
+
+
+@dataclass
+class User:
+    """Record which is read by fields."""
+
+    id: int
+    name: str
+
+
+class TestRecordsSummary:
+    """Class with tests for schema of records."""
+
+    def test_summary(self):
+        """Test keys, types, nulls, missing keys, ranges and distinct values."""
+        assert records_summary(RECORDS, 50) == {
+            "type": "list",
+            "length": 3,
+            "shapes": 2,
+            "keys": {
+                "id": {"types": {"int": 3}, "nulls": 0, "missing": 0, "min": 1, "max": 3, "distinct": 3},
+                "name": {"types": {"str": 3}, "nulls": 0, "missing": 0, "min": "a", "max": "b", "distinct": 2},
+                "score": {"types": {"float": 2}, "nulls": 2, "missing": 0, "min": 0.5, "max": 0.5, "distinct": 1},
+                "tags": {"types": {"list": 2}, "nulls": 0, "missing": 1},
+            },
+        }
+
+    def test_objects_and_other_items(self):
+        """Test dataclass records are read by fields, not records are counted by type."""
+        summary = records_summary((User(1, "a"), User(2, "b"), "text", 5), 50)
+
+        assert summary["type"] == "tuple"
+        assert summary["shapes"] == 1
+        assert list(summary["keys"]) == ["id", "name"]
+        assert summary["other items"] == {"str": 1, "int": 1}
+
+    def test_mixed_types(self):
+        """Test values which are not ordered have no min and max."""
+        column = records_summary([{"a": 1}, {"a": "1"}, {"a": True}], 50)["keys"]["a"]
+
+        assert column == {"types": {"int": 1, "str": 1, "bool": 1}, "nulls": 0, "missing": 0, "distinct": 2}
+
+    def test_keys_limit(self):
+        """Test the rest of keys is counted."""
+        summary = records_summary([{f"k{i}": i for i in range(10)}], 3)
+
+        assert list(summary["keys"]) == ["k0", "k1", "k2", NOT_PRINTED_MESSAGE]
+        assert summary["keys"][NOT_PRINTED_MESSAGE] == 7
+
+    @pytest.mark.parametrize("value", [{"a": 1}, "text", 5])
+    def test_not_records(self, value):
+        """Test values which are not lists are kept."""
+        assert records_summary(value, 50) is value
+
+    def test_data_frame(self):
+        """Test columns of DataFrame are summarized by pandas."""
+        pandas = pytest.importorskip("pandas")
+        frame = pandas.DataFrame({"a": [1, 2, None], "b": ["x", "y", "x"]})
+
+        assert records_summary(frame, 50)["keys"] == {
+            "a": {"types": {"float64": 2}, "nulls": 1, "missing": 0, "min": 1.0, "max": 2.0, "distinct": 2},
+            "b": {"types": {str(frame.dtypes["b"]): 3}, "nulls": 0, "missing": 0, "distinct": 2},
+        }
+
+    def test_data_frame_with_repeated_columns(self):
+        """Test columns with the same name are summarized by position with numbers of copies."""
+        pandas = pytest.importorskip("pandas")
+        frame = pandas.DataFrame([[1, 2, 3]], columns=["a", "a", "a"])
+
+        assert list(records_summary(frame, 2)["keys"]) == ["a", "a (2)", NOT_PRINTED_MESSAGE]
+        assert list(records_summary(frame, 50)["keys"]) == ["a", "a (2)", "a (3)"]
+
+
+        """Test summary of many records is fast and its size does not depend on number of records."""
+        records = [{"id": i, "name": f"user {i % 100}", "active": i % 2 == 0} for i in range(100_000)]
+
+        start = time.perf_counter()
+        result = highlight_json_style(records, summary=True, color="never")
+
+        assert time.perf_counter() - start < 2
+        assert "'length': 100000" in result
+        assert result.count("\n") == highlight_json_style(records[:10], summary=True, color="never").count("\n")
+
+
+class TestSummaryMode:
+    """Class with tests for summary mode of highlighters."""
+
+    def test_json_style(self):
+        """Test summary is highlighted with JSON style."""
+        assert highlight_json_style(RECORDS, summary=True) == highlight_json_style(records_summary(RECORDS, 50))
+
+    def test_short_summary(self):
+        """Test keys are limited by config and summary is also shortened in short mode."""
+        config = RenderConfig(min_length_dict=2)
+        result = highlight_json_style(RECORDS, summary=True, short=True, config=config)
+
+        assert result == highlight_json_style(records_summary(RECORDS, 2), short=True, config=config)
+
+    def test_table(self):
+        """Test table has one row for every key."""
+        result = tabulate_with_color_font(RECORDS, summary=True, color="never")
+
+        assert result == tabulate_with_color_font(schema_rows(records_summary(RECORDS, 50)), color="never")
+
+    def test_many(self):
+        """Test every list of records is summarized."""
+        result = highlight_many([RECORDS, RECORDS[:1]], summary=True)
+
+        assert result == [highlight_json_style(RECORDS, summary=True), highlight_json_style(RECORDS[:1], summary=True)]
@@ -0,0 +1,84 @@
+"""Tests for highlighting by chunks."""
+import io
+import tracemalloc
+
+import pytest
+from conftest import PAYLOAD
+
+from better_highlighting.better_highlitghting import (
+    highlight_color_font,
+    highlight_json_style,
+    highlight_to,
+    iter_highlight_color_font,
+    iter_highlight_json_style,
+    iter_tabulate_with_color_font,
+    tabulate_with_color_font,
+)
+from better_highlighting.components.creator import FormattedString
+
+
+class UpperPrinter(FormattedString):
+    """Printer which renders str at once."""
+
+    def format(self) -> str:
+        """Upper case str."""
+        return str(self.target_text).upper()
+
+
+class TestStreaming:
+    """Class with tests for chunks of highlighted str."""
+
+    @pytest.mark.parametrize("wrap", [False, True])
+    def test_json_chunks(self, wrap):
+        """Test joined chunks are the same as highlighted str and chunks are bounded."""
+        chunks = list(iter_highlight_json_style(PAYLOAD, wrap=wrap, chunk_size=100))
+
+        assert "".join(chunks) == highlight_json_style(PAYLOAD, wrap=wrap)
+        assert all(len(chunk) <= 100 for chunk in chunks)
+        assert len(chunks) > 1
+
+    def test_color_chunks(self):
+        """Test joined chunks with table_color and font are the same as highlighted str."""
+        chunks = iter_highlight_color_font(PAYLOAD, "ansired bold", chunk_size=64)
+
+        assert "".join(chunks) == highlight_color_font(PAYLOAD, "ansired bold")
+
+    def test_table_chunks(self):
+        """Test joined chunks of table are the same as highlighted table."""
+        rows = [{"a": i, "b": str(i) * 3} for i in range(9)]
+        chunks = list(iter_tabulate_with_color_font(rows, color_font="ansired", chunk_size=256))
+
+        assert "".join(chunks) == tabulate_with_color_font(rows, color_font="ansired")
+        assert all(len(chunk) <= 256 for chunk in chunks)
+
+    def test_highlight_to(self):
+        """Test highlighted str is written to stream."""
+        stream = io.StringIO()
+        written = highlight_to(stream, PAYLOAD, wrap=True, chunk_size=50)
+
+        assert stream.getvalue() == highlight_json_style(PAYLOAD, wrap=True)
+        assert written == len(stream.getvalue())
+
+    def test_highlight_to_unknown_style(self):
+        """Test error for not supported style."""
+        with pytest.raises(ValueError):
+            highlight_to(io.StringIO(), PAYLOAD, style="unknown")
+
+    def test_memory_is_bounded(self):
+        """Test peak memory does not depend on size of highlighted str."""
+        payload = [{"id": i, "name": "user", "tags": ["admin", "dev"]} for i in range(3000)]
+        result_size = len(highlight_json_style(payload))
+
+        tracemalloc.start()
+        for _ in iter_highlight_json_style(payload, chunk_size=4096):
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert peak < result_size / 10, f"peak memory {peak} for result with length {result_size}"
+
+    def test_default_chunks(self):
+        """Test str of printer without own chunks is split by `chunk_size`."""
+        chunks = list(UpperPrinter("abcdefg").iter_format(chunk_size=3))
+
+        assert chunks == ["ABC", "DEF", "G"]
@@ -0,0 +1,69 @@
+"""Tests for cache of compiled styles and formatters."""
+import pytest
+from pygments.token import Token
+
+from better_highlighting.better_highlitghting import (
+    highlight_color_font,
+    highlight_json_style,
+    tabulate_with_color_font,
+)
+from better_highlighting.components.lexers_and_styles.style_builders import (
+    JSONStyle,
+)
+from better_highlighting.components.lexers_and_styles.style_cache import (
+    StyleCache,
+    style_cache,
+)
+
+
+class TestStyleCache:
+    """Class with tests for compiled styles cache."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        """Start every test with empty cache."""
+        style_cache.clear()
+        yield
+        style_cache.clear()
+
+    def test_hits_and_misses(self):
+        """Test formatter is compiled once per color_front."""
+        first = highlight_color_font("text", "ansired")
+        second = highlight_color_font("text", "ansired")
+        highlight_color_font("text", "ansigreen")
+
+        info = style_cache.info()
+        assert first == second
+        assert info.hits >= 2, f"wrong hits count: {info}"
+        assert info.misses == 3, f"wrong misses count: {info}"
+
+    def test_clear(self):
+        """Test clear drops objects and statistics."""
+        highlight_json_style({"key": "value"})
+        style_cache.clear()
+
+        assert tuple(style_cache.info()) == (0, 0, style_cache.maxsize, 0)
+
+    def test_bounded_size(self):
+        """Test the least recently used object is evicted."""
+        cache = StyleCache(maxsize=2)
+        cache.get("a", lambda: 1)
+        cache.get("b", lambda: 2)
+        cache.get("a", lambda: 1)
+        cache.get("c", lambda: 3)
+
+        assert cache.get("b", lambda: "rebuilt") == "rebuilt"
+        assert cache.info().currsize == 2
+
+    def test_failed_style_is_not_cached(self):
+        """Test style errors are raised on every call."""
+        for _ in range(2):
+            with pytest.raises(AssertionError):
+                highlight_color_font("wrong_font", "wrong_font")
+
+    def test_table_color_does_not_leak(self):
+        """Test table color of one style does not change class level styles."""
+        tabulate_with_color_font([{"a": 1}], color_font="ansired")
+
+        assert JSONStyle.styles.get(Token.Table_1) is None
+        assert JSONStyle().styles[Token.Table_1] == ""
@@ -0,0 +1,150 @@
+"""Tests for native table engine."""
+import re
+
+import pytest
+from pygments import highlight
+
+from better_highlighting.better_highlitghting import (
+    iter_table_pages,
+    tabulate_with_color_font,
+)
+from better_highlighting.components.emitter import (
+    format_tokens,
+    iter_tokens,
+)
+from better_highlighting.components.lexers_and_styles.style_cache import (
+    json_formatter,
+    json_lexer,
+)
+from better_highlighting.components.table import (
+    column_widths,
+    fancy_grid,
+    iter_grid_parts,
+)
+
+TABLES = [
+    [["a", "1", "1.5"], ["bb", "-20", "3"], ["c", "300", "1e5"]],
+    [[0, "x", "True"], [1, "yy", "False"]],
+    [["[\n 1,\n 2\n ]", "1,234.5", "inf"], ["", "2", "nan"]],
+    [["||ID||", "1"], ["||NAME||", "'user'"]],
+    [["several items were not printed", "#comment", "it's"], [" lead", "x\r\ny", "0x1f"]],
+    [[0, "nan"], [1, ""]],
+    [[0, "0.0", None], [1, None, "x"], [2, "1.5", None]],
+]
+
+ESCAPE_CODE = re.compile(r"\x1b\[[0-9;]*m")
+
+
+class TestTable:
+    """Class with tests for tables with fancy_grid box chars."""
+
+    @pytest.mark.parametrize("table", TABLES)
+    def test_same_as_tabulate(self, table):
+        """Test table is the same as table of tabulate."""
+        tabulate = pytest.importorskip("tabulate")
+        tabulate.WIDE_CHARS_MODE = False
+
+        assert fancy_grid(table) == tabulate.tabulate(table, tablefmt="fancy_grid", colalign=("left",))
+
+    @pytest.mark.parametrize("table", TABLES)
+    def test_tokens_same_as_lexer(self, table):
+        """Test tokens of table parts are the same as tokens of the whole table."""
+        formatter = json_formatter("ansired")
+        expected = highlight(fancy_grid(table), json_lexer(), formatter)
+
+        assert format_tokens(iter_tokens(iter_grid_parts(table), json_lexer()), formatter) == expected
+
+    def test_missing_values(self):
+        """Test cells of columns missed in the row are empty."""
+        result = ESCAPE_CODE.sub("", tabulate_with_color_font([{"a": 1}, {"b": 2}], show_headers=False))
+
+        assert result.splitlines()[1:4] == ["│ 1 │   │", "├───┼───┤", "│   │ 2 │"]
+
+    def test_missing_values_of_numbers(self):
+        """Test missing cells do not change type of column, floats are formatted like in column without them."""
+        rows = [{"a": 0.0}, {"b": 1.5}]
+        result = tabulate_with_color_font(rows, transpose=True, show_headers=False, color="never")
+
+        assert result.splitlines()[1:4] == ["│ 0 │     │", "├───┼─────┤", "│   │ 1.5 │"]
+
+    @pytest.mark.parametrize("transpose", [False, True])
+    @pytest.mark.parametrize("color", ["always", "never"])
+    def test_rows_without_columns(self, transpose, color):
+        """Test rows without columns are drawn as empty table."""
+        assert fancy_grid([[], []]) == ""
+        assert tabulate_with_color_font([{}, {}], transpose=transpose, show_headers=False, color=color) == "\n"
+
+    @pytest.mark.parametrize(
+        "show_headers,first_line",
+        [(False, "│ 4      │ 5      │"), (True, "│   ID     │ 4      │ 5      │")],
+    )
+    def test_transpose(self, show_headers, first_line):
+        """Test columns of data are rows of transposed table and headers are the first column."""
+        rows = [{"id": i, "name": f"user_{i}"} for i in range(6)]
+        result = ESCAPE_CODE.sub("", tabulate_with_color_font(rows, transpose=True, show_headers=show_headers))
+        tables = result.split(f'{"↑" * 103}\n{"↓" * 103}\n')
+
+        assert len(tables) == 2
+        assert tables[1].splitlines()[1] == first_line
+
+
+class TestTablePages:
+    """Class with tests for tables of streamed rows."""
+
+    @pytest.mark.parametrize("transpose", [False, True])
+    @pytest.mark.parametrize("show_headers", [False, True])
+    def test_same_as_tables_of_rows(self, transpose, show_headers):
+        """Test pages of 4 rows without sample are the same as tables of the whole data."""
+        rows = [{"id": i, "name": f"user_{i}" * (i % 3), "score": i / 3} for i in range(10)]
+        expected = tabulate_with_color_font(rows, transpose=transpose, show_headers=show_headers)
+        pages = iter_table_pages(iter(rows), transpose=transpose, show_headers=show_headers, page_size=4, sample_size=0)
+
+        assert f'{"↑" * 103}\n{"↓" * 103}\n'.join(pages) == expected
+
+    def test_rows_are_read_by_pages(self):
+        """Test rows of the next page are not read before the page is taken."""
+        read = []
+        rows = ({"id": read.append(i) or i} for i in range(100))
+        pages = iter_table_pages(rows, page_size=10, sample_size=5)
+
+        next(pages)
+        assert len(read) == 10
+        assert len(list(pages)) == 9
+        assert len(read) == 100
+
+    def test_widths_of_sample(self):
+        """Test columns of pages are at least as wide as columns of sample rows."""
+        rows = [{"name": "x" * 20, "value": 1000}, *({"name": "y", "value": i} for i in range(5))]
+        pages = [ESCAPE_CODE.sub("", page) for page in iter_table_pages(rows, page_size=2, show_headers=False)]
+
+        assert len({len(page.splitlines()[0]) for page in pages}) == 1
+        assert pages[1].splitlines()[1] == "│ y                    │    1 │"
+        assert column_widths([["y", 1], ["x" * 20, 1000]]) == [20, 4]
+
+    def test_new_columns(self):
+        """Test columns after the sample are added to the next pages."""
+        rows = [{"a": 1}, {"a": 2}, {"a": 3, "b": "new"}]
+        pages = [ESCAPE_CODE.sub("", page) for page in iter_table_pages(rows, page_size=2, sample_size=1)]
+
+        assert pages[0].splitlines()[1] == "│ 0 │ 1 │"
+        assert pages[1].splitlines()[1] == "│ 2 │ 3 │ new │"
+
+    def test_short_rows(self):
+        """Test values of every row are cut in short mode."""
+        rows = ({"items": list(range(100))} for _ in range(3))
+        pages = list(iter_table_pages(rows, short=True))
+
+        assert len(pages) == 1
+        assert "several items were not printed" in pages[0]
+
+    def test_no_color(self):
+        """Test pages without colors have the same text as highlighted pages."""
+        rows = [{"name": "x" * 20, "value": 1000}, *({"name": "y", "value": i} for i in range(5))]
+        pages = list(iter_table_pages(rows, page_size=2, color="never"))
+
+        assert not any(ESCAPE_CODE.search(page) for page in pages)
+        assert pages == [ESCAPE_CODE.sub("", page) for page in iter_table_pages(rows, page_size=2)]
+
+    def test_no_rows(self):
+        """Test empty rows give no pages."""
+        assert not list(iter_table_pages(iter([])))
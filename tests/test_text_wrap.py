@@ -0,0 +1,94 @@
+"""Tests for line breaking and padding by width of terminal cells."""
+import textwrap
+
+import pytest
+
+from better_highlighting.components.table import fancy_grid
+from better_highlighting.components.text_wrap import (
+    display_width,
+    pad_text,
+    wrap_text,
+)
+from better_highlighting.data_format import pretty_as_iterator
+
+TEXTS = [
+    "",
+    "   ",
+    " lead and trail ",
+    "short",
+    "This is a long string to check wrap of long values to several lines of output",
+    "word\twith\ttabs\nand new lines\r\n",
+    "well-known hyphen-separated words -- and em-dash, -b option",
+    "averyveryverylongwordwithoutanyspacesatallwhichhastobebroken",
+    "12345678901234567890123456789012345678901234567890",
+    "кириллица тоже узкая строка из нескольких слов",
+]
+WIDE_TABLE = [["名前", "値"], ["中文字", "1"], ["e\u0301x", "22"], ["😀", "3"]]
+
+
+class TestWrapText:
+    """Class with tests for wrap of text."""
+
+    @pytest.mark.parametrize("text", TEXTS)
+    @pytest.mark.parametrize("width", [1, 5, 12, 30, 70])
+    def test_same_as_textwrap(self, text, width):
+        """Test lines of narrow chars are the same as lines of `textwrap.wrap`."""
+        assert wrap_text(text, width) == tuple(textwrap.wrap(text, width=width))
+
+    @pytest.mark.parametrize("width", [1, 2, 3, 7, 10])
+    def test_wide_chars(self, width):
+        """Test lines of wide chars fit into width, a wide char is not split."""
+        text = "中文字符串 和 emoji 😀😀😀 混合的文本"
+
+        lines = wrap_text(text, width)
+
+        assert all(display_width(line) <= max(width, 2) for line in lines)
+        assert "".join(lines).replace(" ", "") == text.replace(" ", "")
+
+    def test_cached(self):
+        """Test wrapped lines of the same text and width are reused."""
+        text = "cached " * 20
+
+        assert wrap_text(text, 11) is wrap_text(text, 11)
+        assert wrap_text(text, 11) != wrap_text(text, 13)
+
+
+class TestDisplayWidth:
+    """Class with tests for width in terminal cells."""
+
+    @pytest.mark.parametrize(
+        "text, width",
+        [("abc", 3), ("中文", 4), ("😀", 2), ("e\u0301", 1), ("a\u200db", 2), ("ｆｕｌｌ", 8)],
+    )
+    def test_width(self, text, width):
+        """Test wide chars take two cells, combining and format chars take none."""
+        assert display_width(text) == width
+
+    def test_pad(self):
+        """Test padding counts cells."""
+        assert pad_text("中", 4) == "中  "
+        assert pad_text("中", 4, right=True) == "  中"
+
+
+class TestWideData:
+    """Class with tests for layout of data with wide chars."""
+
+    def test_table_borders(self):
+        """Test borders of table with wide chars are aligned like borders of tabulate in wide chars mode."""
+        lines = fancy_grid(WIDE_TABLE).splitlines()
+
+        assert len({display_width(line) for line in lines}) == 1
+
+    def test_same_as_tabulate(self, monkeypatch):
+        """Test table is the same as table of tabulate with wide chars mode."""
+        tabulate = pytest.importorskip("tabulate")
+        pytest.importorskip("wcwidth")
+        monkeypatch.setattr(tabulate, "WIDE_CHARS_MODE", True)
+
+        assert fancy_grid(WIDE_TABLE) == tabulate.tabulate(WIDE_TABLE, tablefmt="fancy_grid", colalign=("left",))
+
+    def test_wrapped_value(self):
+        """Test wrapped str value is broken by cells."""
+        result = pretty_as_iterator({"k": "中" * 40})
+
+        assert max(display_width(line) for line in result.splitlines()) <= 52
@@ -0,0 +1,88 @@
+"""Tests for token stream which is rendered once and emitted by several backends."""
+import pickle
+import re
+
+import pytest
+
+from better_highlighting import (
+    RenderConfig,
+    emit,
+    render_tokens,
+)
+from better_highlighting.better_highlitghting import (
+    highlight_color_font,
+    highlight_json_style,
+    tabulate_with_color_font,
+)
+from better_highlighting.data_format import (
+    pretty_as_iterator,
+    pretty_as_text,
+)
+
+DATA = {"a": [1, 2.5, None, True, "it's"], "b": {"c": "word " * 40}, "d": ("x", -3)}
+ROWS = [{"id": i, "name": f"user {i}", "tags": [i, "t"]} for i in range(9)]
+
+ESCAPE_CODE = re.compile(r"\x1b\[([0-9;]*)m")
+
+
+class TestTokenStream:
+    """Class with tests for backends of token stream."""
+
+    @pytest.mark.parametrize("wrap", [False, True])
+    @pytest.mark.parametrize("short", [False, True])
+    def test_json_style(self, wrap, short):
+        """Test ANSI 256 colors are the same as highlighted str and plain text is the same as formatted data."""
+        config = RenderConfig(min_length_list=2, styles=(("String", "ansiblue"),))
+        stream = render_tokens(DATA, wrap=wrap, short=short, config=config)
+
+        assert emit(stream) == highlight_json_style(DATA, wrap=wrap, short=short, config=config)
+        if not short:
+            # lexer strips new lines at the start and at the end
+            assert emit(stream, "plain") == (pretty_as_iterator(DATA) if wrap else pretty_as_text(DATA)).strip("\n")
+
+    def test_color_font(self):
+        """Test stream of table_color and font style."""
+        stream = render_tokens(DATA, "color", color_font="ansired bold", max_lines=3)
+
+        assert emit(stream) == highlight_color_font(DATA, "ansired bold", max_lines=3)
+
+    def test_table(self):
+        """Test stream of tables with separators between them."""
+        stream = render_tokens(ROWS, "table", color_font="ansiblue", short=True)
+
+        assert emit(stream) == tabulate_with_color_font(ROWS, "ansiblue", short=True)
+        assert "||" not in emit(stream, "plain")
+
+    def test_pickle(self):
+        """Test stream is emitted the same way after pickling."""
+        stream = render_tokens(DATA, wrap=True)
+        copied = pickle.loads(pickle.dumps(stream))
+
+        assert copied == stream
+        assert emit(copied, "truecolor") == emit(stream, "truecolor")
+
+    @pytest.mark.parametrize(
+        "backend, pattern",
+        [("ansi16", r"(?:[39][0-7]|39)(?:;0[0134])*"), ("truecolor", r"(?:38;2;\d+;\d+;\d+|39)(?:;0[0134])*")],
+    )
+    def test_escape_codes(self, backend, pattern):
+        """Test backends use only escape codes of their colors and the same text."""
+        text = emit(render_tokens(DATA, wrap=True), backend)
+
+        assert all(re.fullmatch(pattern, code) for code in ESCAPE_CODE.findall(text))
+        assert ESCAPE_CODE.sub("", text) == pretty_as_iterator(DATA).strip("\n")
+
+    def test_html(self):
+        """Test HTML has inline styles and escaped text."""
+        html = emit(render_tokens({"<tag>": "a & b"}), "html")
+
+        assert html.startswith('<div class="highlight" style="background: #000000">')
+        assert "&lt;" in html and "&amp;" in html and "<tag>" not in html
+        assert 'style="color: #7F0000"' in html
+
+    def test_unknown(self):
+        """Test unknown style and backend raise ValueError."""
+        with pytest.raises(ValueError):
+            render_tokens(DATA, "xml")
+        with pytest.raises(ValueError):
+            emit(render_tokens(DATA), "svg")
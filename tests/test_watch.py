@@ -0,0 +1,125 @@
+"""Tests for incremental render of changing data."""
+import random
+import time
+
+import pytest
+
+from better_highlighting import (
+    LineChange,
+    RenderConfig,
+    WatchRenderer,
+    apply_changes,
+)
+from better_highlighting.better_highlitghting import highlight_json_style
+
+VALUES = [None, True, 0, -3, 1.5, 1e16, "", "x" * 120, "word " * 30, "it's", 'say "hi"', "a\nb", "'''q", (), [1, [2]]]
+
+
+def _random_value(rnd: random.Random, level=0):
+    if level < 3 and rnd.random() < 0.25:
+        return {f"n{i}": _random_value(rnd, level + 1) for i in range(rnd.randint(0, 4))}
+    return rnd.choice(VALUES)
+
+
+class TestWatchRenderer:
+    """Class with tests for frames and changes of watch renderer."""
+
+    @pytest.mark.parametrize("depth", [1, 2, 3])
+    def test_frames_are_the_same_as_full_render(self, depth):
+        """Test every frame of changing dict is the same as highlighted str of the whole data."""
+        rnd = random.Random(depth)
+        renderer = WatchRenderer(depth=depth)
+        data = {f"k{i}": _random_value(rnd) for i in range(10)}
+        lines: list = []
+        for _ in range(60):
+            key = f"k{rnd.randint(0, 15)}"
+            if rnd.random() < 0.2:
+                data.pop(key, None)
+            else:
+                data[key] = _random_value(rnd)
+            changes = renderer.update(data)
+
+            assert renderer.frame == highlight_json_style(data, wrap=True)
+            assert apply_changes(lines, changes) == renderer.lines
+            lines = renderer.lines
+
+    @pytest.mark.parametrize("data", [{}, [], [1, {"a": 2}], "text", {"a": {}}, {"a": {"b": {}}}])
+    def test_other_data(self, data):
+        """Test data which is not split by keys is rendered as a whole."""
+        assert WatchRenderer(depth=3).render(data) == highlight_json_style(data, wrap=True)
+
+    def test_config(self):
+        """Test limits and styles of config are used for frames."""
+        config = RenderConfig(styles=(("String", "ansiblue"),))
+        data = {"a": "text", "b": 1}
+
+        assert WatchRenderer(config=config).render(data) == highlight_json_style(data, wrap=True, config=config)
+
+    def test_only_changed_keys_are_rendered(self):
+        """Test change of one nested key replaces only its line, other lines are kept from the previous frame."""
+        renderer = WatchRenderer(depth=2)
+        data = {f"k{i}": {"a": i, "b": [i]} for i in range(50)}
+        renderer.update(data)
+        lines = renderer.lines
+
+        data["k10"]["a"] = "changed"
+        changes = renderer.update(data)
+
+        assert len(changes) == 1
+        change = changes[0]
+        assert "k10" in lines[change.start - 1]
+        assert change.end == change.start + 1
+        assert change.lines == (renderer.lines[change.start],)
+        assert "changed" in change.lines[0]
+        assert apply_changes(lines, changes) == renderer.lines
+        assert renderer.frame == highlight_json_style(data, wrap=True)
+
+    def test_no_changes(self):
+        """Test the same data gives no changed lines."""
+        renderer = WatchRenderer()
+        data = {"a": 1, "b": "word " * 40}
+        frame = renderer.render(data)
+
+        assert not renderer.update(dict(data))
+        assert renderer.frame == frame
+
+    def test_added_and_removed_keys(self):
+        """Test changes of added and removed keys are line ranges of the previous frame."""
+        renderer = WatchRenderer()
+        renderer.update({"a": 1, "b": 2, "c": 3, "d": 4})
+        lines = renderer.lines
+
+        assert renderer.update({"a": 1, "c": 3, "d": 4}) == [LineChange(1, 2, ())]
+        assert renderer.update({"a": 1, "b": 2, "c": 3, "d": 4}) == [LineChange(1, 1, (lines[1],))]
+
+    def test_changed_leaf_type_and_container_in_place(self):
+        """Test leaves of equal values and other types, and containers changed in place are rendered again."""
+        renderer = WatchRenderer()
+        data = {"a": 1, "b": [1]}
+        renderer.update(data)
+
+        data["a"] = True
+        data["b"].append(2)
+        renderer.update(data)
+
+        assert renderer.frame == highlight_json_style(data, wrap=True)
+
+    def test_time_of_update_of_many_keys(self):
+        """Test update of one nested key of many keys is faster than render of the whole data."""
+        renderer = WatchRenderer(depth=2)
+        data = {f"k{i}": {"a": i, "b": [i], "c": "text"} for i in range(2000)}
+        renderer.update(data)
+        update_times, full_times = [], []
+        # the best of several runs, a pause of garbage collector can fall into one of them
+        for i in range(3):
+            data[f"k{i}"]["a"] = "changed"
+            start = time.perf_counter()
+            changes = renderer.update(data)
+            update_times.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            highlight_json_style(data, wrap=True)
+            full_times.append(time.perf_counter() - start)
+
+            assert len(changes) == 1
+
+        assert min(update_times) < min(full_times) / 2